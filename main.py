@@ -15,6 +15,7 @@ Google Sheetsから企業データを読み込み、HP URLを自動検索・ス
 """
 
 import asyncio
+import functools
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -23,8 +24,8 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from src.utils import ConfigManager, BlacklistChecker
-from src.data_loader import create_data_loader_from_config, SheetConfig
-from src.search_agent import BraveSearchClient, QueryGenerator
+from src.data_loader import create_data_loader_from_config, create_sheets_client_from_config, SheetConfig
+from src.search_agent import BraveSearchClient, BraveRateLimiter, QueryGenerator
 from src.scorer import create_scorer_from_config  
 from src.output_writer import create_output_writer_from_config
 from src.logger_config import get_logger
@@ -53,6 +54,7 @@ async def main():
     """メイン処理"""
     try:
         print_banner()
+        loop = asyncio.get_running_loop()
         
         # 1. 設定読み込み
         print_status("1. 設定読み込み", "設定ファイルを読み込んでいます...")
@@ -63,22 +65,26 @@ async def main():
         # 2. 各コンポーネント初期化
         print_status("2. システム初期化", "各コンポーネントを初期化しています...")
         
-        # データローダー
-        data_loader = create_data_loader_from_config(config)
+        # データローダー（Google Sheetsクライアントは書き込み側と共有）
+        sheets_client = create_sheets_client_from_config(config)
+        data_loader = create_data_loader_from_config(config, sheets_client)
         
         # Brave Search クライアント
         brave_api_config = config.get('brave_api', {})
+        request_delay_ms = config.get('async_processing', {}).get('request_delay_ms', 1000)
         brave_client = BraveSearchClient(
             api_key=brave_api_config.get('api_key'),
-            results_per_query=brave_api_config.get('results_per_query', 10)
+            results_per_query=brave_api_config.get('results_per_query', 10),
+            rate_limiter=BraveRateLimiter(min_interval=request_delay_ms / 1000)
         )
         
         # スコアラー
         blacklist_checker = BlacklistChecker("config/blacklist.yaml")
         scorer = create_scorer_from_config(config, blacklist_checker)
+        scoring_workers = config.get('async_processing', {}).get('scoring_workers', 4)
         
         # 出力ライター
-        output_writer = create_output_writer_from_config(config)
+        output_writer = create_output_writer_from_config(config, sheets_client)
         
         print_status("2. システム初期化", "システム初期化完了", True)
         
@@ -100,7 +106,7 @@ async def main():
             end_row=google_sheets_config.get('end_row', None)
         )
         
-        companies = data_loader.load_companies_from_range(sheet_config)
+        companies = data_loader.load_companies_batch(sheet_config)
         
         if not companies:
             print_status("3. データ読み込み", "読み込む企業データがありません", False)
@@ -126,20 +132,24 @@ async def main():
                 query = QueryGenerator.generate_location_enhanced_query(company)
                 print(f"📝 検索クエリ: {query}")
                 
-                # 検索実行
-                search_results = brave_client.search(query)
+                # 検索実行（同期HTTP呼び出しはイベントループを塞がないようスレッドで実行）
+                search_results = await loop.run_in_executor(None, brave_client.search, query)
                 print(f"📋 検索結果: {len(search_results)}件")
                 
                 if search_results:
                     # スコアリング（全件実行）
-                    scored_results = []
-                    for result in search_results:  # 全件（最大10件）をスコアリング
-                        scored = scorer.calculate_score(result, company, "地域特定強化クエリ")
-                        if scored:
-                            scored_results.append(scored)
+                    # 類似度は一括計算し、1パスで最高スコアを保持（ブラックリストURLは除外済み）
+                    best = None
+                    # 候補ごとの死活確認・ページ解析はスレッドで並列実行（イベントループは塞がない）
+                    scored_candidates = await loop.run_in_executor(None, functools.partial(
+                        scorer.calculate_scores_batch, search_results, company, "地域特定強化クエリ",
+                        max_workers=scoring_workers
+                    ))
+                    for scored in scored_candidates:  # 全件（最大10件）
+                        if best is None or scored.total_score > best.total_score:
+                            best = scored
                     
-                    if scored_results:
-                        best = max(scored_results, key=lambda x: x.total_score)
+                    if best is not None:
                         print(f"🏆 ベスト: {best.url}")
                         print(f"📊 スコア: {best.total_score}点 - {best.judgment}")
                         print(f"🔍 類似度: {best.domain_similarity:.1f}%")
@@ -190,9 +200,6 @@ async def main():
                         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     })
                 
-                # API制限考慮
-                await asyncio.sleep(1.5)
-                
             except Exception as e:
                 logger.error(f"企業 {company.company_name} の処理でエラー: {e}")
                 print(f"❌ エラー: {e}")
@@ -218,7 +225,8 @@ async def main():
             try:
                 row_number = sheet_config.start_row + i  # 読み込み開始行から順番に
                 
-                write_result = output_writer.write_single_result(
+                write_result = await loop.run_in_executor(None, functools.partial(
+                    output_writer.write_single_result,
                     spreadsheet_id=google_sheets_config.get('input_spreadsheet_id'),
                     sheet_name=google_sheets_config.get('input_sheet_name', 'シート1'),
                     row_number=row_number,
@@ -227,20 +235,26 @@ async def main():
                     score=result['score'],
                     status=result['status'],
                     query=result['query']
-                )
+                ))
                 
                 if write_result.success:
                     print(f"✅ {result['company'].company_name}: 書き込み完了")
                 else:
                     print(f"❌ {result['company'].company_name}: 書き込み失敗")
                 
-                # 書き込み間隔
-                await asyncio.sleep(0.5)
+                # 書き込み間隔（バッファに溜めた・省略した場合はAPIを呼んでいないので待たない）
+                if not (write_result.pending or write_result.skipped):
+                    await asyncio.sleep(0.5)
                 
             except Exception as e:
                 logger.error(f"書き込みエラー ({result['company'].company_name}): {e}")
                 print(f"❌ {result['company'].company_name}: 書き込み失敗")
         
+        # バッファ書き込みが有効な場合は残りを送信
+        for write_result in await loop.run_in_executor(None, output_writer.flush):
+            if not write_result.success:
+                print(f"❌ 企業ID {write_result.company_id}: 書き込み失敗")
+        
         print_status("5. 結果書き込み", "書き込み完了", True)
         
         # 6. 実行結果サマリー
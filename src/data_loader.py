@@ -5,8 +5,11 @@ Google Sheets データ読み込みモジュール
 """
 
 import os
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+import sys
+import itertools
+import functools
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+from dataclasses import dataclass, field
 import gspread
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
@@ -17,7 +20,22 @@ from .search_agent import CompanyInfo
 
 logger = get_logger(__name__)
 
-@dataclass
+# 企業データとして読み込む項目と既定の列
+_COMPANY_FIELD_COLUMNS = (
+    ('id', 'A'),
+    ('prefecture', 'B'),
+    ('industry', 'C'),
+    ('company_name', 'D'),
+)
+
+@functools.lru_cache(maxsize=None)
+def _column_letter_to_index(column_letter: str) -> int:
+    """列文字（例：A, B, C）を0ベースのインデックスに変換（A=0, B=1, ... Z=25）"""
+    if not column_letter:
+        return 0
+    return ord(column_letter.upper()) - ord('A')
+
+@dataclass(slots=True)
 class SheetConfig:
     """Google Sheets設定情報"""
     service_account_file: str
@@ -26,6 +44,23 @@ class SheetConfig:
     input_columns: Dict[str, str]  # フィールド名 -> 列ID のマッピング
     start_row: int = 2  # データ開始行（ヘッダーを除く）
     end_row: Optional[int] = None  # 終了行（Noneの場合は全行）
+    column_indexes: Dict[str, int] = field(init=False, repr=False)  # 企業データ項目ごとの0ベース列インデックス
+    
+    def __post_init__(self):
+        self.column_indexes = {
+            name: _column_letter_to_index(self.input_columns.get(name, default))
+            for name, default in _COMPANY_FIELD_COLUMNS
+        }
+    
+    @property
+    def ranges(self) -> List[str]:
+        """企業データ項目ごとの列範囲（A1表記、batchGet用）"""
+        sheet = self.sheet_name.replace("'", "''")
+        end = self.end_row if self.end_row else ''
+        return [
+            f"'{sheet}'!{column}{self.start_row}:{column}{end}"
+            for column in (self.input_columns.get(field, default) for field, default in _COMPANY_FIELD_COLUMNS)
+        ]
 
 class GoogleSheetsClient:
     """Google Sheets API クライアント"""
@@ -126,10 +161,8 @@ class DataLoader:
                 range_name = f"A{config.start_row}:Z{config.end_row}"
                 values = worksheet.get(range_name)
             else:
-                # 全データを取得
-                all_values = worksheet.get_all_values()
-                # ヘッダー行を除いたデータを取得
-                values = all_values[config.start_row-1:] if len(all_values) >= config.start_row else []
+                # 全データを取得し、ヘッダー行はコピーせずに読み飛ばす
+                values = itertools.islice(worksheet.get_all_values(), config.start_row - 1, None)
             
             # データをCompanyInfoオブジェクトに変換
             companies = self._parse_company_data(values, config)
@@ -141,6 +174,67 @@ class DataLoader:
             logger.error(f"企業データ読み込みに失敗しました: {e}")
             raise
     
+    def load_companies_batch(self, config: SheetConfig) -> List[CompanyInfo]:
+        """
+        必要な列だけをbatchGetで1回のリクエストにまとめて読み込み
+        
+        load_companies_from_rangeと同じ結果を返すが、gspreadによる
+        スプレッドシート/ワークシートのメタデータ取得を行わない
+        
+        Args:
+            config: シート設定情報
+        
+        Returns:
+            CompanyInfoのリスト
+        """
+        try:
+            logger.info(f"企業データ一括読み込み開始: {config.spreadsheet_id}/{config.sheet_name}")
+            
+            service = self.sheets_client._get_sheets_service()
+            response = service.spreadsheets().values().batchGet(
+                spreadsheetId=config.spreadsheet_id,
+                ranges=config.ranges,
+                majorDimension='COLUMNS'
+            ).execute()
+            
+            # 列ごとの値を行データに組み直す（末尾の空セルは省略されて返る）
+            columns = []
+            for value_range in response.get('valueRanges', []):
+                values = value_range.get('values', [])
+                columns.append(values[0] if values else [])
+            
+            values = self._columns_to_rows(columns, config)
+            companies = self._parse_company_data(values, config)
+            
+            logger.info(f"企業データ一括読み込み完了: {len(companies)}件")
+            return companies
+            
+        except Exception as e:
+            logger.error(f"企業データ一括読み込みに失敗しました: {e}")
+            raise
+    
+    def _columns_to_rows(self, columns: List[List[str]], config: SheetConfig) -> List[List[str]]:
+        """
+        batchGet（COLUMNS指定）の結果を_parse_company_data用の行データに変換
+        
+        Args:
+            columns: config.rangesと同じ順序の列データ
+            config: シート設定情報
+        
+        Returns:
+            各項目が本来の列位置に配置された行データのリスト
+        """
+        indexes = list(config.column_indexes.values())
+        row_count = max((len(column) for column in columns), default=0)
+        width = max(indexes) + 1
+        
+        rows = [[''] * width for _ in range(row_count)]
+        for index, column in zip(indexes, columns):
+            for row, value in zip(rows, column):
+                row[index] = value
+        
+        return rows
+    
     def load_unprocessed_companies(self, config: SheetConfig, 
                                  hp_url_column: str = None) -> List[CompanyInfo]:
         """
@@ -174,17 +268,17 @@ class DataLoader:
             
             # ヘッダー行を取得
             header_row = all_values[0] if all_values else []
-            data_rows = all_values[config.start_row-1:]
+            data_rows = itertools.islice(all_values, config.start_row - 1, None)
             
             # HP URL列のインデックスを取得
             hp_url_col_index = self._column_letter_to_index(hp_url_column)
             
-            # 未処理行をフィルタリング
-            unprocessed_rows = []
-            for i, row in enumerate(data_rows):
-                # 行の長さがHP URL列のインデックスより短い場合、または空の場合
-                if len(row) <= hp_url_col_index or not row[hp_url_col_index].strip():
-                    unprocessed_rows.append(row)
+            # 未処理行をフィルタリング（中間リストは作らず、変換と同じ1パスで処理）
+            # 行の長さがHP URL列のインデックスより短い場合、または空の場合が未処理
+            unprocessed_rows = (
+                row for row in data_rows
+                if len(row) <= hp_url_col_index or not row[hp_url_col_index].strip()
+            )
             
             # CompanyInfoオブジェクトに変換
             companies = self._parse_company_data(unprocessed_rows, config)
@@ -196,7 +290,7 @@ class DataLoader:
             logger.error(f"未処理企業データ読み込みに失敗しました: {e}")
             raise
     
-    def _parse_company_data(self, values: List[List[str]], config: SheetConfig) -> List[CompanyInfo]:
+    def _parse_company_data(self, values: Iterable[List[str]], config: SheetConfig) -> List[CompanyInfo]:
         """
         生データをCompanyInfoオブジェクトのリストに変換
         
@@ -207,42 +301,55 @@ class DataLoader:
         Returns:
             CompanyInfoのリスト
         """
-        companies = []
+        return list(self._iter_companies(values, config))
+    
+    def _iter_companies(self, values: Iterable[List[str]], config: SheetConfig) -> Iterator[CompanyInfo]:
+        """
+        生データを1行ずつCompanyInfoオブジェクトに変換して返す
         
-        # 列のインデックスを取得
-        id_col = self._column_letter_to_index(config.input_columns.get('id', 'A'))
-        prefecture_col = self._column_letter_to_index(config.input_columns.get('prefecture', 'B'))
-        industry_col = self._column_letter_to_index(config.input_columns.get('industry', 'C'))
-        company_name_col = self._column_letter_to_index(config.input_columns.get('company_name', 'D'))
+        Args:
+            values: スプレッドシートから取得した生データ
+            config: シート設定情報
+        
+        Yields:
+            CompanyInfo
+        """
+        # 列のインデックスを取得（行ループの外で1回だけ）
+        column_indexes = config.column_indexes
+        id_col = column_indexes['id']
+        prefecture_col = column_indexes['prefecture']
+        industry_col = column_indexes['industry']
+        company_name_col = column_indexes['company_name']
         
         for i, row in enumerate(values):
             try:
                 # 必要な列のデータを取得（不足している場合は空文字列）
-                company_id = self._safe_str(row[id_col]) if len(row) > id_col else ""
-                prefecture = self._safe_str(row[prefecture_col]) if len(row) > prefecture_col else ""
-                industry = self._safe_str(row[industry_col]) if len(row) > industry_col else ""
-                company_name = self._safe_str(row[company_name_col]) if len(row) > company_name_col else ""
+                row_length = len(row)
+                company_id = self._safe_str(row[id_col]).strip() if row_length > id_col else ""
+                company_name = self._safe_str(row[company_name_col]).strip() if row_length > company_name_col else ""
                 
-                # 必須フィールドのチェック
-                if not company_id.strip() or not company_name.strip():
+                # 必須フィールドのチェック（欠落行は残りの列を読まずにスキップ）
+                if not company_id or not company_name:
                     logger.warning(f"必須フィールドが不足している行をスキップしました (行 {i+config.start_row})")
                     continue
                 
+                prefecture = self._safe_str(row[prefecture_col]) if row_length > prefecture_col else ""
+                industry = self._safe_str(row[industry_col]) if row_length > industry_col else ""
+                
                 # CompanyInfoオブジェクトを作成
+                # 都道府県・業種は種類が少なく重複が多いため、internして同一オブジェクトを共有する
                 company = CompanyInfo(
-                    id=company_id.strip(),
-                    company_name=company_name.strip(),
-                    prefecture=prefecture.strip(),
-                    industry=industry.strip()
+                    id=company_id,
+                    company_name=company_name,
+                    prefecture=sys.intern(prefecture.strip()),
+                    industry=sys.intern(industry.strip())
                 )
                 
-                companies.append(company)
-                
             except Exception as e:
                 logger.warning(f"データ解析エラー (行 {i+config.start_row}): {e}")
                 continue
-        
-        return companies
+            
+            yield company
     
     def _safe_str(self, value) -> str:
         """
@@ -268,11 +375,7 @@ class DataLoader:
         Returns:
             0ベースの列インデックス
         """
-        if not column_letter:
-            return 0
-        
-        # A=0, B=1, C=2, ... Z=25の形式に変換
-        return ord(column_letter.upper()) - ord('A')
+        return _column_letter_to_index(column_letter)
     
     def get_sheet_info(self, spreadsheet_id: str, sheet_name: str) -> Dict[str, Any]:
         """
@@ -306,15 +409,18 @@ class DataLoader:
             logger.error(f"シート情報取得に失敗しました: {e}")
             raise
 
-def create_data_loader_from_config(config: Dict[str, Any]) -> DataLoader:
+def create_sheets_client_from_config(config: Dict[str, Any]) -> GoogleSheetsClient:
     """
-    設定辞書からDataLoaderインスタンスを作成
+    設定辞書からGoogleSheetsClientインスタンスを作成
+    
+    読み込み・書き込みで同じクライアントを共有すると、認証と
+    HTTPコネクションプールが1つで済む
     
     Args:
         config: 設定辞書（google_sheetsセクション）
     
     Returns:
-        DataLoaderインスタンス
+        GoogleSheetsClientインスタンス
     """
     google_sheets_config = config.get('google_sheets', {})
     service_account_file = google_sheets_config.get('service_account_file')
@@ -322,5 +428,20 @@ def create_data_loader_from_config(config: Dict[str, Any]) -> DataLoader:
     if not service_account_file:
         raise ValueError("Google Sheets設定にservice_account_fileが指定されていません")
     
-    sheets_client = GoogleSheetsClient(service_account_file)
+    return GoogleSheetsClient(service_account_file)
+
+def create_data_loader_from_config(config: Dict[str, Any],
+                                   sheets_client: Optional[GoogleSheetsClient] = None) -> DataLoader:
+    """
+    設定辞書からDataLoaderインスタンスを作成
+    
+    Args:
+        config: 設定辞書（google_sheetsセクション）
+        sheets_client: 共有するGoogleSheetsClient（Noneの場合は新規作成）
+    
+    Returns:
+        DataLoaderインスタンス
+    """
+    if sheets_client is None:
+        sheets_client = create_sheets_client_from_config(config)
     return DataLoader(sheets_client) 
\ No newline at end of file
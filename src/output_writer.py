@@ -5,18 +5,183 @@ Google Sheets データ書き込みモジュール
 
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
+import json
 import time
+import random
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import gspread
 from googleapiclient.errors import HttpError
 
 from .logger_config import get_logger
-from .data_loader import GoogleSheetsClient
+from .data_loader import GoogleSheetsClient, create_sheets_client_from_config
 
 logger = get_logger(__name__)
 
-@dataclass
+# 値をそのまま保存する（文字列の再解析・型推定を行わせない。スコアは数値として送る）
+_VALUE_INPUT_OPTION = 'RAW'
+
+# 処理日時列の書式
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 1回のbatch_updateに含める上限（413 Request Entity Too Large・リクエスト数上限を避ける控えめな値）
+_MAX_BATCH_BYTES = 1_000_000
+_MAX_BATCH_RANGES = 10_000
+# 範囲1件あたりの {"range": ..., "values": ...} の見積もりバイト数
+_RANGE_OVERHEAD_BYTES = 48
+
+# リトライ対象のHTTPステータス（レート制限・一時的なサーバーエラー）
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503})
+
+@functools.lru_cache(maxsize=None)
+def _column_to_number(column_letter: str) -> int:
+    """列文字（A, B, ..., Z, AA, ...）を1ベースの列番号に変換"""
+    number = 0
+    for char in column_letter.upper():
+        number = number * 26 + (ord(char) - ord('A') + 1)
+    return number
+
+def _build_row_updates(row_number: int, cells: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    1行分のセル更新を、隣接する列ごとにまとめた範囲更新に変換
+    
+    例: E2〜I2の5セル → {'range': 'E2:I2', 'values': [[...5値...]]} の1件
+    
+    Args:
+        row_number: 行番号（1ベース）
+        cells: (列文字, 値) のリスト（書き込むセルのみ）
+    
+    Returns:
+        batch_update用の更新リスト（連続する列の塊ごとに1件）
+    """
+    updates = []
+    run_columns: List[str] = []
+    run_values: List[Any] = []
+    previous_number = None
+    
+    for column, value in sorted(cells, key=lambda cell: _column_to_number(cell[0])):
+        number = _column_to_number(column)
+        if run_columns and number != previous_number + 1:
+            updates.append(_range_update(row_number, run_columns, run_values))
+            run_columns, run_values = [], []
+        run_columns.append(column)
+        run_values.append(value)
+        previous_number = number
+    
+    if run_columns:
+        updates.append(_range_update(row_number, run_columns, run_values))
+    
+    return updates
+
+def _range_update(row_number: int, columns: List[str], values: List[Any]) -> Dict[str, Any]:
+    """連続する列の塊を1件の範囲更新に変換（1セルの場合は単一セル表記）"""
+    row = str(row_number)
+    if len(columns) == 1:
+        range_name = columns[0] + row
+    else:
+        range_name = columns[0] + row + ':' + columns[-1] + row
+    return {'range': range_name, 'values': [values]}
+
+@functools.lru_cache(maxsize=32)
+def _column_runs(columns: Tuple[str, ...]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    列文字の並びを、隣接する列の区間（columns内の位置のタプル）に分割
+    
+    例: ('E', 'F', 'G', 'H', 'I') → ((0, 1, 2, 3, 4),)
+    """
+    column_runs: List[List[int]] = []
+    previous_number = None
+    for position in sorted(range(len(columns)), key=lambda i: _column_to_number(columns[i])):
+        number = _column_to_number(columns[position])
+        if column_runs and number == previous_number + 1:
+            column_runs[-1].append(position)
+        else:
+            column_runs.append([position])
+        previous_number = number
+    return tuple(tuple(run) for run in column_runs)
+
+def _build_block_updates(rows: List[Tuple[int, List[Any]]], columns: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """
+    複数行分の書き込みを、連続する行×隣接する列のブロック単位の範囲更新に変換
+    
+    例: 2〜101行目のE〜I列 → {'range': 'E2:I101', 'values': [[...5値...] × 100行]} の1件
+    値がNoneのセルはSheets APIでスキップされ、既存の値が残る
+    
+    Args:
+        rows: (行番号, columnsと同じ順序の値リスト) のリスト
+        columns: 書き込む列文字のタプル
+    
+    Returns:
+        batch_update用の更新リスト（行の連続区間×列の隣接区間ごとに1件）
+    """
+    # 隣接する列の区間（同じ列設定では計算済みの結果を再利用）
+    column_runs = _column_runs(columns)
+    
+    # 連続する行の区間（同じ行番号が重複した場合は区間を分け、後の書き込みを優先させる）
+    row_runs: List[List[Tuple[int, List[Any]]]] = []
+    for row in sorted(rows, key=lambda row: row[0]):
+        if row_runs and row[0] == row_runs[-1][-1][0] + 1:
+            row_runs[-1].append(row)
+        else:
+            row_runs.append([row])
+    
+    updates = []
+    for row_run in row_runs:
+        first_row, last_row = str(row_run[0][0]), str(row_run[-1][0])
+        for column_run in column_runs:
+            first_column, last_column = columns[column_run[0]], columns[column_run[-1]]
+            if first_row == last_row and first_column == last_column:
+                range_name = first_column + first_row
+            else:
+                range_name = first_column + first_row + ':' + last_column + last_row
+            updates.append({
+                'range': range_name,
+                'values': [[values[position] for position in column_run] for _, values in row_run]
+            })
+    
+    return updates
+
+def _chunk_rows(rows: List[Tuple[int, List[Any]]],
+                ranges_per_row: int,
+                max_bytes: int = _MAX_BATCH_BYTES,
+                max_ranges: int = _MAX_BATCH_RANGES) -> List[List[int]]:
+    """
+    書き込む行を、1回のリクエストの推定サイズ・範囲数が上限を超えないように分割
+    
+    行番号順に詰めていくため、連続する行はできるだけ同じリクエストにまとまる
+    
+    Args:
+        rows: (行番号, 値リスト) のリスト
+        ranges_per_row: 1行あたりの範囲数（隣接しない列の区間数）
+        max_bytes: 1リクエストあたりのJSONサイズ上限（非ASCIIはエスケープ後で数えるため多めに見積もる）
+        max_ranges: 1リクエストあたりの範囲数上限（行が連続しない最悪の場合で数える）
+    
+    Returns:
+        rows内の位置のリストのリスト（分割ごと）
+    """
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    current_bytes = 0
+    
+    for index in sorted(range(len(rows)), key=lambda i: rows[i][0]):
+        # 行が連続しない最悪の場合（1行ごとに範囲が分かれる）で見積もる
+        row_bytes = len(json.dumps(rows[index][1], default=str)) + ranges_per_row * _RANGE_OVERHEAD_BYTES
+        if current and (current_bytes + row_bytes > max_bytes or
+                        (len(current) + 1) * ranges_per_row > max_ranges):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(index)
+        current_bytes += row_bytes
+    
+    if current:
+        chunks.append(current)
+    
+    return chunks
+
+@dataclass(frozen=True, slots=True)
 class OutputColumns:
-    """出力列の設定"""
+    """出力列の設定（変更時はset_output_columnsで新しいインスタンスに差し替える）"""
     url: str = "E"          # HP URL列
     score: str = "F"        # スコア列
     status: str = "G"       # 判定結果列
@@ -30,13 +195,131 @@ class WriteResult:
     company_id: str
     row_number: int
     error_message: Optional[str] = None
+    pending: bool = False  # バッファ書き込みでまだ送信されていない場合True
+    skipped: bool = False  # 前回書き込んだ値と同じためAPI呼び出しを省略した場合True
 
 class OutputWriter:
     """結果書き込みクラス"""
     
-    def __init__(self, sheets_client: GoogleSheetsClient):
+    def __init__(self,
+                 sheets_client: GoogleSheetsClient,
+                 buffered: bool = False,
+                 flush_every: int = 50,
+                 flush_interval_s: float = 2.0,
+                 max_tries: int = 5,
+                 backoff_base: float = 0.5,
+                 max_concurrent: int = 2,
+                 skip_unchanged: bool = False,
+                 max_concurrent_flushes: int = 4):
+        """
+        Args:
+            sheets_client: GoogleSheetsClient
+            buffered: Trueの場合、write_single_resultの書き込みを溜めてまとめて送信する
+            flush_every: バッファがこの件数に達したら送信
+            flush_interval_s: 最初の書き込みからこの秒数を過ぎたら次の書き込み時に送信
+            max_tries: レート制限・一時的エラー時の最大試行回数
+            backoff_base: 指数バックオフの基準秒数（base * 2^n + ジッター）
+            max_concurrent: 同時に実行する書き込みAPI呼び出しの上限
+            skip_unchanged: Trueの場合、前回書き込んだ値と同じ行への書き込みを省略する
+                （処理日時も更新されず、シート上の手動編集も検知できないため既定は無効）
+            max_concurrent_flushes: flushで複数シートのバッファを並列に送信するスレッド数
+        """
         self.sheets_client = sheets_client
         self.output_columns = OutputColumns()
+        # 書き込み順（url, score, status, query, timestamp）の列文字
+        self._cols = self._column_tuple(self.output_columns)
+        # (スプレッドシートID, シート名) → ワークシートのキャッシュ
+        self._ws_cache: Dict[Tuple[str, str], gspread.Worksheet] = {}
+        
+        # バッファ書き込み設定
+        self.buffered = buffered
+        self.flush_every = flush_every
+        self.flush_interval_s = flush_interval_s
+        # (スプレッドシートID, シート名) → {行番号: 結果データ}
+        self._pending: Dict[Tuple[str, str], Dict[int, Dict[str, Any]]] = {}
+        self._pending_since: Dict[Tuple[str, str], float] = {}
+        self._pending_lock = threading.Lock()
+        # 同じシートへの送信は直列化する（並列flush時に書き込み順が入れ替わらないように）
+        self.max_concurrent_flushes = max_concurrent_flushes
+        self._sheet_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        
+        # リトライ・同時実行数の設定（上限を超えた呼び出し側は待たされる）
+        self.max_tries = max_tries
+        self.backoff_base = backoff_base
+        self._write_semaphore = threading.BoundedSemaphore(max_concurrent)
+        
+        # (スプレッドシートID, シート名, 行番号) → 最後に書き込んだ (url, score, status, query)
+        self.skip_unchanged = skip_unchanged
+        self._written_values: Dict[Tuple[str, str, int], Tuple[Any, ...]] = {}
+    
+    def _get_worksheet(self, spreadsheet_id: str, sheet_name: str) -> gspread.Worksheet:
+        """
+        ワークシートを取得（同じシートへの書き込みではメタデータの再取得を行わない）
+        
+        Args:
+            spreadsheet_id: スプレッドシートID
+            sheet_name: シート名
+        
+        Returns:
+            gspread.Worksheet: ワークシート
+        """
+        key = (spreadsheet_id, sheet_name)
+        worksheet = self._ws_cache.get(key)
+        if worksheet is None:
+            gc = self.sheets_client._get_gspread_client()
+            spreadsheet = gc.open_by_key(spreadsheet_id)
+            worksheet = spreadsheet.worksheet(sheet_name)
+            self._ws_cache[key] = worksheet
+        return worksheet
+    
+    def _batch_update(self, worksheet: gspread.Worksheet, updates: List[Dict[str, Any]]):
+        """
+        batch_updateを実行（レート制限・一時的なサーバーエラーは指数バックオフでリトライ）
+        
+        Args:
+            worksheet: 書き込み先ワークシート
+            updates: batch_update用の更新リスト
+        
+        Raises:
+            gspread.exceptions.APIError: リトライ対象外のエラー、または試行回数を使い切った場合
+        """
+        # gspreadは渡した辞書の'range'をシート名付きにその場で書き換えるため、
+        # リトライで二重にシート名が付かないよう試行ごとに辞書を作り直す
+        def send():
+            return worksheet.batch_update([dict(update) for update in updates],
+                                          value_input_option=_VALUE_INPUT_OPTION)
+        
+        return self._call_with_retry(send)
+    
+    def _batch_clear(self, worksheet: gspread.Worksheet, ranges: List[str]):
+        """
+        values.batchClearで範囲を空にする（リトライは_batch_updateと同じ）
+        
+        Args:
+            worksheet: 対象ワークシート
+            ranges: クリアする範囲（A1表記）のリスト
+        """
+        return self._call_with_retry(worksheet.batch_clear, ranges)
+    
+    def _call_with_retry(self, api_call, *args, **kwargs):
+        """
+        書き込みAPIを呼び出す（同時実行数を制限し、429・5xxは指数バックオフでリトライ）
+        
+        Raises:
+            gspread.exceptions.APIError: リトライ対象外のエラー、または試行回数を使い切った場合
+        """
+        with self._write_semaphore:
+            for attempt in range(self.max_tries):
+                try:
+                    return api_call(*args, **kwargs)
+                except gspread.exceptions.APIError as e:
+                    status_code = getattr(getattr(e, 'response', None), 'status_code', None)
+                    if status_code not in _RETRYABLE_STATUS_CODES or attempt + 1 >= self.max_tries:
+                        raise
+                    delay = self.backoff_base * 2 ** attempt + random.random() * self.backoff_base
+                    logger.warning(f"書き込みAPIエラー({status_code})のためリトライします: "
+                                   f"{attempt + 1}/{self.max_tries - 1}回目 ({delay:.1f}秒後)")
+                    time.sleep(delay)
     
     def write_single_result(self, 
                           spreadsheet_id: str,
@@ -63,54 +346,63 @@ class OutputWriter:
         Returns:
             WriteResult: 書き込み結果
         """
+        written_key = (spreadsheet_id, sheet_name, row_number)
+        if (self.skip_unchanged and
+                self._written_values.get(written_key) == (url, score, status, query) and
+                not self._has_pending_row(spreadsheet_id, sheet_name, row_number)):
+            logger.debug(f"前回と同じ値のため書き込みを省略: {company_id} (行 {row_number})")
+            return WriteResult(
+                success=True,
+                company_id=company_id,
+                row_number=row_number,
+                skipped=True
+            )
+        
+        if self.buffered:
+            return self._enqueue_result(spreadsheet_id, sheet_name, {
+                'company_id': company_id,
+                'row_number': row_number,
+                'url': url,
+                'score': score,
+                'status': status,
+                'query': query
+            })
+        
         try:
             logger.debug(f"単一結果書き込み開始: {company_id} (行 {row_number})")
             
-            # gspreadクライアントを取得
-            gc = self.sheets_client._get_gspread_client()
-            spreadsheet = gc.open_by_key(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            # ワークシートを取得（キャッシュ済みのハンドルを再利用）
+            worksheet = self._get_worksheet(spreadsheet_id, sheet_name)
             
-            # 書き込みデータを準備
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            updates = []
+            # 書き込みデータを準備（Noneの項目は既存セルを残すため書き込まない）
+            timestamp = time.strftime(_TIMESTAMP_FORMAT)
+            cells = []
             
             # URL
             if url is not None:
-                updates.append({
-                    'range': f'{self.output_columns.url}{row_number}',
-                    'values': [[url]]
-                })
+                cells.append((self.output_columns.url, url))
             
             # スコア
             if score is not None:
-                updates.append({
-                    'range': f'{self.output_columns.score}{row_number}',
-                    'values': [[score]]
-                })
+                cells.append((self.output_columns.score, score))
             
             # ステータス
-            updates.append({
-                'range': f'{self.output_columns.status}{row_number}',
-                'values': [[status]]
-            })
+            cells.append((self.output_columns.status, status))
             
             # クエリ
             if query is not None:
-                updates.append({
-                    'range': f'{self.output_columns.query}{row_number}',
-                    'values': [[query]]
-                })
+                cells.append((self.output_columns.query, query))
             
             # タイムスタンプ
-            updates.append({
-                'range': f'{self.output_columns.timestamp}{row_number}',
-                'values': [[timestamp]]
-            })
+            cells.append((self.output_columns.timestamp, timestamp))
+            
+            # 隣接する列は1つの範囲にまとめる（既定のE〜I列なら1件）
+            updates = _build_row_updates(row_number, cells)
             
             # バッチ更新実行
             if updates:
-                worksheet.batch_update(updates)
+                self._batch_update(worksheet, updates)
+            self._written_values[written_key] = (url, score, status, query)
             
             logger.info(f"単一結果書き込み完了: {company_id} (行 {row_number})")
             return WriteResult(
@@ -129,6 +421,94 @@ class OutputWriter:
                 error_message=error_msg
             )
     
+    def _has_pending_row(self, spreadsheet_id: str, sheet_name: str, row_number: int) -> bool:
+        """未送信のバッファに指定行の書き込みが残っているか"""
+        with self._pending_lock:
+            return row_number in self._pending.get((spreadsheet_id, sheet_name), {})
+    
+    def _enqueue_result(self,
+                        spreadsheet_id: str,
+                        sheet_name: str,
+                        result: Dict[str, Any]) -> WriteResult:
+        """
+        書き込みをバッファに追加し、件数または経過時間のしきい値を超えたら送信
+        
+        送信前に同じ行へ再度書き込まれた場合は1件にまとめる（Noneの項目は前の値を残す）
+        
+        Args:
+            spreadsheet_id: スプレッドシートID
+            sheet_name: シート名
+            result: write_batch_resultsと同じ形式の結果データ
+        
+        Returns:
+            WriteResult: 未送信の場合はpending=True、送信した場合はその書き込み結果
+        """
+        key = (spreadsheet_id, sheet_name)
+        with self._pending_lock:
+            pending = self._pending.setdefault(key, {})
+            previous = pending.get(result['row_number'])
+            if previous is not None:
+                result = {**previous, **{k: v for k, v in result.items() if v is not None}}
+            pending[result['row_number']] = result
+            since = self._pending_since.setdefault(key, time.monotonic())
+            should_flush = (len(pending) >= self.flush_every or
+                            time.monotonic() - since >= self.flush_interval_s)
+        
+        if should_flush:
+            flushed = self.flush(spreadsheet_id, sheet_name)
+            for write_result in flushed:
+                if write_result.row_number == result['row_number']:
+                    return write_result
+        
+        return WriteResult(
+            success=True,
+            company_id=result['company_id'],
+            row_number=result['row_number'],
+            pending=True
+        )
+    
+    def flush(self,
+              spreadsheet_id: Optional[str] = None,
+              sheet_name: Optional[str] = None) -> List[WriteResult]:
+        """
+        バッファ済みの書き込みを送信
+        
+        Args:
+            spreadsheet_id: 対象のスプレッドシートID（Noneの場合は全て）
+            sheet_name: 対象のシート名（Noneの場合は全て）
+        
+        Returns:
+            List[WriteResult]: 送信した各書き込みの結果
+        """
+        with self._pending_lock:
+            keys = [key for key in self._pending
+                    if (spreadsheet_id is None or key[0] == spreadsheet_id) and
+                    (sheet_name is None or key[1] == sheet_name)]
+            batches = [(key, self._pending.pop(key), self._sheet_locks.setdefault(key, threading.Lock()))
+                       for key in keys]
+            for key in keys:
+                self._pending_since.pop(key, None)
+        
+        def send(batch) -> List[WriteResult]:
+            (batch_spreadsheet_id, batch_sheet_name), results, sheet_lock = batch
+            with sheet_lock:
+                return self.write_batch_results(
+                    spreadsheet_id=batch_spreadsheet_id,
+                    sheet_name=batch_sheet_name,
+                    results=list(results.values())
+                )
+        
+        # シートごとの送信は独立しているため、複数シートがあればスレッドで並列に送信する
+        # （mapは入力順に結果を返すため、結果の順序はシートの追加順のまま）
+        workers = min(self.max_concurrent_flushes, len(batches))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                sent = list(executor.map(send, batches))
+        else:
+            sent = [send(batch) for batch in batches]
+        
+        return [write_result for results in sent for write_result in results]
+    
     def write_batch_results(self, 
                           spreadsheet_id: str,
                           sheet_name: str,
@@ -141,6 +521,7 @@ class OutputWriter:
             sheet_name: シート名
             results: 結果データのリスト
                     [{'company_id': str, 'row_number': int, 'url': str, 'score': float, 'status': str, 'query': str}, ...]
+                    'timestamp' を含む行はその値を、含まない行はバッチ共通の処理日時を書き込む
         
         Returns:
             List[WriteResult]: 各書き込み結果のリスト
@@ -148,60 +529,36 @@ class OutputWriter:
         try:
             logger.info(f"バッチ結果書き込み開始: {len(results)}件")
             
-            # gspreadクライアントを取得
-            gc = self.sheets_client._get_gspread_client()
-            spreadsheet = gc.open_by_key(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            # ワークシートを取得（キャッシュ済みのハンドルを再利用）
+            worksheet = self._get_worksheet(spreadsheet_id, sheet_name)
             
-            # バッチ更新データを準備
-            updates = []
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            # バッチ更新データを準備（処理日時はバッチ全体で1回だけ生成）
+            timestamp = time.strftime(_TIMESTAMP_FORMAT)
             write_results = []
-            
+            rows = []
+            row_results = []  # rowsと同じ順序の書き込み結果
+            # 事前検証：row_numberのない結果は失敗として記録し、書き込みには含めない
             for result in results:
                 try:
                     row_number = result['row_number']
                     company_id = result['company_id']
                     
-                    # URL
-                    if 'url' in result and result['url'] is not None:
-                        updates.append({
-                            'range': f'{self.output_columns.url}{row_number}',
-                            'values': [[result['url']]]
-                        })
-                    
-                    # スコア
-                    if 'score' in result and result['score'] is not None:
-                        updates.append({
-                            'range': f'{self.output_columns.score}{row_number}',
-                            'values': [[result['score']]]
-                        })
-                    
-                    # ステータス
-                    if 'status' in result:
-                        updates.append({
-                            'range': f'{self.output_columns.status}{row_number}',
-                            'values': [[result['status']]]
-                        })
+                    # 値がない項目はNone（Sheets APIがスキップし既存セルを残す）
+                    rows.append((row_number, [
+                        result.get('url'),
+                        result.get('score'),
+                        result.get('status'),
+                        result.get('query'),
+                        result.get('timestamp') or timestamp
+                    ]))
                     
-                    # クエリ
-                    if 'query' in result and result['query'] is not None:
-                        updates.append({
-                            'range': f'{self.output_columns.query}{row_number}',
-                            'values': [[result['query']]]
-                        })
-                    
-                    # タイムスタンプ
-                    updates.append({
-                        'range': f'{self.output_columns.timestamp}{row_number}',
-                        'values': [[timestamp]]
-                    })
-                    
-                    write_results.append(WriteResult(
+                    write_result = WriteResult(
                         success=True,
                         company_id=company_id,
                         row_number=row_number
-                    ))
+                    )
+                    write_results.append(write_result)
+                    row_results.append(write_result)
                     
                 except Exception as e:
                     error_msg = f"バッチデータ準備エラー: {result.get('company_id', 'unknown')} - {e}"
@@ -213,18 +570,25 @@ class OutputWriter:
                         error_message=error_msg
                     ))
             
-            # バッチ更新実行
-            if updates:
+            # 1回のリクエストが大きくなりすぎないよう分割し、それぞれを
+            # 連続する行×隣接する列のブロックごとの範囲更新にまとめて送信
+            chunks = _chunk_rows(rows, len(_column_runs(self._cols)))
+            for chunk in chunks:
+                chunk_rows = [rows[index] for index in chunk]
+                updates = _build_block_updates(chunk_rows, self._cols)
                 try:
-                    worksheet.batch_update(updates)
-                    logger.info(f"バッチ結果書き込み完了: {len(updates)}件の更新")
+                    self._batch_update(worksheet, updates)
+                    for row_number, values in chunk_rows:
+                        self._written_values[(spreadsheet_id, sheet_name, row_number)] = tuple(values[:4])
                 except Exception as e:
                     logger.error(f"バッチ更新実行エラー: {e}")
-                    # 全ての結果を失敗に変更
-                    for wr in write_results:
-                        if wr.success:
-                            wr.success = False
-                            wr.error_message = f"バッチ更新実行エラー: {e}"
+                    # この分割に含まれる結果を失敗に変更
+                    for index in chunk:
+                        row_results[index].success = False
+                        row_results[index].error_message = f"バッチ更新実行エラー: {e}"
+            
+            if rows:
+                logger.info(f"バッチ結果書き込み完了: {len(rows)}行 ({len(chunks)}回のリクエスト)")
             
             return write_results
             
@@ -261,29 +625,21 @@ class OutputWriter:
         try:
             logger.debug(f"エラー状態書き込み開始: {company_id} (行 {row_number})")
             
-            # gspreadクライアントを取得
-            gc = self.sheets_client._get_gspread_client()
-            spreadsheet = gc.open_by_key(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            # ワークシートを取得（キャッシュ済みのハンドルを再利用）
+            worksheet = self._get_worksheet(spreadsheet_id, sheet_name)
+            
+            # 行の内容が変わるため、前回書き込んだ値の記録を破棄
+            self._written_values.pop((spreadsheet_id, sheet_name, row_number), None)
             
-            # エラー状態を書き込み
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            updates = [
-                {
-                    'range': f'{self.output_columns.status}{row_number}',
-                    'values': [['処理エラー']]
-                },
-                {
-                    'range': f'{self.output_columns.query}{row_number}',
-                    'values': [[f'エラー: {error_message}']]
-                },
-                {
-                    'range': f'{self.output_columns.timestamp}{row_number}',
-                    'values': [[timestamp]]
-                }
-            ]
+            # エラー状態を書き込み（隣接する列は1つの範囲にまとめる）
+            timestamp = time.strftime(_TIMESTAMP_FORMAT)
+            updates = _build_row_updates(row_number, [
+                (self.output_columns.status, '処理エラー'),
+                (self.output_columns.query, f'エラー: {error_message}'),
+                (self.output_columns.timestamp, timestamp)
+            ])
             
-            worksheet.batch_update(updates)
+            self._batch_update(worksheet, updates)
             
             logger.info(f"エラー状態書き込み完了: {company_id} (行 {row_number})")
             return WriteResult(
@@ -322,36 +678,17 @@ class OutputWriter:
         try:
             logger.debug(f"行データクリア開始: {company_id} (行 {row_number})")
             
-            # gspreadクライアントを取得
-            gc = self.sheets_client._get_gspread_client()
-            spreadsheet = gc.open_by_key(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            # ワークシートを取得（キャッシュ済みのハンドルを再利用）
+            worksheet = self._get_worksheet(spreadsheet_id, sheet_name)
             
-            # 出力列をクリア
-            updates = [
-                {
-                    'range': f'{self.output_columns.url}{row_number}',
-                    'values': [['']]
-                },
-                {
-                    'range': f'{self.output_columns.score}{row_number}',
-                    'values': [['']]
-                },
-                {
-                    'range': f'{self.output_columns.status}{row_number}',
-                    'values': [['']]
-                },
-                {
-                    'range': f'{self.output_columns.query}{row_number}',
-                    'values': [['']]
-                },
-                {
-                    'range': f'{self.output_columns.timestamp}{row_number}',
-                    'values': [['']]
-                }
-            ]
+            # 行の内容が変わるため、前回書き込んだ値の記録を破棄
+            self._written_values.pop((spreadsheet_id, sheet_name, row_number), None)
             
-            worksheet.batch_update(updates)
+            # 出力列をクリア（値の書き込みではなくclearで、隣接する列は1つの範囲にまとめる）
+            ranges = [update['range'] for update in
+                      _build_row_updates(row_number, [(column, None) for column in self._cols])]
+            
+            self._batch_clear(worksheet, ranges)
             
             logger.info(f"行データクリア完了: {company_id} (行 {row_number})")
             return WriteResult(
@@ -378,8 +715,17 @@ class OutputWriter:
             output_columns: 新しい出力列設定
         """
         self.output_columns = output_columns
+        self._cols = self._column_tuple(output_columns)
+        # 書き込み先の列が変わるため、前回書き込んだ値の記録は使えない
+        self._written_values.clear()
         logger.info(f"出力列設定を変更しました: {output_columns}")
     
+    @staticmethod
+    def _column_tuple(output_columns: OutputColumns) -> Tuple[str, ...]:
+        """出力列設定を書き込み順の列文字タプルに変換"""
+        return (output_columns.url, output_columns.score, output_columns.status,
+                output_columns.query, output_columns.timestamp)
+    
     def get_output_columns(self) -> OutputColumns:
         """
         現在の出力列設定を取得
@@ -389,24 +735,34 @@ class OutputWriter:
         """
         return self.output_columns
 
-def create_output_writer_from_config(config: Dict[str, Any]) -> OutputWriter:
+def create_output_writer_from_config(config: Dict[str, Any],
+                                     sheets_client: Optional[GoogleSheetsClient] = None) -> OutputWriter:
     """
     設定辞書からOutputWriterインスタンスを作成
     
     Args:
         config: 設定辞書（google_sheetsセクション）
+        sheets_client: 共有するGoogleSheetsClient（Noneの場合は新規作成）
     
     Returns:
         OutputWriterインスタンス
     """
     google_sheets_config = config.get('google_sheets', {})
-    service_account_file = google_sheets_config.get('service_account_file')
-    
-    if not service_account_file:
-        raise ValueError("Google Sheets設定にservice_account_fileが指定されていません")
-    
-    sheets_client = GoogleSheetsClient(service_account_file)
-    output_writer = OutputWriter(sheets_client)
+    if sheets_client is None:
+        sheets_client = create_sheets_client_from_config(config)
+    write_buffer_config = google_sheets_config.get('write_buffer', {})
+    write_retry_config = google_sheets_config.get('write_retry', {})
+    output_writer = OutputWriter(
+        sheets_client,
+        buffered=write_buffer_config.get('enabled', False),
+        flush_every=write_buffer_config.get('flush_every', 50),
+        flush_interval_s=write_buffer_config.get('flush_interval_s', 2.0),
+        max_tries=write_retry_config.get('max_tries', 5),
+        backoff_base=write_retry_config.get('backoff_base', 0.5),
+        max_concurrent=write_retry_config.get('max_concurrent', 2),
+        skip_unchanged=google_sheets_config.get('skip_unchanged_writes', False),
+        max_concurrent_flushes=write_buffer_config.get('max_concurrent_flushes', 4)
+    )
     
     # 出力列の設定があれば適用
     output_columns_config = google_sheets_config.get('output_columns', {})
@@ -6,7 +6,6 @@
 import asyncio
 import aiohttp
 import sys
-import traceback
 from typing import List, Dict, Any, Optional, NamedTuple
 from pathlib import Path
 import json
@@ -17,7 +16,7 @@ sys.path.append(str(Path(__file__).parent))
 from .logger_config import get_logger
 from .utils import ConfigManager, BlacklistChecker
 from .search_agent import BraveSearchClient, CompanyInfo, QueryGenerator, SearchAgent
-from .data_loader import DataLoader, SheetConfig, create_data_loader_from_config
+from .data_loader import DataLoader, SheetConfig, create_data_loader_from_config, create_sheets_client_from_config
 from .output_writer import OutputWriter, create_output_writer_from_config
 from .scorer import HPScorer, create_scorer_from_config
 
@@ -49,8 +48,9 @@ class Phase1QueryTester:
         # Search Agent の初期化
         self.search_agent = SearchAgent(self.brave_client)
         
-        self.data_loader = create_data_loader_from_config(config)
-        self.output_writer = create_output_writer_from_config(config)
+        self.sheets_client = create_sheets_client_from_config(config)
+        self.data_loader = create_data_loader_from_config(config, self.sheets_client)
+        self.output_writer = create_output_writer_from_config(config, self.sheets_client)
         self.scorer = create_scorer_from_config(config, self.blacklist_checker)
         
         # フェーズ1用の3つのクエリパターンを定義
@@ -128,8 +128,7 @@ class Phase1QueryTester:
             }
             
         except Exception as e:
-            logger.error(f"クエリテスト実行エラー: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"クエリテスト実行エラー: {e}")
             return {"success": False, "error": str(e)}
     
     async def _load_test_companies(self, 
@@ -157,7 +156,7 @@ class Phase1QueryTester:
             )
             
             # 企業データ読み込み
-            companies = self.data_loader.load_companies_from_range(sheet_config)
+            companies = self.data_loader.load_companies_batch(sheet_config)
             
             # 最大数制限
             if len(companies) > max_companies:
@@ -443,8 +442,7 @@ async def main():
             logger.error(f"テスト失敗: {results.get('error')}")
     
     except Exception as e:
-        logger.error(f"メイン処理エラー: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"メイン処理エラー: {e}")
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -4,19 +4,187 @@ HP URL スコアリングモジュール
 """
 
 import re
+import functools
+import unicodedata
 import pykakasi
-from typing import List, Dict, Any, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set, Tuple, FrozenSet
 from dataclasses import dataclass
 from urllib.parse import urlparse
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 from rapidfuzz import utils as fuzz_utils
 
 from .logger_config import get_logger
 from .search_agent import SearchResult, CompanyInfo
 from .utils import StringUtils, URLUtils
+from .web_content_analyzer import WebContentAnalyzer, _ALL_PREFECTURES
 
 logger = get_logger(__name__)
 
+# _romanize のメモ化件数上限
+_ROMANIZE_CACHE_SIZE = 8192
+
+# 企業名ごとの比較候補のキャッシュ件数上限
+_NAME_CANDIDATES_CACHE_SIZE = 4096
+
+# 企業名正規化結果のキャッシュ件数上限
+_CLEAN_NAME_CACHE_SIZE = 4096
+
+# 企業名×ドメインラベルの類似度キャッシュ件数上限
+_LABEL_SIMILARITY_CACHE_SIZE = 8192
+
+# 企業名ごとの前処理結果（CompanyFeatures）のキャッシュ件数上限
+_COMPANY_FEATURES_CACHE_SIZE = 4096
+
+# URLごとの解析結果（URLFeatures）のキャッシュ件数上限
+_URL_FEATURES_CACHE_SIZE = 8192
+
+# HeadMatch判定前に企業名から除去する業種接頭語
+_HEAD_MATCH_BUSINESS_PREFIXES = ('美容室', 'サロン', 'ヘアサロン', '理容室', '理容店', 'バーバー', 'エステ', 'ネイル')
+
+# 🔥 ポータルサイト完全除外リスト（-100点）
+_PORTAL_DOMAINS = frozenset({
+    # 美容系ポータル
+    'beauty.hotpepper.jp',
+    'hotpepper.jp', 
+    'beauty.rakuten.co.jp',
+    'rakuten.co.jp',
+    'minimodel.jp',
+    'relax.jp',
+    'beauty.biglobe.ne.jp',
+    'epark.jp',
+    'salonia.com',
+    
+    # 汎用ポータル
+    'yahoo.co.jp',
+    'google.com',
+    'gnaviapp.com', 
+    'tabelog.com',
+    'yelp.com',
+    'itp.ne.jp',        # タウンページ
+    'mapion.co.jp',     # マピオン
+    'navitime.co.jp',   # ナビタイム
+    
+    # SNS・まとめ系
+    'facebook.com',
+    'instagram.com', 
+    'twitter.com',
+    'ameblo.jp',
+    'fc2.com',
+    'livedoor.jp',
+    'blogger.com',
+    'wordpress.com',
+    
+    # 求人系
+    'rikunabi.com',
+    'mynavi.jp',
+    'indeed.com',
+    'doda.jp',
+    'baitoru.com',
+    
+    # EC・レビュー系
+    'amazon.co.jp',
+    'mercari.com',
+    'kakaku.com',
+    '@cosme.net',
+})
+
+# ドメインに対する部分一致を1回の走査で判定するための正規表現
+_PORTAL_DOMAIN_RE = re.compile('|'.join(re.escape(d) for d in sorted(_PORTAL_DOMAINS)))
+
+# 汎用語リスト（これらのみの一致は減点）
+_GENERIC_WORDS = frozenset({
+    # 美容系汎用語
+    'hair', 'salon', 'beauty', 'cut', 'style', 'nail', 'spa',
+    'esthetic', 'relax', 'care', 'clinic', 'total', 'private',
+    
+    # 一般汎用語
+    'group', 'company', 'corp', 'co', 'inc', 'ltd', 'shop',
+    'store', 'center', 'studio', 'design', 'creative', 'pro',
+    'plus', 'premium', 'select', 'special', 'new', 'fresh',
+    'modern', 'urban', 'royal', 'grand', 'first', 'main',
+    
+    # 地域系汎用語
+    'tokyo', 'osaka', 'nagoya', 'yokohama', 'kyoto', 'kobe',
+    'shibuya', 'shinjuku', 'ikebukuro', 'ginza', 'omotesando'
+})
+
+_ALPHA_WORD_RE = re.compile(r'[a-zA-Z]+')
+
+# ローマ字変換の対象とする日本語文字
+_JAPANESE_CHAR_RE = re.compile(r'[あ-んア-ヶー一-龯]')
+
+# 企業名正規化で除去する記号（英数字・ひらがな・カタカナ・漢字・空白以外）
+_NAME_SYMBOL_RE = re.compile(r'[^\w\sぁ-んァ-ヴー一-龯]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# HeadMatch用の単語区切り・スペース記号
+_HEAD_WORD_SPLIT_RE = re.compile(r'[\s\-_×&・]')
+_HEAD_SPACE_SYMBOL_RE = re.compile(r'[\s\-_×&]')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# 公式サイトを示すタイトルのキーワード
+_OFFICIAL_KEYWORDS = ('公式', 'official', 'オフィシャル', '正式')
+
+# 減点対象の怪しいTLD
+_SUSPICIOUS_TLDS = ('.tk', '.ml', '.ga', '.cf', '.xyz', '.click', '.download')
+
+# ポータルドメインごとの減点（先に一致したものを採用）
+_PORTAL_PENALTIES = (
+    ('hotpepper.jp', -4),
+    ('beauty.hotpepper.jp', -4),
+    ('relax.jp', -3),
+    ('rakuten.co.jp', -2),
+    ('yahoo.co.jp', -2),
+    ('google.com', -2),
+)
+
+# Webページ解析による地域判定を行わないポータル
+_LOCALITY_PORTAL_DOMAINS = (
+    'hotpepper.jp', 'rakuten.co.jp', 'minimodel.jp', 'relax.jp',
+    'yahoo.co.jp', 'google.com', 'tabelog.com'
+)
+
+# HeadMatchでポータル扱いするドメイン
+_HEAD_MATCH_PORTAL_DOMAINS = _LOCALITY_PORTAL_DOMAINS + (
+    'gnavi.co.jp', 'beauty.hotpepper.jp', 'hairbook.jp'
+)
+
+# ドメイン・企業名候補のトークン区切り
+_DOMAIN_TOKEN_SPLIT_RE = re.compile(r'[-_\.]')
+_CANDIDATE_TOKEN_SPLIT_RE = re.compile(r'[\s\-_]')
+
+# 地域スコア用の都道府県 → 代表的な市外局番
+_SCORING_AREA_CODES = {
+    '愛知県': '052',      # 名古屋市圏
+    '東京都': '03',       # 東京23区
+    '大阪府': '06',       # 大阪市
+    '神奈川県': '045',    # 横浜市
+    '兵庫県': '078',      # 神戸市
+    '京都府': '075',      # 京都市
+    '福岡県': '092',      # 福岡市
+    '北海道': '011',      # 札幌市
+    '宮城県': '022',      # 仙台市
+    '広島県': '082',      # 広島市
+    '静岡県': '054',      # 静岡市
+    '千葉県': '043',      # 千葉市
+    '埼玉県': '048',      # さいたま市
+}
+
+# 市外局番ごとの電話番号パターン（ハイフン・空白ありなし両対応）
+_AREA_PHONE_RES = {
+    area_code: re.compile(rf'{area_code}[-\s]?[0-9]{{7,8}}')
+    for area_code in _SCORING_AREA_CODES.values()
+}
+
+# 他県ペナルティ判定用の (都道府県, 照合する正式名, 照合する短縮名)
+# 短縮名は都/道/府/県の文字をすべて除いたもの（従来の判定と同じ）
+_OTHER_PREFECTURE_TERMS: Tuple[Tuple[str, str, str], ...] = tuple(
+    (prefecture, prefecture.lower(),
+     prefecture.replace('県', '').replace('府', '').replace('都', '').replace('道', '').lower())
+    for prefecture in _ALL_PREFECTURES
+)
+
 @dataclass
 class HPCandidate:
     """HP候補を表すデータクラス"""
@@ -31,6 +199,23 @@ class HPCandidate:
     judgment: str  # '自動採用', '要確認', '手動確認'
     score_details: Dict[str, Any]
 
+@dataclass(slots=True, frozen=True)
+class CompanyFeatures:
+    """候補URLに依存しない企業名の前処理結果（企業ごとに1回だけ計算）"""
+    company_name: str
+    normalized_name: str            # 強化正規化済みの企業名（【】・法人格除去済み）
+    head_name: str                  # HeadMatch用の正規化名（業種接頭語除去済み、小文字）
+    head_name_no_space: str         # head_nameからスペース・記号を除いたもの
+    head_words: Tuple[str, ...]     # head_nameを単語分割したもの（2文字以上）
+    english_words: FrozenSet[str]   # 企業名中の英単語（小文字）
+    name_tokens: FrozenSet[str]     # 比較候補を語幹スプリットしたトークン集合（ドメイン類似度の完全一致判定用）
+
+@dataclass(slots=True, frozen=True)
+class URLFeatures:
+    """URLの解析結果（URLごとに1回だけurlparseする）"""
+    path: str           # 小文字化したパス
+    is_top_page: bool   # パス深度0（index.html等を含む）か
+
 @dataclass 
 class ScoringConfig:
     """スコアリング設定"""
@@ -51,6 +236,74 @@ class ScoringConfig:
     needs_review_threshold: int = 6
     similarity_threshold_domain: int = 80
 
+@functools.lru_cache(maxsize=1)
+def _get_kakasi() -> pykakasi.kakasi:
+    """
+    pykakasiコンバータを取得（初回のみ生成）
+    変換辞書の構築はHPScorerの生成ごとに行う必要がないため全インスタンスで共有する
+    """
+    return pykakasi.kakasi()
+
+@functools.lru_cache(maxsize=_ROMANIZE_CACHE_SIZE)
+def _romanize_cached(text: str) -> str:
+    """
+    pykakasiによるローマ字変換（HPScorer._romanizeの本体）
+    純粋な文字列変換なのでインスタンスをまたいで結果を共有する
+    """
+    # ASCIIのみの文字列は変換しても変わらないため辞書引きを省略
+    if text.isascii():
+        return text.lower().strip()
+    
+    try:
+        # v2.0+ New API: convertメソッドで辞書リストを取得
+        result = _get_kakasi().convert(text)
+        romanized = ''.join([item['hepburn'] for item in result])
+        
+        # 小文字に統一し、余分な空白を除去
+        return romanized.lower().strip()
+        
+    except Exception as e:
+        logger.warning(f"ローマ字変換エラー: text='{text}' - {e}")
+        return ""
+
+@functools.lru_cache(maxsize=_URL_FEATURES_CACHE_SIZE)
+def _extract_url_features(url: str) -> URLFeatures:
+    """
+    URLを1回だけ解析し、トップページ判定・パスペナルティ判定に使う値をまとめて返す
+    同じURLは複数クエリパターンに出現するためインスタンス間で共有してメモ化する
+    """
+    try:
+        path = urlparse(url).path
+        return URLFeatures(
+            path=path.lower(),
+            is_top_page=URLUtils.get_path_depth_from_path(path) == 0
+        )
+    except Exception as e:
+        logger.warning(f"URL解析エラー: {url} - {e}")
+        # エラー時はトップページではなく、パスペナルティもなしとする
+        return URLFeatures(path="", is_top_page=False)
+
+@functools.lru_cache(maxsize=_CLEAN_NAME_CACHE_SIZE)
+def _clean_company_name_cached(company_name: str) -> str:
+    """企業名の強化正規化（HPScorer._enhanced_clean_company_nameの本体、インスタンス間で共有）"""
+    # 基本の正規化（【】除去、空白正規化）
+    cleaned = StringUtils.clean_company_name(company_name)
+    
+    # 法人接尾語を除去
+    cleaned = StringUtils.remove_legal_suffixes(cleaned)
+    
+    # 全角英数字を半角に変換
+    cleaned = unicodedata.normalize('NFKC', cleaned)
+    
+    # 記号を除去（ただし、日本語文字は保持）
+    # 英数字、ひらがな、カタカナ、漢字、空白のみ残す
+    cleaned = _NAME_SYMBOL_RE.sub('', cleaned)
+    
+    # 余分な空白を除去
+    cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
+    
+    return cleaned
+
 class HPScorer:
     """HP URLスコアリングクラス"""
     
@@ -58,11 +311,18 @@ class HPScorer:
         self.config = config
         self.blacklist_domains = blacklist_domains if blacklist_domains is not None else set()
         self.penalty_paths = penalty_paths if penalty_paths is not None else []
+        # ペナルティパスの部分一致判定は1つの正規表現でURLパスを1回走査する
+        self._penalty_path_re = (re.compile('|'.join(re.escape(path) for path in self.penalty_paths))
+                                 if self.penalty_paths else None)
         self.string_utils = StringUtils()
         self.url_utils = URLUtils()
         
-        # pykakasi コンバータを初期化してキャッシュ（v2.0+ New API）
-        self._kks = pykakasi.kakasi()
+        # 企業名側の比較候補は候補URLごとに作り直さないようメモ化
+        self._name_candidates_cached = functools.lru_cache(maxsize=_NAME_CANDIDATES_CACHE_SIZE)(self._build_name_candidates)
+        # 企業名×ドメインラベルの類似度もメモ化（同じドメインが複数パターンで出現するため）
+        self._label_similarity_cached = functools.lru_cache(maxsize=_LABEL_SIMILARITY_CACHE_SIZE)(self._compute_label_similarity)
+        # 企業名の前処理結果も企業ごとに1回だけ計算
+        self._company_features_cached = functools.lru_cache(maxsize=_COMPANY_FEATURES_CACHE_SIZE)(self._build_company_features)
     
     def _romanize(self, text: str) -> str:
         """
@@ -74,20 +334,9 @@ class HPScorer:
         Returns:
             ローマ字変換された文字列
         """
-        try:
-            if not text:
-                return ""
-            
-            # v2.0+ New API: convertメソッドで辞書リストを取得
-            result = self._kks.convert(text)
-            romanized = ''.join([item['hepburn'] for item in result])
-            
-            # 小文字に統一し、余分な空白を除去
-            return romanized.lower().strip()
-            
-        except Exception as e:
-            logger.warning(f"ローマ字変換エラー: text='{text}' - {e}")
+        if not text:
             return ""
+        return _romanize_cached(text)
     
     def _enhanced_clean_company_name(self, company_name: str) -> str:
         """
@@ -102,64 +351,164 @@ class HPScorer:
         """
         if not company_name:
             return ""
+        return _clean_company_name_cached(company_name)
+    
+    def _get_name_candidates(self, company_name: str) -> Tuple[str, ...]:
+        """
+        ドメイン比較に使う企業名側の候補を取得
+        候補はURLに依存しないため、企業名ごとに1回だけ生成してキャッシュする
         
-        # 基本の正規化（【】除去、空白正規化）
-        cleaned = self.string_utils.clean_company_name(company_name)
+        Args:
+            company_name: 原企業名
         
-        # 法人接尾語を除去
-        cleaned = self.string_utils.remove_legal_suffixes(cleaned)
+        Returns:
+            比較候補のタプル（正規化名・ローマ字・カタカナ部ローマ字・小文字英語）
+        """
+        return self._name_candidates_cached(company_name)
+    
+    def prepare_company(self, company: CompanyInfo) -> CompanyFeatures:
+        """
+        候補URLに依存しない企業名の前処理を行う
+        同じ企業の候補をまとめて採点する際は、1回だけ呼んでcalculate_scoreに渡す
         
-        # 全角英数字を半角に変換
-        import unicodedata
-        cleaned = unicodedata.normalize('NFKC', cleaned)
+        Args:
+            company: 企業情報
+        
+        Returns:
+            CompanyFeatures
+        """
+        return self._company_features_cached(company.company_name)
+    
+    def _build_company_features(self, company_name: str) -> CompanyFeatures:
+        """企業名の前処理本体（prepare_companyからキャッシュ経由で呼ばれる）"""
+        normalized_name = self._enhanced_clean_company_name(company_name)
+        head_name = normalized_name
         
-        # 記号を除去（ただし、日本語文字は保持）
-        # 英数字、ひらがな、カタカナ、漢字、空白のみ残す
-        cleaned = re.sub(r'[^\w\sぁ-んァ-ヴー一-龯]', '', cleaned)
+        # 🚀 業種接頭語を除去（HeadMatch専用）
+        for prefix in _HEAD_MATCH_BUSINESS_PREFIXES:
+            if head_name.startswith(prefix):
+                head_name = head_name[len(prefix):].strip()
+                break
         
-        # 余分な空白を除去
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        head_words = tuple(
+            w.strip().lower() for w in _HEAD_WORD_SPLIT_RE.split(head_name)
+            if w.strip() and len(w.strip()) >= 2
+        )
+        head_name = head_name.lower()
         
-        return cleaned
+        return CompanyFeatures(
+            company_name=company_name,
+            normalized_name=normalized_name,
+            head_name=head_name,
+            head_name_no_space=_HEAD_SPACE_SYMBOL_RE.sub('', head_name),
+            head_words=head_words,
+            english_words=frozenset(_ALPHA_WORD_RE.findall(company_name.lower())),
+            name_tokens=frozenset(
+                token
+                for candidate in self._get_name_candidates(company_name)
+                for token in self._split_candidate_tokens(candidate)
+            )
+        )
     
-    def _calculate_domain_similarity(self, company_name: str, url: str) -> float:
+    def _build_name_candidates(self, company_name: str) -> Tuple[str, ...]:
+        """企業名の比較候補を生成（_get_name_candidatesからキャッシュ経由で呼ばれる）"""
+        # 企業名の正規化
+        cleaned_name = self._enhanced_clean_company_name(company_name)
+        
+        candidates = []
+        
+        # 1. 原企業名（正規化済み）
+        if cleaned_name:
+            candidates.append(cleaned_name)
+        
+        # 2. ローマ字変換版（日本語がある場合のみ）
+        if _JAPANESE_CHAR_RE.search(cleaned_name):
+            romanized_name = self._romanize(cleaned_name)
+            if romanized_name and romanized_name != cleaned_name.lower():
+                candidates.append(romanized_name)
+        
+        # 3. カタカナ部分のみ抽出してローマ字変換
+        katakana_only = self.string_utils.extract_katakana(company_name)
+        if katakana_only:
+            romanized_katakana = self._romanize(katakana_only)
+            if romanized_katakana and romanized_katakana not in candidates:
+                candidates.append(romanized_katakana)
+                
+        # 4. 英語の場合は小文字化した版も追加
+        if _ALPHA_WORD_RE.search(cleaned_name):
+            lower_name = cleaned_name.lower()
+            if lower_name not in candidates:
+                candidates.append(lower_name)
+        
+        return tuple(candidates)
+    
+    def _calculate_domain_similarity(self, company_name: str, url: str, domain: Optional[str] = None) -> float:
         """
         ドメイン名と企業名の類似度計算（語幹スプリット強化版）
         日本語→ローマ字変換と複数アルゴリズムを使用
+        domainを渡した場合はURLの再解析を行わない
         """
         try:
-            # 企業名の正規化
-            cleaned_name = self._enhanced_clean_company_name(company_name)
-            
             # ドメイン名の取得
-            domain = self.url_utils.get_domain(url)
+            if domain is None:
+                domain = self.url_utils.get_domain(url)
             domain_without_tld = domain.split('.')[0]
             
-            # 比較候補を準備
-            candidates = []
-            
-            # 1. 原企業名（正規化済み）
-            if cleaned_name:
-                candidates.append(cleaned_name)
-            
-            # 2. ローマ字変換版（日本語がある場合のみ）
-            if re.search(r'[あ-んア-ヶー一-龯]', cleaned_name):
-                romanized_name = self._romanize(cleaned_name)
-                if romanized_name and romanized_name != cleaned_name.lower():
-                    candidates.append(romanized_name)
-            
-            # 3. カタカナ部分のみ抽出してローマ字変換
-            katakana_only = self.string_utils.extract_katakana(company_name)
-            if katakana_only:
-                romanized_katakana = self._romanize(katakana_only)
-                if romanized_katakana and romanized_katakana not in candidates:
-                    candidates.append(romanized_katakana)
-                    
-            # 4. 英語の場合は小文字化した版も追加
-            if re.search(r'[a-zA-Z]', cleaned_name):
-                lower_name = cleaned_name.lower()
-                if lower_name not in candidates:
-                    candidates.append(lower_name)
+            return self._calculate_label_similarity(company_name, domain_without_tld)
+            
+        except Exception as e:
+            logger.warning(f"ドメイン類似度計算エラー: Name='{company_name}', URL='{url}' - {e}", exc_info=True)
+            return 0.0
+    
+    def calculate_domain_similarities(self, company_name: str, urls: List[str]) -> Dict[str, float]:
+        """
+        複数URLのドメイン類似度を一括計算
+        企業名側の候補は1回だけ生成し、同じドメインラベルは1回だけ比較する
+        
+        Args:
+            company_name: 企業名
+            urls: 検索結果のURLリスト
+        
+        Returns:
+            URL -> 類似度 の辞書
+        """
+        similarities: Dict[str, float] = {}
+        label_scores: Dict[str, float] = {}
+        
+        for url in urls:
+            if url in similarities:
+                continue
+            try:
+                domain_without_tld = self.url_utils.get_domain(url).split('.')[0]
+            except Exception as e:
+                logger.warning(f"ドメイン類似度計算エラー: Name='{company_name}', URL='{url}' - {e}")
+                similarities[url] = 0.0
+                continue
+            
+            if domain_without_tld not in label_scores:
+                label_scores[domain_without_tld] = self._calculate_label_similarity(company_name, domain_without_tld)
+            similarities[url] = label_scores[domain_without_tld]
+        
+        return similarities
+    
+    def _calculate_label_similarity(self, company_name: str, domain_without_tld: str) -> float:
+        """
+        企業名とドメインラベル（TLD除去済み）の類似度計算
+        
+        Args:
+            company_name: 企業名
+            domain_without_tld: ドメインの先頭ラベル
+        
+        Returns:
+            類似度（0-100）
+        """
+        return self._label_similarity_cached(company_name, domain_without_tld)
+    
+    def _compute_label_similarity(self, company_name: str, domain_without_tld: str) -> float:
+        """類似度計算本体（_calculate_label_similarityからキャッシュ経由で呼ばれる）"""
+        try:
+            # 企業名側の比較候補（企業ごとにキャッシュ済み）
+            candidates = self._get_name_candidates(company_name)
             
             # 🚀 5. 語幹スプリット強化（NEW）
             # ドメインを単語に分割してそれぞれと比較
@@ -167,28 +516,38 @@ class HPScorer:
             
             # 候補が空の場合は0を返す
             if not candidates:
-                logger.debug(f"[SIM] 比較候補なし: name='{company_name}' -> cleaned='{cleaned_name}'")
+                logger.debug(f"[SIM] 比較候補なし: name='{company_name}'")
                 return 0.0
             
+            # ドメインのトークンが候補トークンと完全一致すれば語幹スプリット類似度は100で、
+            # 最高スコアも100に確定するため、ファジー比較を省略する
+            name_tokens = self._company_features_cached(company_name).name_tokens
+            if not name_tokens.isdisjoint(domain_tokens):
+                logger.debug(f"[SIM] name='{company_name}' domain='{domain_without_tld}' tokens={domain_tokens} "
+                            f"best=100.0 via token match")
+                return 100.0
+            
             # 各候補でスコア計算
             best_score = 0.0
             best_candidate = ""
             scores_log = []
             
+            # 前処理（小文字化・記号除去）はドメイン側1回、候補ごとに1回だけ行う
+            processed_domain = fuzz_utils.default_process(domain_without_tld)
+            
             for candidate in candidates:
                 if not candidate:
                     continue
                 
+                processed_candidate = fuzz_utils.default_process(candidate)
+                
                 # 従来の全体比較
-                wratio_score = fuzz.WRatio(
-                    candidate, domain_without_tld,
-                    processor=fuzz_utils.default_process
-                )
+                # 現在の最高スコアを下回る比較は結果に影響しないため、score_cutoffで
+                # rapidfuzz側の早期打ち切りを許す（下回った場合は0が返る）
+                wratio_score = fuzz.WRatio(processed_candidate, processed_domain, score_cutoff=best_score)
                 
-                token_sort_score = fuzz.token_sort_ratio(
-                    candidate, domain_without_tld,
-                    processor=fuzz_utils.default_process
-                )
+                token_sort_score = fuzz.token_sort_ratio(processed_candidate, processed_domain,
+                                                         score_cutoff=best_score)
                 
                 # 🚀 語幹スプリット比較（NEW）
                 split_score = self._calculate_token_split_similarity(candidate, domain_tokens)
@@ -200,6 +559,8 @@ class HPScorer:
                 if score > best_score:
                     best_score = score
                     best_candidate = candidate
+                    if best_score >= 100.0:
+                        break
             
             # デバッグログ出力
             logger.debug(f"[SIM] name='{company_name}' domain='{domain_without_tld}' tokens={domain_tokens} "
@@ -208,7 +569,7 @@ class HPScorer:
             return float(best_score)
             
         except Exception as e:
-            logger.warning(f"ドメイン類似度計算エラー: Name='{company_name}', URL='{url}' - {e}", exc_info=True)
+            logger.warning(f"ドメイン類似度計算エラー: Name='{company_name}', domain='{domain_without_tld}' - {e}", exc_info=True)
             return 0.0
     
     def _split_domain_tokens(self, domain: str) -> List[str]:
@@ -223,7 +584,7 @@ class HPScorer:
         """
         try:
             # 区切り文字での分割
-            tokens = re.split(r'[-_\.]', domain.lower())
+            tokens = _DOMAIN_TOKEN_SPLIT_RE.split(domain.lower())
             
             # 空文字列と短すぎるトークンを除去
             tokens = [token for token in tokens if token and len(token) >= 2]
@@ -234,6 +595,24 @@ class HPScorer:
             logger.warning(f"ドメイントークン分割エラー: domain='{domain}' - {e}")
             return [domain.lower()]
     
+    def _split_candidate_tokens(self, candidate: str) -> List[str]:
+        """
+        企業名候補を語幹スプリット用のトークンに分割
+        
+        Args:
+            candidate: 比較対象の企業名候補
+        
+        Returns:
+            トークンのリスト（2文字以上のトークンがない場合は候補全体）
+        """
+        candidate_tokens = _CANDIDATE_TOKEN_SPLIT_RE.split(candidate.lower())
+        candidate_tokens = [token for token in candidate_tokens if token and len(token) >= 2]
+        
+        if not candidate_tokens:
+            candidate_tokens = [candidate.lower()]
+        
+        return candidate_tokens
+    
     def _calculate_token_split_similarity(self, candidate: str, domain_tokens: List[str]) -> float:
         """
         語幹スプリット類似度計算
@@ -250,25 +629,21 @@ class HPScorer:
                 return 0.0
             
             # 候補文字列も分割
-            candidate_tokens = re.split(r'[\s\-_]', candidate.lower())
-            candidate_tokens = [token for token in candidate_tokens if token and len(token) >= 2]
-            
-            if not candidate_tokens:
-                candidate_tokens = [candidate.lower()]
+            candidate_tokens = self._split_candidate_tokens(candidate)
             
             max_score = 0.0
             
             # 各ドメイントークンと各候補トークンの最高類似度を計算
-            for domain_token in domain_tokens:
-                for candidate_token in candidate_tokens:
-                    # 完全一致ボーナス
-                    if domain_token == candidate_token:
-                        max_score = max(max_score, 100.0)
-                        continue
-                    
-                    # fuzzy マッチング
-                    token_score = fuzz.ratio(candidate_token, domain_token)
-                    max_score = max(max_score, token_score)
+            # （内側ループはrapidfuzzのC実装に任せる。完全一致はratio=100になる）
+            for candidate_token in candidate_tokens:
+                match = process.extractOne(
+                    candidate_token, domain_tokens,
+                    scorer=fuzz.ratio, score_cutoff=max_score
+                )
+                if match is not None:
+                    max_score = max(max_score, match[1])
+                if max_score >= 100.0:
+                    return 100.0
             
             # 全体との比較も実施
             full_domain = ''.join(domain_tokens)
@@ -282,7 +657,9 @@ class HPScorer:
             logger.warning(f"トークンスプリット類似度計算エラー: candidate='{candidate}' tokens={domain_tokens} - {e}")
             return 0.0
     
-    def calculate_score(self, search_result: SearchResult, company: CompanyInfo, query_pattern: str) -> Optional[HPCandidate]:
+    def calculate_score(self, search_result: SearchResult, company: CompanyInfo, query_pattern: str,
+                        domain_similarity: Optional[float] = None,
+                        features: Optional[CompanyFeatures] = None) -> Optional[HPCandidate]:
         """
         単一の検索結果をスコアリング
         
@@ -290,50 +667,62 @@ class HPScorer:
             search_result: 検索結果
             company: 企業情報
             query_pattern: 使用されたクエリパターン
+            domain_similarity: 計算済みのドメイン類似度（Noneの場合はここで計算）
+            features: prepare_companyの結果（Noneの場合はここで取得）
         
         Returns:
             HPCandidate または None（ブラックリスト等で除外の場合）
         """
         try:
-            if self._is_blacklisted_domain(search_result.url):
+            # ドメインはSearchResult生成時に解析済みのものを各判定で使い回す
+            domain = search_result.domain
+            if self._is_blacklisted_domain(search_result.url, domain):
                 logger.debug(f"ブラックリストドメイン除外: {search_result.url}")
                 return None
             
             # 🚀 死活確認（NEW）
-            if not self._is_reachable(search_result.url):
+            # HEADリクエストは1回だけ行い、結果を後段の減点判定で使い回す
+            is_reachable = self._is_reachable(search_result.url)
+            if not is_reachable:
                 logger.debug(f"死活確認失敗、減点対象: {search_result.url}")
                 # 完全除外ではなく大幅減点で対応
             
             score_details = {}
             total_score = 0
+            config = self.config
             
-            is_top_page = self._is_top_page(search_result.url)
+            url_features = _extract_url_features(search_result.url)
+            is_top_page = url_features.is_top_page
             if is_top_page:
-                score_details["top_page"] = self.config.top_page_bonus
-                total_score += self.config.top_page_bonus
+                score_details["top_page"] = config.top_page_bonus
+                total_score += config.top_page_bonus
             else:
                 score_details["top_page"] = 0
             
-            domain_similarity = self._calculate_domain_similarity(
-                company.company_name, search_result.url
-            )
+            if features is None:
+                features = self.prepare_company(company)
+            
+            if domain_similarity is None:
+                domain_similarity = self._calculate_domain_similarity(
+                    company.company_name, search_result.url, domain
+                )
             
             # ドメイン完全一致の判定をより厳密に（類似度95以上など）
             if domain_similarity >= 95: 
-                domain_score = self.config.domain_exact_match
-            elif domain_similarity >= self.config.similarity_threshold_domain:
-                domain_score = self.config.domain_similar_match
+                domain_score = config.domain_exact_match
+            elif domain_similarity >= config.similarity_threshold_domain:
+                domain_score = config.domain_similar_match
             else:
                 domain_score = 0
             score_details["domain_similarity_score"] = domain_score
             total_score += domain_score
             
-            tld_score = self._get_tld_score(search_result.url)
+            tld_score = self._get_tld_score(search_result.url, domain)
             score_details["tld_score"] = tld_score
             total_score += tld_score
             
             if self._has_official_keywords(search_result.title):
-                official_score = self.config.official_keyword_bonus
+                official_score = config.official_keyword_bonus
                 score_details["official_keyword"] = official_score
                 total_score += official_score
             else:
@@ -343,7 +732,7 @@ class HPScorer:
             score_details["search_rank"] = rank_bonus
             total_score += rank_bonus
             
-            path_penalty = self._get_path_penalty(search_result.url)
+            path_penalty = self._get_path_penalty(search_result.url, url_features)
             score_details["path_penalty"] = path_penalty
             total_score += path_penalty
             
@@ -353,13 +742,13 @@ class HPScorer:
             total_score += locality_score
             
             # 🚫 ポータルドメインペナルティ（強化版）
-            portal_penalty = self._get_enhanced_portal_penalty(search_result.url)
+            portal_penalty = self._get_enhanced_portal_penalty(search_result.url, domain)
             score_details["portal_penalty"] = portal_penalty
             total_score += portal_penalty
             
             # 🚀 死活確認ペナルティ（NEW）
             reachability_penalty = 0
-            if not self._is_reachable(search_result.url):
+            if not is_reachable:
                 reachability_penalty = -6  # 大幅減点
                 logger.debug(f"死活確認失敗による減点: {search_result.url}")
             score_details["reachability_penalty"] = reachability_penalty
@@ -373,13 +762,14 @@ class HPScorer:
             
             # 🔥 汎用語ペナルティ（NEW）
             # hair・groupなど汎用語のみの一致は減点
-            generic_penalty = self._calculate_generic_word_penalty(company.company_name, search_result.url)
+            generic_penalty = self._calculate_generic_word_penalty(company.company_name, search_result.url,
+                                                                  features, domain)
             score_details["generic_word_penalty"] = generic_penalty
             total_score += generic_penalty
             
             # 🔥 HeadMatchボーナス（NEW）- タイトルのみ
             # <title>タグとの一致判定
-            head_match_bonus = self._calculate_head_match_bonus(company.company_name, search_result)
+            head_match_bonus = self._calculate_head_match_bonus(company.company_name, search_result, features)
             score_details["head_match_bonus"] = head_match_bonus
             total_score += head_match_bonus
             
@@ -435,12 +825,8 @@ class HPScorer:
                 score += 2
             
             # ② 市外局番一致（+3点）
-            if area_code:
-                import re
-                # 市外局番パターン（ハイフンありなし両対応）
-                pattern = rf'{area_code}[-\s]?[0-9]{{7,8}}'
-                if re.search(pattern, text):
-                    score += 3
+            if area_code and _AREA_PHONE_RES[area_code].search(text):
+                score += 3
             
             # ③ 地域以外の都道府県ミスマッチペナルティ（-10点）
             other_prefecture_penalty = self._check_other_prefecture_penalty(text, company.prefecture)
@@ -449,11 +835,8 @@ class HPScorer:
             # ④ Webページ解析による地域判定（情報が薄い場合の補強）
             if score == 0:  # タイトル・説明文から地域情報が取得できない場合
                 # 🚀 ポータルサイトでは地域解析を無効化（NEW）
-                domain = self.url_utils.get_domain(search_result.url).lower()
-                is_portal = any(portal in domain for portal in [
-                    'hotpepper.jp', 'rakuten.co.jp', 'minimodel.jp', 'relax.jp', 
-                    'yahoo.co.jp', 'google.com', 'tabelog.com'
-                ])
+                domain = search_result.domain
+                is_portal = any(portal in domain for portal in _LOCALITY_PORTAL_DOMAINS)
                 
                 if not is_portal:
                     web_location_score = self._calculate_web_location_score(search_result.url, company.prefecture)
@@ -479,8 +862,6 @@ class HPScorer:
             地域スコア
         """
         try:
-            from .web_content_analyzer import WebContentAnalyzer
-            
             analyzer = WebContentAnalyzer(timeout=5)  # 短めのタイムアウト
             location_info = analyzer.extract_location_info(url)
             
@@ -521,22 +902,7 @@ class HPScorer:
         Returns:
             市外局番（該当なしの場合は空文字）
         """
-        area_code_map = {
-            '愛知県': '052',      # 名古屋市圏
-            '東京都': '03',       # 東京23区
-            '大阪府': '06',       # 大阪市
-            '神奈川県': '045',    # 横浜市
-            '兵庫県': '078',      # 神戸市
-            '京都府': '075',      # 京都市
-            '福岡県': '092',      # 福岡市
-            '北海道': '011',      # 札幌市
-            '宮城県': '022',      # 仙台市
-            '広島県': '082',      # 広島市
-            '静岡県': '054',      # 静岡市
-            '千葉県': '043',      # 千葉市
-            '埼玉県': '048',      # さいたま市
-        }
-        return area_code_map.get(prefecture, '')
+        return _SCORING_AREA_CODES.get(prefecture, '')
     
     def _check_other_prefecture_penalty(self, text: str, target_prefecture: str) -> int:
         """
@@ -550,24 +916,11 @@ class HPScorer:
             ペナルティスコア（0 または -10）
         """
         try:
-            # 全47都道府県リスト
-            all_prefectures = [
-                '北海道', '青森県', '岩手県', '宮城県', '秋田県', '山形県', '福島県',
-                '茨城県', '栃木県', '群馬県', '埼玉県', '千葉県', '東京都', '神奈川県',
-                '新潟県', '富山県', '石川県', '福井県', '山梨県', '長野県', '岐阜県',
-                '静岡県', '愛知県', '三重県', '滋賀県', '京都府', '大阪府', '兵庫県',
-                '奈良県', '和歌山県', '鳥取県', '島根県', '岡山県', '広島県', '山口県',
-                '徳島県', '香川県', '愛媛県', '高知県', '福岡県', '佐賀県', '長崎県',
-                '熊本県', '大分県', '宮崎県', '鹿児島県', '沖縄県'
-            ]
-            
-            # 目標都道府県以外が含まれているかチェック
-            for prefecture in all_prefectures:
-                if prefecture != target_prefecture:
-                    # 都道府県名（県なし）でもチェック
-                    prefecture_short = prefecture.replace('県', '').replace('府', '').replace('都', '').replace('道', '')
-                    if prefecture.lower() in text.lower() or prefecture_short.lower() in text.lower():
-                        return -100
+            text = text.lower()
+            # 目標都道府県以外が含まれているかチェック（都道府県名の接尾辞なしでもチェック）
+            for prefecture, full_name, short_name in _OTHER_PREFECTURE_TERMS:
+                if prefecture != target_prefecture and (full_name in text or short_name in text):
+                    return -100
             
             return 0
             
@@ -588,17 +941,7 @@ class HPScorer:
         try:
             domain = self.url_utils.get_domain(url).lower()
             
-            # ポータルサイトのペナルティマップ
-            portal_penalties = {
-                'hotpepper.jp': -4,
-                'beauty.hotpepper.jp': -4,
-                'relax.jp': -3,
-                'rakuten.co.jp': -2,
-                'yahoo.co.jp': -2,
-                'google.com': -2,
-            }
-            
-            for portal_domain, penalty in portal_penalties.items():
+            for portal_domain, penalty in _PORTAL_PENALTIES:
                 if portal_domain in domain:
                     return penalty
             
@@ -608,70 +951,25 @@ class HPScorer:
             logger.warning(f"ポータルドメインペナルティ計算エラー: {url} - {e}")
             return 0
     
-    def _get_enhanced_portal_penalty(self, url: str) -> int:
+    def _get_enhanced_portal_penalty(self, url: str, domain: Optional[str] = None) -> int:
         """
         🔥 完全除外級ポータルドメインペナルティ
         
         Args:
             url: 検索結果のURL
+            domain: 解析済みのドメイン（Noneの場合はURLから取得）
         
         Returns:
             ペナルティスコア（0 または -100）
         """
         try:
-            domain = self.url_utils.get_domain(url).lower()
+            if domain is None:
+                domain = self.url_utils.get_domain(url)
             
-            # 🔥 ポータルサイト完全除外リスト（-100点）
-            portal_domains = {
-                # 美容系ポータル
-                'beauty.hotpepper.jp',
-                'hotpepper.jp', 
-                'beauty.rakuten.co.jp',
-                'rakuten.co.jp',
-                'minimodel.jp',
-                'relax.jp',
-                'beauty.biglobe.ne.jp',
-                'epark.jp',
-                'salonia.com',
-                
-                # 汎用ポータル
-                'yahoo.co.jp',
-                'google.com',
-                'gnaviapp.com', 
-                'tabelog.com',
-                'yelp.com',
-                'itp.ne.jp',        # タウンページ
-                'mapion.co.jp',     # マピオン
-                'navitime.co.jp',   # ナビタイム
-                
-                # SNS・まとめ系
-                'facebook.com',
-                'instagram.com', 
-                'twitter.com',
-                'ameblo.jp',
-                'fc2.com',
-                'livedoor.jp',
-                'blogger.com',
-                'wordpress.com',
-                
-                # 求人系
-                'rikunabi.com',
-                'mynavi.jp',
-                'indeed.com',
-                'doda.jp',
-                'baitoru.com',
-                
-                # EC・レビュー系
-                'amazon.co.jp',
-                'mercari.com',
-                'kakaku.com',
-                '@cosme.net',
-            }
-            
-            for portal_domain in portal_domains:
-                if portal_domain in domain:
-                    logger.debug(f"🔥 ポータルサイト完全除外: {domain} (-100点)")
-                    return -100
+            # 部分一致判定を正規表現の1回の走査で行う
+            if _PORTAL_DOMAIN_RE.search(domain):
+                logger.debug(f"🔥 ポータルサイト完全除外: {domain} (-100点)")
+                return -100
             
             return 0
             
@@ -712,8 +1010,6 @@ class HPScorer:
         """
         try:
             # Webページ解析で地域を取得
-            from .web_content_analyzer import WebContentAnalyzer
-            
             analyzer = WebContentAnalyzer(timeout=3)
             location_info = analyzer.extract_location_info(search_result.url)
             
@@ -742,7 +1038,9 @@ class HPScorer:
             logger.debug(f"地域ミスマッチペナルティ計算エラー: {search_result.url} - {e}")
             return 0
     
-    def _calculate_generic_word_penalty(self, company_name: str, url: str) -> int:
+    def _calculate_generic_word_penalty(self, company_name: str, url: str,
+                                        features: Optional[CompanyFeatures] = None,
+                                        domain: Optional[str] = None) -> int:
         """
         汎用語ペナルティ計算
         hair・groupなど汎用語のみの一致は減点
@@ -750,63 +1048,34 @@ class HPScorer:
         Args:
             company_name: 企業名
             url: 検索結果のURL
+            features: 企業名の前処理結果（Noneの場合はここで取得）
+            domain: 解析済みのドメイン（Noneの場合はURLから取得）
         
         Returns:
             ペナルティスコア（0 または -5）
         """
         try:
-            # 汎用語リスト
-            generic_words = {
-                # 美容系汎用語
-                'hair', 'salon', 'beauty', 'cut', 'style', 'nail', 'spa',
-                'esthetic', 'relax', 'care', 'clinic', 'total', 'private',
-                
-                # 一般汎用語
-                'group', 'company', 'corp', 'co', 'inc', 'ltd', 'shop',
-                'store', 'center', 'studio', 'design', 'creative', 'pro',
-                'plus', 'premium', 'select', 'special', 'new', 'fresh',
-                'modern', 'urban', 'royal', 'grand', 'first', 'main',
-                
-                # 地域系汎用語
-                'tokyo', 'osaka', 'nagoya', 'yokohama', 'kyoto', 'kobe',
-                'shibuya', 'shinjuku', 'ikebukuro', 'ginza', 'omotesando'
-            }
-            
-            # 企業名から英語部分を抽出
-            import re
-            company_english = re.findall(r'[a-zA-Z]+', company_name.lower())
+            # 企業名から英語部分を抽出（前処理済み）
+            if features is None:
+                features = self._company_features_cached(company_name)
+            company_english = features.english_words
             
             # ドメイン名から英語部分を抽出
-            domain = self.url_utils.get_domain(url)
+            if domain is None:
+                domain = self.url_utils.get_domain(url)
             domain_without_tld = domain.split('.')[0].lower()
-            domain_words = re.findall(r'[a-zA-Z]+', domain_without_tld)
+            domain_words = set(_ALPHA_WORD_RE.findall(domain_without_tld))
             
             if not company_english or not domain_words:
                 return 0
             
-            # 一致する単語をチェック
-            matched_words = []
-            for comp_word in company_english:
-                for domain_word in domain_words:
-                    if comp_word == domain_word and comp_word in generic_words:
-                        matched_words.append(comp_word)
-            
-            # 汎用語のみの一致かチェック
-            if matched_words:
-                # 非汎用語の一致があるかチェック
-                non_generic_match = False
-                for comp_word in company_english:
-                    for domain_word in domain_words:
-                        if comp_word == domain_word and comp_word not in generic_words:
-                            non_generic_match = True
-                            break
-                    if non_generic_match:
-                        break
-                
-                # 汎用語のみの一致の場合はペナルティ
-                if not non_generic_match:
-                    logger.debug(f"🔥 汎用語のみ一致ペナルティ: {matched_words} (-5点)")
-                    return -5
+            # 一致する単語をチェック（集合演算で一括判定）
+            matched_words = company_english & domain_words
+            
+            # 汎用語のみの一致の場合はペナルティ
+            if matched_words and matched_words <= _GENERIC_WORDS:
+                logger.debug(f"🔥 汎用語のみ一致ペナルティ: {sorted(matched_words)} (-5点)")
+                return -5
             
             return 0
             
@@ -814,7 +1083,8 @@ class HPScorer:
             logger.warning(f"汎用語ペナルティ計算エラー: company='{company_name}' url='{url}' - {e}")
             return 0
     
-    def _calculate_head_match_bonus(self, company_name: str, search_result: SearchResult) -> int:
+    def _calculate_head_match_bonus(self, company_name: str, search_result: SearchResult,
+                                    features: Optional[CompanyFeatures] = None) -> int:
         """
         HeadMatchボーナス計算（タイトルのみ版）
         企業名がタイトルに含まれているかで判定
@@ -822,6 +1092,7 @@ class HPScorer:
         Args:
             company_name: 企業名
             search_result: 検索結果
+            features: 企業名の前処理結果（Noneの場合はここで取得）
         
         Returns:
             ボーナス・ペナルティスコア（-5～+10）
@@ -840,23 +1111,13 @@ class HPScorer:
                 logger.debug("HeadMatch - タイトルが空のためスキップ")
                 return 0
             
-            # 企業名の正規化（HeadMatch専用追加処理）
-            cleaned_company = self._enhanced_clean_company_name(company_name)
-            
-            # 🚀 業種接頭語を除去（HeadMatch専用）
-            business_prefixes = ['美容室', 'サロン', 'ヘアサロン', '理容室', '理容店', 'バーバー', 'エステ', 'ネイル']
-            for prefix in business_prefixes:
-                if cleaned_company.startswith(prefix):
-                    cleaned_company = cleaned_company[len(prefix):].strip()
-                    break
+            # 企業名の正規化・業種接頭語除去・単語分割は前処理済み
+            if features is None:
+                features = self._company_features_cached(company_name)
             
             # ポータルサイト判定
-            domain = self.url_utils.get_domain(search_result.url).lower()
-            is_portal = any(portal in domain for portal in [
-                'hotpepper.jp', 'rakuten.co.jp', 'minimodel.jp', 'relax.jp', 
-                'yahoo.co.jp', 'google.com', 'tabelog.com', 'gnavi.co.jp',
-                'beauty.hotpepper.jp', 'hairbook.jp'
-            ])
+            domain = search_result.domain
+            is_portal = any(portal in domain for portal in _HEAD_MATCH_PORTAL_DOMAINS)
             
             # 企業名が含まれているかチェック
             found_in_text = False
@@ -867,21 +1128,22 @@ class HPScorer:
                     continue
                 
                 # HTMLタグを除去してテキストを正規化
-                import re
-                clean_text = re.sub(r'<[^>]+>', '', text)
-                clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+                clean_text = _HTML_TAG_RE.sub('', text)
+                clean_text = _WHITESPACE_RE.sub(' ', clean_text).strip()
                 
                 # 企業名が含まれているかチェック（大文字小文字無視）
                 
+                text_lower = clean_text.lower()
+                
                 # 1. 完全一致チェック
-                if cleaned_company.lower() in clean_text.lower():
+                if features.head_name in text_lower:
                     found_in_text = True
                     matched_text = clean_text[:50] + "..." if len(clean_text) > 50 else clean_text
                     break
                 
                 # 2. より柔軟な一致（スペース・記号無視）
-                company_no_space = re.sub(r'[\s\-_×&]', '', cleaned_company.lower())
-                text_no_space = re.sub(r'[\s\-_×&]', '', clean_text.lower())
+                company_no_space = features.head_name_no_space
+                text_no_space = _HEAD_SPACE_SYMBOL_RE.sub('', text_lower)
                 
                 if company_no_space in text_no_space and len(company_no_space) >= 3:
                     found_in_text = True
@@ -890,12 +1152,8 @@ class HPScorer:
                 
                 # 3. 🚀 部分単語一致（NEW）- 企業名の重要部分だけでも一致
                 # 企業名を単語に分割して、各単語がテキストに含まれているかチェック
-                company_words = [w.strip() for w in re.split(r'[\s\-_×&・]', cleaned_company) if w.strip() and len(w.strip()) >= 2]
-                company_words_lower = [w.lower() for w in company_words]
-                text_lower = clean_text.lower()
-                
                 matched_words = []
-                for word in company_words_lower:
+                for word in features.head_words:
                     if word in text_lower and word not in ['店', '美容室', 'サロン', 'hair', 'beauty']:  # 汎用語は除外
                         matched_words.append(word)
                 
@@ -930,62 +1188,157 @@ class HPScorer:
             logger.warning(f"HeadMatchボーナス計算エラー: company='{company_name}' url='{search_result.url}' - {e}")
             return 0
     
+    def is_fast_rejected(self, url: str, domain: Optional[str] = None) -> bool:
+        """
+        類似度計算や死活確認の前に除外できるURLかを判定
+        ブラックリストドメインの集合参照のみで判定する（calculate_scoreでもNoneになるURL）
+        
+        Args:
+            url: 検索結果のURL
+            domain: 解析済みのドメイン（Noneの場合はURLから取得）
+        
+        Returns:
+            除外対象ならTrue
+        """
+        return self._is_blacklisted_domain(url, domain)
+    
+    def calculate_scores_batch(self, search_results: List[SearchResult], company: CompanyInfo,
+                               query_pattern: str, max_workers: int = 1) -> List[HPCandidate]:
+        """
+        同一クエリの検索結果をまとめてスコアリング
+        ブラックリストURLを先に除外し、ドメイン類似度は一括計算してから各候補に渡す
+        
+        各候補の採点は死活確認・ページ解析のHTTP待ちが大半を占め、候補同士は独立しているため、
+        max_workersが2以上の場合はスレッドで並列に採点する
+        
+        Args:
+            search_results: 検索結果のリスト
+            company: 企業情報
+            query_pattern: 使用されたクエリパターン
+            max_workers: 候補を並列に採点するスレッド数（1の場合は逐次）
+        
+        Returns:
+            HPCandidateのリスト（検索結果の順序を維持、除外されたものは含まない）
+        """
+        filtered_results = [result for result in search_results
+                            if not self.is_fast_rejected(result.url, result.domain)]
+        similarities = self.calculate_domain_similarities(
+            company.company_name, [result.url for result in filtered_results]
+        )
+        features = self.prepare_company(company)
+        
+        return self._score_filtered(filtered_results, company, query_pattern,
+                                    similarities, features, max_workers)
+    
+    def _score_filtered(self, filtered_results: List[SearchResult], company: CompanyInfo,
+                        query_pattern: str, similarities: Dict[str, float],
+                        features: CompanyFeatures, max_workers: int = 1) -> List[HPCandidate]:
+        """除外済みの検索結果を、計算済みの類似度・企業名前処理結果を使って採点"""
+        def score(result: SearchResult) -> Optional[HPCandidate]:
+            return self.calculate_score(result, company, query_pattern,
+                                        domain_similarity=similarities.get(result.url),
+                                        features=features)
+        
+        workers = min(max_workers, len(filtered_results))
+        if workers > 1:
+            # mapは入力順に結果を返すため、検索結果の順序は維持される
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                scored = list(executor.map(score, filtered_results))
+        else:
+            scored = [score(result) for result in filtered_results]
+        
+        return [candidate for candidate in scored if candidate]
+    
+    def _prepare_patterns(self, search_results: Dict[str, List[SearchResult]], company: CompanyInfo
+                          ) -> Tuple[Dict[str, List[SearchResult]], Dict[str, float], CompanyFeatures]:
+        """
+        全クエリパターン分の早期除外・ドメイン類似度・企業名の前処理をまとめて行う
+        （複数パターンに同じURLが出ても類似度は1回だけ計算される）
+        
+        Returns:
+            (パターン → 除外済み検索結果, URL → 類似度, CompanyFeatures)
+        """
+        filtered_by_pattern = {
+            query_pattern: [result for result in results
+                            if not self.is_fast_rejected(result.url, result.domain)]
+            for query_pattern, results in search_results.items()
+        }
+        similarities = self.calculate_domain_similarities(
+            company.company_name,
+            [result.url for results in filtered_by_pattern.values() for result in results]
+        )
+        features = self.prepare_company(company)
+        return filtered_by_pattern, similarities, features
+    
     def score_multiple_candidates(self, search_results: Dict[str, List[SearchResult]], 
                                 company: CompanyInfo) -> List[HPCandidate]:
+        """
+        全クエリパターンの検索結果をスコアリングし、スコアの高い順に返す
+        除外判定・ドメイン類似度・企業名の前処理は全パターン分を1回でまとめて行う
+        """
+        filtered_by_pattern, similarities, features = self._prepare_patterns(search_results, company)
+        
         all_candidates = []
-        for query_pattern, results in search_results.items():
-            for result in results:
-                candidate = self.calculate_score(result, company, query_pattern)
-                if candidate:
-                    all_candidates.append(candidate)
+        for query_pattern, filtered_results in filtered_by_pattern.items():
+            all_candidates.extend(self._score_filtered(filtered_results, company, query_pattern,
+                                                       similarities, features))
         all_candidates.sort(key=lambda x: x.total_score, reverse=True)
         return all_candidates
     
     def get_best_candidate(self, search_results: Dict[str, List[SearchResult]], 
                          company: CompanyInfo) -> Optional[HPCandidate]:
-        candidates = self.score_multiple_candidates(search_results, company)
-        if not candidates:
-            return None
-        return candidates[0]
+        """
+        最良候補を取得
+        パターン順・検索結果順に1件ずつ採点し、自動採用に達した候補が出た時点で残りの採点を打ち切る
+        自動採用がない場合は全候補のうち最高スコアの候補（同点なら先に採点したもの）を返す
+        """
+        filtered_by_pattern, similarities, features = self._prepare_patterns(search_results, company)
+        
+        best: Optional[HPCandidate] = None
+        for query_pattern, filtered_results in filtered_by_pattern.items():
+            for result in filtered_results:
+                candidate = self.calculate_score(result, company, query_pattern,
+                                                 domain_similarity=similarities.get(result.url),
+                                                 features=features)
+                if candidate is None:
+                    continue
+                if candidate.judgment == "自動採用":
+                    return candidate
+                if best is None or candidate.total_score > best.total_score:
+                    best = candidate
+        return best
     
-    def _is_blacklisted_domain(self, url: str) -> bool:
+    def _is_blacklisted_domain(self, url: str, domain: Optional[str] = None) -> bool:
         try:
-            domain = self.url_utils.get_domain(url) # get_domainは既にwww除去と小文字化を行う
+            if domain is None:
+                domain = self.url_utils.get_domain(url) # get_domainは既にwww除去と小文字化を行う
             return domain in self.blacklist_domains
         except Exception as e:
             logger.warning(f"ブラックリストドメイン判定エラー: {url} - {e}")
             return False # エラー時は安全側に倒し、ブラックリストではないとする
     
     def _is_top_page(self, url: str) -> bool:
-        try:
-            path_depth = self.url_utils.get_path_depth(url)
-            return path_depth == 0
-        except Exception as e:
-            logger.warning(f"トップページ判定エラー: {url} - {e}")
-            return False # エラー時はトップページではないとする
+        return _extract_url_features(url).is_top_page
     
     def _has_official_keywords(self, text: str) -> bool:
         if not text:
             return False
         text_lower = text.lower()
-        official_keywords = ['公式', 'official', 'オフィシャル', '正式']
-        return any(keyword in text_lower for keyword in official_keywords)
+        return any(keyword in text_lower for keyword in _OFFICIAL_KEYWORDS)
     
-    def _get_tld_score(self, url: str) -> int:
+    def _get_tld_score(self, url: str, domain: Optional[str] = None) -> int:
         """
         🔥 TLDスコア改革版
         co.jpの加点は撤廃、怪しいTLDのみ減点
         """
         try:
-            domain = self.url_utils.get_domain(url) # 既に小文字化されている
+            if domain is None:
+                domain = self.url_utils.get_domain(url) # 既に小文字化されている
             
             # 🔥 怪しいTLDのみペナルティ
-            suspicious_tlds = {'.tk', '.ml', '.ga', '.cf', '.xyz', '.click', '.download'}
-            
-            for tld in suspicious_tlds:
-                if domain.endswith(tld):
-                    logger.debug(f"🔥 怪しいTLD減点: {domain} (-3点)")
-                    return -3
+            if domain.endswith(_SUSPICIOUS_TLDS):
+                logger.debug(f"🔥 怪しいTLD減点: {domain} (-3点)")
+                return -3
             
             # その他のTLD（.co.jp, .com, .net, .jp等）は全て0点
             return 0
@@ -999,13 +1352,14 @@ class HPScorer:
             return self.config.search_rank_bonus
         return 0
     
-    def _get_path_penalty(self, url: str) -> int:
+    def _get_path_penalty(self, url: str, url_features: Optional[URLFeatures] = None) -> int:
         try:
-            parsed_url = urlparse(url)
-            path = parsed_url.path.lower()
-            for penalty_keyword in self.penalty_paths:
-                if penalty_keyword in path:
-                    return self.config.path_keyword_penalty
+            if self._penalty_path_re is None:
+                return 0
+            if url_features is None:
+                url_features = _extract_url_features(url)
+            if self._penalty_path_re.search(url_features.path):
+                return self.config.path_keyword_penalty
             return 0
         except Exception as e:
             logger.warning(f"パスペナルティ計算エラー: {url} - {e}")
@@ -1064,4 +1418,21 @@ def create_scorer_from_config(config: Dict[str, Any], blacklist_checker) -> HPSc
             config=ScoringConfig(),
             blacklist_domains=set(),
             penalty_paths=[]
-        ) 
\ No newline at end of file
+        ) 
+
+@functools.lru_cache(maxsize=1)
+def get_default_scorer() -> HPScorer:
+    """
+    デフォルト設定のHPScorerを取得（プロセス内で1つを共有）
+    
+    企業名の比較候補・類似度のキャッシュはインスタンスごとに持つため、
+    同じ設定で何度も生成せずこのインスタンスを使い回す
+    
+    Returns:
+        HPScorerインスタンス
+    """
+    return HPScorer(
+        config=ScoringConfig(),
+        blacklist_domains=set(),
+        penalty_paths=[]
+    )
@@ -4,15 +4,23 @@ Brave Search API連携モジュール
 フェーズ3: 非同期処理、リトライ、レートリミット制御
 """
 
+import hashlib
+import re
 import requests
 import time
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import threading
+import orjson
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional
+from dataclasses import dataclass, field
 from .logger_config import get_logger
 from .utils import URLUtils
 
 logger = get_logger(__name__)
 
+# 企業名の【】内の読み仮名
+_READING_RE = re.compile(r'【.*?】')
+
 @dataclass
 class SearchResult:
     """検索結果を表すデータクラス"""
@@ -20,8 +28,13 @@ class SearchResult:
     title: str
     description: str
     rank: int  # 検索結果での順位（1始まり）
+    # URLのドメイン（小文字・www.除去済み）。スコアリングで何度も参照するため生成時に1回だけ解析
+    domain: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.domain = URLUtils.get_domain(self.url)
 
-@dataclass
+@dataclass(slots=True)
 class CompanyInfo:
     """企業情報を表すデータクラス"""
     id: str
@@ -29,14 +42,79 @@ class CompanyInfo:
     prefecture: str
     industry: str
 
+class BraveRateLimiter:
+    """
+    Brave Search APIのレート制限ヘッダーに基づくリクエスト間隔制御
+    
+    X-RateLimit-Remaining / X-RateLimit-Reset（カンマ区切りの先頭＝秒単位の枠）から
+    次のリクエストまでの間隔を求める（min_intervalより短くはしない）。
+    ヘッダーが得られるまではinitial_interval（min_intervalの方が長ければmin_interval）で間隔を空ける。
+    複数スレッドから同じクライアントを使う場合も予約順に間隔が守られる。
+    """
+    
+    def __init__(self, min_interval: float = 1.0, initial_interval: float = 1.0):
+        self.min_interval = min_interval
+        # 最初のレスポンスまでは制限値が分からないため、無料プランの1リクエスト/秒を前提にする
+        self._interval = max(min_interval, initial_interval)
+        self._next_ok = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """次のリクエスト枠まで待機し、その次の枠を予約する"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_ok)
+            self._next_ok = start + self._interval
+        
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+    
+    def update(self, headers: Dict[str, str]):
+        """レスポンスヘッダーから残り回数とリセットまでの秒数を読み取り間隔を更新"""
+        remaining = self._first_header_value(headers, 'X-RateLimit-Remaining')
+        reset = self._first_header_value(headers, 'X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        
+        with self._lock:
+            if remaining <= 0:
+                # 枠を使い切った場合はリセットまで次のリクエストを待たせる
+                self._next_ok = max(self._next_ok, time.monotonic() + reset)
+                self._interval = self.min_interval
+            else:
+                self._interval = max(self.min_interval, reset / remaining)
+    
+    @staticmethod
+    def _first_header_value(headers: Dict[str, str], name: str) -> Optional[float]:
+        """カンマ区切りヘッダーの先頭値を数値で取得（取得できなければNone）"""
+        value = headers.get(name)
+        if value is None:
+            return None
+        try:
+            return float(str(value).split(',')[0].strip())
+        except ValueError:
+            logger.warning(f"レート制限ヘッダーの解析に失敗しました: {name}={value}")
+            return None
+
 class BraveSearchClient:
     """Brave Search API クライアント"""
     
-    def __init__(self, api_key: str, results_per_query: int = 10):
+    def __init__(self, api_key: str, results_per_query: int = 10,
+                 session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[BraveRateLimiter] = None,
+                 cache_dir: Optional[str] = None):
         self.api_key = api_key
         self.results_per_query = results_per_query
+        # 指定時のみリクエスト間隔を制御（Noneの場合は呼び出し側で制御）
+        self.rate_limiter = rate_limiter
+        # 指定時のみAPIレスポンスをディスクにキャッシュ（開発時の再実行向け）
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.base_url = "https://api.search.brave.com/res/v1/web/search"
-        self.session = requests.Session()
+        # 呼び出し側のセッションを共有すればTCP/TLS接続を再利用できる
+        self.session = session if session is not None else requests.Session()
         
         # APIキーをヘッダーに設定
         self.session.headers.update({
@@ -67,11 +145,26 @@ class BraveSearchClient:
                 **kwargs
             }
             
-            # APIリクエスト実行
-            response = self.session.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
+            cache_path = self._get_cache_path(params)
+            if cache_path is not None and cache_path.exists():
+                # キャッシュヒット時はAPI呼び出し・レート制限待ちを行わない
+                logger.debug(f"Brave Searchキャッシュ使用: {query}")
+                content = cache_path.read_bytes()
+            else:
+                # APIリクエスト実行
+                if self.rate_limiter is not None:
+                    self.rate_limiter.wait()
+                response = self.session.get(self.base_url, params=params, timeout=30)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(response.headers)
+                response.raise_for_status()
+                content = response.content
             
-            data = response.json()
+            # 生のバイト列をorjsonで直接解析（requestsのテキストデコードを経由しない）
+            data = orjson.loads(content)
+            
+            if cache_path is not None and not cache_path.exists():
+                self._save_cache(cache_path, content)
             
             # 検索結果を解析
             results = self._parse_search_results(data)
@@ -86,6 +179,31 @@ class BraveSearchClient:
             logger.error(f"予期せぬエラー: {e}")
             return []
     
+    def _get_cache_path(self, params: Dict[str, Any]) -> Optional[Path]:
+        """
+        リクエストパラメータに対応するキャッシュファイルのパスを取得
+        
+        Args:
+            params: APIパラメータ
+        
+        Returns:
+            キャッシュファイルのパス（キャッシュ無効時はNone）
+        """
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha1(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return self.cache_dir / f"{key}.json"
+    
+    def _save_cache(self, cache_path: Path, content: bytes):
+        """APIレスポンスをキャッシュファイルに保存（失敗しても検索結果には影響させない）"""
+        try:
+            # 書き込み途中のファイルを読まないよう一時ファイル経由で置き換える
+            tmp_path = cache_path.with_name(f"{cache_path.stem}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(content)
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            logger.warning(f"Brave Searchキャッシュ保存に失敗しました: {cache_path} - {e}")
+    
     def _parse_search_results(self, data: Dict[str, Any]) -> List[SearchResult]:
         """
         Brave Search APIのレスポンスをSearchResultのリストに変換
@@ -148,8 +266,7 @@ class QueryGenerator:
         clean_name = company_info.company_name.strip()
         
         # 【】内の読み仮名を除去
-        import re
-        clean_name = re.sub(r'【.*?】', '', clean_name).strip()
+        clean_name = _READING_RE.sub('', clean_name).strip()
         
         queries = {
             'pattern_a': f"{clean_name} {company_info.industry} {company_info.prefecture}",
@@ -173,8 +290,7 @@ class QueryGenerator:
         """
         # 企業名の前処理
         clean_name = company_info.company_name.strip()
-        import re
-        clean_name = re.sub(r'【.*?】', '', clean_name).strip()
+        clean_name = _READING_RE.sub('', clean_name).strip()
         
         return template.format(
             company_name=clean_name,
@@ -195,8 +311,7 @@ class QueryGenerator:
         """
         # 企業名の前処理
         clean_name = company_info.company_name.strip()
-        import re
-        clean_name = re.sub(r'【.*?】', '', clean_name).strip()
+        clean_name = _READING_RE.sub('', clean_name).strip()
         
         # 都道府県から主要都市を抽出
         main_city = QueryGenerator._extract_main_city(company_info.prefecture)
@@ -317,8 +432,7 @@ class QueryGenerator:
         """
         # 企業名の前処理
         clean_name = company_info.company_name.strip()
-        import re
-        clean_name = re.sub(r'【.*?】', '', clean_name).strip()
+        clean_name = _READING_RE.sub('', clean_name).strip()
         
         # 業種別の特定キーワードと除外キーワードを取得
         specific_keywords, exclude_keywords = QueryGenerator._get_industry_keywords(company_info.industry)
@@ -411,8 +525,7 @@ class QueryGenerator:
         """
         # 企業名の前処理
         clean_name = company_info.company_name.strip()
-        import re
-        clean_name = re.sub(r'【.*?】', '', clean_name).strip()
+        clean_name = _READING_RE.sub('', clean_name).strip()
         
         # シンプルな基本クエリ：企業名 + 県名 + 業種
         return f'{clean_name} {company_info.prefecture} {company_info.industry}'
@@ -473,8 +586,11 @@ class QueryGenerator:
 class SearchAgent:
     """検索エージェント - 複数クエリの実行と結果統合"""
     
-    def __init__(self, brave_client: BraveSearchClient):
+    def __init__(self, brave_client: BraveSearchClient,
+                 sleep_fn: Callable[[float], None] = time.sleep):
         self.brave_client = brave_client
+        # クエリ間の待機処理（テスト時は待機しない関数を注入できる）
+        self._sleep = sleep_fn
     
     def search_company(self, company_info: CompanyInfo) -> Dict[str, List[SearchResult]]:
         """
@@ -501,7 +617,7 @@ class SearchAgent:
             results[query_name] = search_results
             
             # APIレートリミット対策（簡易版）
-            time.sleep(1.2)  # 1.2秒間隔
+            self._sleep(1.2)  # 1.2秒間隔
             
             logger.info(f"クエリ [{query_name}] 完了: {len(search_results)}件取得")
         
@@ -532,6 +648,6 @@ class SearchAgent:
             results[query_name] = search_results
             
             # レートリミット対策
-            time.sleep(1.2)
+            self._sleep(1.2)
         
         return results 
\ No newline at end of file
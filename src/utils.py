@@ -4,18 +4,39 @@
 """
 
 import os
+import sys
+import copy
 import yaml
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from urllib.parse import urlparse, urljoin
 from dotenv import load_dotenv
 
+# libyaml付きでビルドされたPyYAMLではCローダーで解析する（無い環境では純Python版）
+try:
+    from yaml import CSafeLoader as _YAMLSafeLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLSafeLoader
+
 # 環境変数の読み込み
 load_dotenv()
 
+# 設定値が存在しないことを表す番兵
+_MISSING = object()
+
+@lru_cache(maxsize=8)
+def _load_yaml_file(path: str, mtime_ns: int) -> Any:
+    """YAMLファイルを解析する（パスと更新時刻が同じ間はプロセス内で再利用）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YAMLSafeLoader)
+
 class ConfigManager:
     """設定ファイル管理クラス"""
     
+    __slots__ = ('config_path', '_config')
+    
     def __init__(self, config_path: str = "config/config.yaml"):
         self.config_path = config_path
         self._config = None
@@ -23,8 +44,10 @@ class ConfigManager:
     def load_config(self) -> Dict[str, Any]:
         """設定ファイルを読み込む"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self._config = yaml.safe_load(f)
+            # 解析結果はプロセス内で共有されるため、環境変数の反映などで変更しても
+            # 他のインスタンスに影響しないよう複製して保持する
+            mtime_ns = os.stat(self.config_path).st_mtime_ns
+            self._config = copy.deepcopy(_load_yaml_file(self.config_path, mtime_ns))
             
             # 環境変数からAPIキーを読み込み（設定ファイルより優先）
             self._load_api_keys_from_env()
@@ -52,73 +75,148 @@ class ConfigManager:
         """ドット記法で設定値を取得"""
         if not self._config:
             self.load_config()
-            
-        keys = key_path.split('.')
+        
+        value = self._resolve(key_path)
+        return default if value is _MISSING else value
+    
+    def _resolve(self, key_path: str) -> Any:
+        """ドット区切りのキーを辿って設定値を返す（存在しない場合は_MISSING）"""
         value = self._config
         
-        for key in keys:
+        for key in key_path.split('.'):
             if isinstance(value, dict) and key in value:
                 value = value[key]
             else:
-                return default
+                return _MISSING
         
         return value
 
+# URL解析結果のキャッシュ件数（同じ候補URLをスコアリング中に何度も解析するため）
+_URL_CACHE_SIZE = 2048
+
+# ルート直下にある場合に深度0（トップページ）とみなすファイル名
+_TOP_PAGE_FILES = frozenset({
+    'index.html', 'index.htm', 'index.php',
+    'default.aspx', 'default.asp', 'home.html'
+})
+
+# 解析が単純な「http(s)://ホスト/パス」形式のURL（クエリ・フラグメント・認証情報・ポート・
+# パラメータ・IPv6表記・空白/制御文字を含まないもの）はurlparseを経由せず分割する
+_SIMPLE_URL_RE = re.compile(r'https?://([^/?#@:;\[\]\x00-\x20\x7f]*)([^?#@:;\[\]\x00-\x20\x7f]*)\Z')
+
+@dataclass(slots=True, frozen=True)
+class _URLParts:
+    """1回のURL解析から導出した値"""
+    host: str   # 小文字・www.除去済みのホスト
+    path: str
+    depth: int
+
+@lru_cache(maxsize=_URL_CACHE_SIZE)
+def _parse_url(url: str) -> Optional[_URLParts]:
+    """URLを1回だけ解析してドメイン・パス深度をまとめて返す（解析できない場合はNone）"""
+    try:
+        match = _SIMPLE_URL_RE.match(url) if url.isascii() else None
+        if match is not None:
+            host, path = match.groups()
+        else:
+            parsed = urlparse(url)
+            host, path = parsed.netloc, parsed.path
+        host = host.lower()
+        # www.を除去
+        if host.startswith('www.'):
+            host = host[4:]
+        return _URLParts(
+            # 同じドメインは同一オブジェクトにし、ドメインをキーにした比較・辞書参照を速くする
+            host=sys.intern(host),
+            path=path,
+            depth=URLUtils.get_path_depth_from_path(path)
+        )
+    except Exception:
+        return None
+
 class URLUtils:
     """URL処理関連のユーティリティ"""
     
     @staticmethod
+    @lru_cache(maxsize=_URL_CACHE_SIZE)
     def normalize_url(url: str) -> str:
         """URLを正規化する"""
         if not url:
             return ""
+        
+        has_scheme = url.startswith(('http://', 'https://'))
+        # 正規化済みのURLは新しい文字列を作らずそのまま返す
+        if has_scheme and not url.endswith('/'):
+            return url
             
         # httpまたはhttpsプロトコルを追加
-        if not url.startswith(('http://', 'https://')):
+        if not has_scheme:
             url = 'https://' + url
             
         # 末尾のスラッシュを除去
         return url.rstrip('/')
     
     @staticmethod
+    @lru_cache(maxsize=_URL_CACHE_SIZE)
     def get_domain(url: str) -> str:
         """URLからドメイン名を抽出"""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            # www.を除去
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            return domain
-        except:
-            return ""
+        parts = _parse_url(url)
+        return parts.host if parts is not None else ""
     
     @staticmethod
+    @lru_cache(maxsize=_URL_CACHE_SIZE)
     def get_path_depth(url: str) -> int:
         """URLのパス深度を計算"""
-        try:
-            parsed = urlparse(url)
-            path = parsed.path.strip('/')
-            
-            if not path:
-                return 0
-                
-            # index.html等のトップページファイルは深度0とみなす
-            top_page_files = ['index.html', 'index.htm', 'index.php', 
-                            'default.aspx', 'default.asp', 'home.html']
+        parts = _parse_url(url)
+        # エラーの場合は大きな値を返す
+        return parts.depth if parts is not None else 999
+    
+    @staticmethod
+    def get_domain_batch(urls: List[str]) -> List[str]:
+        """複数URLのドメインをまとめて抽出（同じURLの解析はキャッシュで共有）"""
+        get_domain = URLUtils.get_domain
+        return [get_domain(url) for url in urls]
+    
+    @staticmethod
+    def get_path_depth_batch(urls: List[str]) -> List[int]:
+        """複数URLのパス深度をまとめて計算（同じURLの解析はキャッシュで共有）"""
+        get_path_depth = URLUtils.get_path_depth
+        return [get_path_depth(url) for url in urls]
+    
+    @staticmethod
+    def get_path_depth_from_path(path: str) -> int:
+        """解析済みのURLパスからパス深度を計算"""
+        path = path.strip('/')
+        
+        if not path:
+            return 0
             
-            if path.lower() in top_page_files:
-                return 0
-                
-            return len(path.split('/'))
+        # index.html等のトップページファイルは深度0とみなす
+        if path.lower() in _TOP_PAGE_FILES:
+            return 0
             
-        except:
-            return 999  # エラーの場合は大きな値を返す
+        # セグメント数 = 区切りの数 + 1（split('/')のリストを作らずに数える）
+        return path.count('/') + 1
     
     @staticmethod
+    @lru_cache(maxsize=_URL_CACHE_SIZE)
     def is_top_page(url: str) -> bool:
         """URLがトップページかどうかを判定"""
-        return URLUtils.get_path_depth(url) == 0
+        parts = _parse_url(url)
+        return parts is not None and parts.depth == 0
+
+# 企業名正規化で使う正規表現（呼び出しごとのパターン解決を避けるためモジュール読み込み時にコンパイル）
+_READING_RE = re.compile(r'【.*?】')
+_WHITESPACE_RE = re.compile(r'\s+')
+_KATAKANA_RE = re.compile(r'[ァ-ヴー]+')
+
+# 除去対象の法人格（企業名の先頭または末尾にあるもののみ除去）
+_LEGAL_SUFFIXES = ('株式会社', '有限会社', '合同会社', '合資会社', '合名会社',
+                   '一般社団法人', '公益社団法人', '一般財団法人', '公益財団法人',
+                   '(株)', '（株）', '(有)', '（有）', '㈱', '㈲')
+_LEGAL_ALTERNATION = '|'.join(map(re.escape, _LEGAL_SUFFIXES))
+_LEGAL_PREFIX_RE = re.compile(f'^(?:{_LEGAL_ALTERNATION})')
+_LEGAL_SUFFIX_RE = re.compile(f'(?:{_LEGAL_ALTERNATION})$')
 
 class StringUtils:
     """文字列処理関連のユーティリティ"""
@@ -130,31 +228,25 @@ class StringUtils:
             return ""
             
         # 【】内の読み仮名を除去
-        cleaned = re.sub(r'【.*?】', '', company_name)
+        cleaned = _READING_RE.sub('', company_name)
         
         # 不要な空白を除去
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
         
         return cleaned
     
     @staticmethod
     def remove_legal_suffixes(company_name: str) -> str:
         """法人格を示す接尾辞を除去"""
-        suffixes = ['株式会社', '有限会社', '合同会社', '合資会社', '合名会社', 
-                   '一般社団法人', '公益社団法人', '一般財団法人', '公益財団法人',
-                   '(株)', '（株）', '(有)', '（有）']
-        
-        for suffix in suffixes:
-            company_name = company_name.replace(suffix, '').strip()
-            
-        return company_name
+        # 先頭・末尾の法人格をそれぞれ1回の照合で除去する
+        # （文字列以外は従来どおりstr.strip()でAttributeErrorとする）
+        company_name = _LEGAL_PREFIX_RE.sub('', company_name.strip()).strip()
+        return _LEGAL_SUFFIX_RE.sub('', company_name).strip()
     
     @staticmethod
     def extract_katakana(text: str) -> str:
         """カタカナ部分のみを抽出"""
-        katakana_pattern = r'[ァ-ヴー]+'
-        matches = re.findall(katakana_pattern, text)
-        return ' '.join(matches)
+        return ' '.join(_KATAKANA_RE.findall(text))
 
 class BlacklistChecker:
     """ブラックリスト・ペナルティチェッククラス"""
@@ -162,14 +254,25 @@ class BlacklistChecker:
     def __init__(self, blacklist_config_path: str = "config/blacklist.yaml"):
         self.blacklist_config_path = blacklist_config_path
         self._blacklist_config = None
+        self._blacklist_domains = frozenset()
+        self._path_penalty_re = None
         
     def load_blacklist(self):
         """ブラックリスト設定を読み込む"""
         try:
-            with open(self.blacklist_config_path, 'r', encoding='utf-8') as f:
-                self._blacklist_config = yaml.safe_load(f)
+            # チェッカーを複数生成しても同じファイルのYAML解析は1回で済ませる
+            mtime_ns = os.stat(self.blacklist_config_path).st_mtime_ns
+            self._blacklist_config = _load_yaml_file(self.blacklist_config_path, mtime_ns)
         except FileNotFoundError:
             raise FileNotFoundError(f"ブラックリスト設定ファイルが見つかりません: {self.blacklist_config_path}")
+        
+        # ドメイン判定はURLごとに呼ばれるため、読み込み時に一度だけ集合化しておく
+        config = self._blacklist_config or {}
+        self._blacklist_domains = frozenset(config.get('blacklist_domains') or [])
+        # ペナルティキーワードの部分一致判定は1つの正規表現でパスを1回走査する
+        penalty_keywords = config.get('path_penalty_keywords') or []
+        self._path_penalty_re = (re.compile('|'.join(re.escape(keyword) for keyword in penalty_keywords))
+                                 if penalty_keywords else None)
     
     def is_domain_blacklisted(self, url: str) -> bool:
         """ドメインがブラックリストに含まれているかチェック"""
@@ -177,37 +280,29 @@ class BlacklistChecker:
             self.load_blacklist()
             
         domain = URLUtils.get_domain(url)
-        blacklist_domains = self._blacklist_config.get('blacklist_domains', [])
         
-        return domain in blacklist_domains
+        return domain in self._blacklist_domains
     
-    def get_blacklist_domains(self) -> set:
+    def get_blacklist_domains(self) -> frozenset:
         """ブラックリストドメインのセットを取得"""
         if not self._blacklist_config:
             self.load_blacklist()
             
-        blacklist_domains = self._blacklist_config.get('blacklist_domains', [])
-        return set(blacklist_domains)
+        return self._blacklist_domains
     
     def get_path_penalty_score(self, url: str, penalty_value: int = -2) -> int:
         """URLパスのペナルティスコアを計算"""
         if not self._blacklist_config:
             self.load_blacklist()
             
-        try:
-            parsed = urlparse(url)
-            path = parsed.path.lower()
-            
-            penalty_keywords = self._blacklist_config.get('path_penalty_keywords', [])
-            
-            for keyword in penalty_keywords:
-                if keyword in path:
-                    return penalty_value
-                    
-            return 0
-            
-        except:
+        if self._path_penalty_re is None:
             return 0
+        
+        parts = _parse_url(url)
+        if parts is not None and self._path_penalty_re.search(parts.path.lower()):
+            return penalty_value
+        
+        return 0
 
 def validate_config(config: Dict[str, Any]) -> List[str]:
     """設定ファイルの妥当性をチェック"""
@@ -4,16 +4,74 @@ Webページコンテンツ解析モジュール
 地域情報抽出のための3段階ロジック実装
 """
 
+import atexit
 import requests
 import json
 import re
-from typing import Dict, Optional, Tuple, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple, Any
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from dataclasses import dataclass
 from .logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# 市外局番 → 都道府県（桁数ごとに分割し、長い局番から順に照合）
+_AREA_BY_LEN = {
+    2: {'03': '東京都', '06': '大阪府'},
+    3: {
+        '052': '愛知県', '045': '神奈川県', '078': '兵庫県', '075': '京都府',
+        '092': '福岡県', '011': '北海道', '022': '宮城県', '082': '広島県',
+        '054': '静岡県', '043': '千葉県', '048': '埼玉県'
+    },
+}
+_AREA_CODE_LENGTHS = (3, 2)
+_NON_DIGIT_RE = re.compile(r'\D')
+# 市外局番は桁数を保ったまま取り出す（03-1234-5678 / 03-12345678 / 052-123-4567 に対応）
+_PHONE_RE = re.compile(r'(0\d{1,3})-\d{2,4}-?\d{4}')
+# お問い合わせページ並列取得のワーカー数（全アナライザーで1つのプールを共有）
+_CONTACT_FETCH_WORKERS = 4
+_contact_executor: Optional[ThreadPoolExecutor] = None
+_contact_executor_lock = threading.Lock()
+# これを超えるHTMLはダウンロード・解析しない（バイト数）
+_MAX_HTML_BYTES = 2_000_000
+# HTML先頭部分の <meta charset> 宣言
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_\-]+)', re.I)
+# フッター候補とみなすclass属性のキーワード（小文字）
+_FOOTER_CLASS_KEYWORDS = ('footer', 'contact', 'info')
+# 公式HPになり得ないポータル・集約サイト（通信前に除外）
+_AGGREGATOR_HOSTS = frozenset({
+    'beauty.hotpepper.jp', 'hotpepper.jp', 'beauty.rakuten.co.jp', 'rakuten.co.jp',
+    'minimodel.jp', 'relax.jp', 'tabelog.com', 'gnavi.co.jp', 'hairbook.jp',
+    'yahoo.co.jp', 'google.com', 'epark.jp', 'itp.ne.jp',
+})
+# 都道府県名の末尾接尾辞
+_PREF_SUFFIXES = ('県', '府', '都', '道')
+
+
+def _stem(prefecture: str) -> str:
+    """末尾の都/道/府/県を1文字だけ除去（該当しなければそのまま返す）"""
+    return prefecture[:-1] if prefecture.endswith(_PREF_SUFFIXES) else prefecture
+
+
+# 全47都道府県
+_ALL_PREFECTURES: Tuple[str, ...] = (
+    '北海道', '青森県', '岩手県', '宮城県', '秋田県', '山形県', '福島県',
+    '茨城県', '栃木県', '群馬県', '埼玉県', '千葉県', '東京都', '神奈川県',
+    '新潟県', '富山県', '石川県', '福井県', '山梨県', '長野県', '岐阜県',
+    '静岡県', '愛知県', '三重県', '滋賀県', '京都府', '大阪府', '兵庫県',
+    '奈良県', '和歌山県', '鳥取県', '島根県', '岡山県', '広島県', '山口県',
+    '徳島県', '香川県', '愛媛県', '高知県', '福岡県', '佐賀県', '長崎県',
+    '熊本県', '大分県', '宮崎県', '鹿児島県', '沖縄県'
+)
+_ALL_PREFECTURES_SET = frozenset(_ALL_PREFECTURES)
+# (正式名, 接尾辞なし) の組
+_PREF_STRIPPED: Tuple[Tuple[str, str], ...] = tuple((p, _stem(p)) for p in _ALL_PREFECTURES)
+# テキスト中の正式な都道府県名を1回の走査で検出
+_PREF_RE = re.compile('|'.join(map(re.escape, _ALL_PREFECTURES)))
+
 @dataclass
 class LocationInfo:
     """抽出された地域情報"""
@@ -24,6 +82,17 @@ class LocationInfo:
     confidence_level: str = "none"  # "high", "medium", "low", "none"
     extraction_method: str = "none"  # "json_ld", "html_footer", "contact_page", "none"
 
+def _get_contact_executor() -> ThreadPoolExecutor:
+    """お問い合わせページ取得用の共有スレッドプールを返す（初回呼び出し時に生成し、終了時に停止）"""
+    global _contact_executor
+    with _contact_executor_lock:
+        if _contact_executor is None:
+            _contact_executor = ThreadPoolExecutor(max_workers=_CONTACT_FETCH_WORKERS,
+                                                   thread_name_prefix="contact-fetch")
+            atexit.register(_contact_executor.shutdown, wait=False, cancel_futures=True)
+        return _contact_executor
+
+
 class WebContentAnalyzer:
     """Webページから地域情報を抽出する分析クラス"""
     
@@ -33,6 +102,7 @@ class WebContentAnalyzer:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        self._aggregator_hosts = _AGGREGATOR_HOSTS
     
     def extract_location_info(self, url: str) -> LocationInfo:
         """
@@ -45,6 +115,11 @@ class WebContentAnalyzer:
             LocationInfo: 抽出された地域情報
         """
         try:
+            # ポータル・集約サイトは解析しても意味がないため通信前に除外
+            if self._is_aggregator_host(url):
+                logger.debug(f"集約サイトのため地域解析をスキップ: {url}")
+                return LocationInfo()
+            
             # HTMLを取得
             html_content = self._fetch_html(url)
             if not html_content:
@@ -70,16 +145,57 @@ class WebContentAnalyzer:
             logger.warning(f"地域情報抽出エラー: {url} - {e}")
             return LocationInfo()
     
+    def _is_aggregator_host(self, url: str) -> bool:
+        """URLのホストが集約サイト（またはそのサブドメイン）かを判定"""
+        host = urlparse(url).hostname or ''
+        if host.startswith('www.'):
+            host = host[4:]
+        if host in self._aggregator_hosts:
+            return True
+        # サブドメインは親ドメインを順に確認（a.b.example.jp → b.example.jp → example.jp）
+        while '.' in host:
+            host = host.split('.', 1)[1]
+            if host in self._aggregator_hosts:
+                return True
+        return False
+    
     def _fetch_html(self, url: str) -> Optional[str]:
         """HTMLコンテンツを取得"""
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            return response.text
+            # ヘッダーだけ先に受け取り、本文を読む前にサイズ・種別を確認
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and 'html' not in content_type.lower():
+                    logger.debug(f"HTML以外のコンテンツのためスキップ: {url} ({content_type})")
+                    return None
+                
+                content_length = response.headers.get('Content-Length')
+                if content_length and content_length.isdigit() and int(content_length) > _MAX_HTML_BYTES:
+                    logger.debug(f"HTMLサイズ超過のためスキップ: {url} ({content_length} bytes)")
+                    return None
+                
+                return self._decode_body(response.content, content_type, response.encoding)
         except Exception as e:
             logger.warning(f"HTML取得エラー: {url} - {e}")
             return None
     
+    def _decode_body(self, body: bytes, content_type: str, declared_encoding: Optional[str]) -> str:
+        """
+        レスポンス本文をデコード（requestsの文字コード推定を経由しない）
+        
+        Content-Typeのcharset → <meta charset> → UTF-8 の順で文字コードを決定
+        """
+        encoding = declared_encoding if 'charset=' in content_type.lower() else None
+        if not encoding:
+            meta_match = _META_CHARSET_RE.search(body[:2048])
+            encoding = meta_match.group(1).decode('ascii') if meta_match else 'utf-8'
+        try:
+            return body.decode(encoding, errors='replace')
+        except LookupError:
+            return body.decode('utf-8', errors='replace')
+    
     def _extract_from_json_ld(self, soup: BeautifulSoup) -> LocationInfo:
         """
         段階A: JSON-LD構造化データから地域情報を抽出
@@ -178,7 +294,7 @@ class WebContentAnalyzer:
             location_info = LocationInfo()
             
             # フッター要素を優先的に検索
-            footer_elements = soup.find_all(['footer', 'div'], class_=re.compile(r'footer|contact|info', re.I))
+            footer_elements = self._find_footer_elements(soup)
             
             # フッターが見つからない場合は全体から検索
             if not footer_elements:
@@ -188,7 +304,7 @@ class WebContentAnalyzer:
                 text_content = element.get_text() if element else ""
                 
                 # 電話番号パターンで地域推定（愛知県: 052-, 東京都: 03-等）
-                phone_match = re.search(r'(\d{2,4})-\d{4}-?\d{4}', text_content)
+                phone_match = _PHONE_RE.search(text_content)
                 if phone_match:
                     area_code = phone_match.group(1)
                     location_info.phone_number = phone_match.group(0)
@@ -217,6 +333,17 @@ class WebContentAnalyzer:
         
         return LocationInfo()
     
+    def _find_footer_elements(self, soup: BeautifulSoup) -> list:
+        """class属性にフッター系キーワードを含むfooter/div要素を抽出"""
+        footer_elements = []
+        # class属性を持つ要素だけを一度で取得し、正規表現を使わず部分一致で判定
+        for element in soup.find_all(['footer', 'div'], class_=True):
+            classes = element.get('class')
+            class_text = ' '.join(classes).lower() if isinstance(classes, list) else str(classes).lower()
+            if any(keyword in class_text for keyword in _FOOTER_CLASS_KEYWORDS):
+                footer_elements.append(element)
+        return footer_elements
+    
     def _extract_from_contact_pages(self, soup: BeautifulSoup, base_url: str) -> LocationInfo:
         """
         段階C: お問い合わせページなど追加ページから情報抽出
@@ -231,34 +358,59 @@ class WebContentAnalyzer:
         try:
             # お問い合わせページのリンクを検索
             contact_links = soup.find_all('a', href=re.compile(r'contact|about|company|info', re.I))
+            contact_urls = self._collect_contact_urls(contact_links, base_url, limit=3)  # 最大3ページまで確認
+            if not contact_urls:
+                return LocationInfo()
             
-            for link in contact_links[:3]:  # 最大3ページまで確認
-                href = link.get('href')
-                if href:
-                    # 相対URLを絶対URLに変換
-                    if href.startswith('/'):
-                        contact_url = f"{base_url.rstrip('/')}{href}"
-                    elif href.startswith('http'):
-                        contact_url = href
-                    else:
+            # お問い合わせページを並列取得し、取得できた順に解析
+            # スコアリングでは候補ごとにアナライザーを生成するため、プールはモジュールで共有する
+            executor = _get_contact_executor()
+            futures = [executor.submit(self._fetch_html, u) for u in contact_urls]
+            future_to_url = dict(zip(futures, contact_urls))
+            try:
+                for future in as_completed(futures):
+                    contact_html = future.result()
+                    if not contact_html:
                         continue
-                    
-                    # お問い合わせページを解析
-                    contact_html = self._fetch_html(contact_url)
-                    if contact_html:
-                        contact_soup = BeautifulSoup(contact_html, 'html.parser')
-                        location_info = self._extract_from_html_content(contact_soup, contact_url)
-                        if location_info.prefecture:
-                            location_info.confidence_level = "low"
-                            location_info.extraction_method = "contact_page"
-                            logger.info(f"お問い合わせページ地域情報抽出: {location_info.prefecture}")
-                            return location_info
+                    contact_url = future_to_url[future]
+                    contact_soup = BeautifulSoup(contact_html, 'html.parser')
+                    location_info = self._extract_from_html_content(contact_soup, contact_url)
+                    if location_info.prefecture:
+                        location_info.confidence_level = "low"
+                        location_info.extraction_method = "contact_page"
+                        logger.info(f"お問い合わせページ地域情報抽出: {location_info.prefecture}")
+                        return location_info
+            finally:
+                # 早期終了時は未着手の取得をキャンセル
+                for future in futures:
+                    future.cancel()
             
         except Exception as e:
             logger.warning(f"お問い合わせページ解析エラー: {e}")
         
         return LocationInfo()
     
+    def _collect_contact_urls(self, links, base_url: str, limit: int) -> List[str]:
+        """リンク要素から重複を除いた絶対URLを最大limit件収集"""
+        urls = []
+        for link in links:
+            href = link.get('href')
+            if not href:
+                continue
+            # 相対URLを絶対URLに変換
+            if href.startswith('/'):
+                contact_url = f"{base_url.rstrip('/')}{href}"
+            elif href.startswith('http'):
+                contact_url = href
+            else:
+                continue
+            if contact_url in urls:
+                continue
+            urls.append(contact_url)
+            if len(urls) >= limit:
+                break
+        return urls
+    
     def _normalize_prefecture(self, text: str) -> Optional[str]:
         """都道府県名を正規化"""
         if not text:
@@ -278,54 +430,39 @@ class WebContentAnalyzer:
             return prefecture_map[normalized.lower()]
         
         # 既に日本語の場合はそのまま返す
-        all_prefectures = [
-            '北海道', '青森県', '岩手県', '宮城県', '秋田県', '山形県', '福島県',
-            '茨城県', '栃木県', '群馬県', '埼玉県', '千葉県', '東京都', '神奈川県',
-            '新潟県', '富山県', '石川県', '福井県', '山梨県', '長野県', '岐阜県',
-            '静岡県', '愛知県', '三重県', '滋賀県', '京都府', '大阪府', '兵庫県',
-            '奈良県', '和歌山県', '鳥取県', '島根県', '岡山県', '広島県', '山口県',
-            '徳島県', '香川県', '愛媛県', '高知県', '福岡県', '佐賀県', '長崎県',
-            '熊本県', '大分県', '宮崎県', '鹿児島県', '沖縄県'
-        ]
+        if normalized in _ALL_PREFECTURES_SET:
+            return normalized
         
-        for prefecture in all_prefectures:
-            if prefecture in normalized or prefecture.replace('県', '').replace('府', '').replace('都', '') in normalized:
+        for prefecture, stem in _PREF_STRIPPED:
+            if prefecture in normalized or stem in normalized:
                 return prefecture
         
         return None
     
     def _extract_prefecture_from_text(self, text: str) -> Optional[str]:
         """テキストから都道府県名を抽出"""
-        all_prefectures = [
-            '北海道', '青森県', '岩手県', '宮城県', '秋田県', '山形県', '福島県',
-            '茨城県', '栃木県', '群馬県', '埼玉県', '千葉県', '東京都', '神奈川県',
-            '新潟県', '富山県', '石川県', '福井県', '山梨県', '長野県', '岐阜県',
-            '静岡県', '愛知県', '三重県', '滋賀県', '京都府', '大阪府', '兵庫県',
-            '奈良県', '和歌山県', '鳥取県', '島根県', '岡山県', '広島県', '山口県',
-            '徳島県', '香川県', '愛媛県', '高知県', '福岡県', '佐賀県', '長崎県',
-            '熊本県', '大分県', '宮崎県', '鹿児島県', '沖縄県'
-        ]
-        
-        for prefecture in all_prefectures:
-            if prefecture in text:
-                return prefecture
-        
-        return None
+        if not text:
+            return None
+        match = _PREF_RE.search(text)
+        return match.group(0) if match else None
     
     def _infer_prefecture_from_phone(self, phone: str) -> Optional[str]:
         """電話番号から都道府県を推定"""
-        return self._infer_prefecture_from_area_code(phone[:3])
+        if not phone:
+            return None
+        digits = _NON_DIGIT_RE.sub('', phone)
+        for length in _AREA_CODE_LENGTHS:
+            hit = _AREA_BY_LEN[length].get(digits[:length])
+            if hit:
+                return hit
+        return None
     
     def _infer_prefecture_from_area_code(self, area_code: str) -> Optional[str]:
         """市外局番から都道府県を推定"""
-        area_code_map = {
-            '052': '愛知県', '03': '東京都', '06': '大阪府',
-            '045': '神奈川県', '078': '兵庫県', '075': '京都府',
-            '092': '福岡県', '011': '北海道', '022': '宮城県',
-            '082': '広島県', '054': '静岡県', '043': '千葉県',
-            '048': '埼玉県'
-        }
-        return area_code_map.get(area_code)
+        if not area_code:
+            return None
+        table = _AREA_BY_LEN.get(len(area_code))
+        return table.get(area_code) if table else None
     
     def _infer_prefecture_from_postal(self, postal_code: str) -> Optional[str]:
         """郵便番号から都道府県を推定（上位3桁）"""
@@ -4,6 +4,7 @@
 """
 
 import sys
+import functools
 from pathlib import Path
 
 # プロジェクトルートをpathに追加
@@ -14,6 +15,12 @@ from src.search_agent import SearchResult, CompanyInfo
 from src.scorer import HPScorer, ScoringConfig
 from src.utils import BlacklistChecker
 
+@functools.lru_cache(maxsize=1)
+def _get_scorer() -> HPScorer:
+    """ブラックリストYAMLの読み込みとスコアラー生成をプロセス内で1回に抑える"""
+    blacklist_checker = BlacklistChecker("config/blacklist.yaml")
+    return HPScorer(ScoringConfig(), blacklist_checker.get_blacklist_domains())
+
 def test_advanced_location_scoring():
     """高度な地域判定システムテスト"""
     
@@ -21,9 +28,7 @@ def test_advanced_location_scoring():
     print("=" * 50)
     
     # 設定初期化
-    config = ScoringConfig()
-    blacklist_checker = BlacklistChecker("config/blacklist.yaml")
-    scorer = HPScorer(config, blacklist_checker.get_blacklist_domains())
+    scorer = _get_scorer()
     
     # テスト企業（愛知県）
     company = CompanyInfo(
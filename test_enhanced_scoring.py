@@ -8,17 +8,21 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent / "src"))
 
+from rapidfuzz import fuzz
+
 from src.search_agent import SearchResult, CompanyInfo
-from src.scorer import HPScorer, ScoringConfig
+from src.scorer import get_default_scorer
 from src.utils import StringUtils, URLUtils
 
+_URL_UTILS = URLUtils()
+_STRING_UTILS = StringUtils()
+
 def test_enhanced_scoring():
     print("🚀 強化版スコアリングシステムテスト")
     print("=" * 60)
     
     # 強化設定でスコアラー初期化
-    config = ScoringConfig()
-    scorer = HPScorer(config=config)
+    scorer = get_default_scorer()
     
     # テスト用企業情報
     enishi_company = CompanyInfo(
@@ -128,8 +132,7 @@ def test_domain_similarity_comparison():
     print("\n🧪 ドメイン類似度 新旧比較テスト")
     print("=" * 50)
     
-    config = ScoringConfig()
-    scorer = HPScorer(config=config)
+    scorer = get_default_scorer()
     
     test_cases = [
         ("美髪処 縁‐ENISHI‐", "hairenishi.jp"),
@@ -152,19 +155,11 @@ def test_domain_similarity_comparison():
 def _calculate_domain_similarity_old(company_name: str, url: str) -> float:
     """旧方式のドメイン類似度計算（比較用）"""
     try:
-        from rapidfuzz import fuzz
-        from src.utils import URLUtils, StringUtils
-        
-        url_utils = URLUtils()
-        string_utils = StringUtils()
-        
-        cleaned_name = string_utils.clean_company_name(company_name)
-        domain = url_utils.get_domain(url)
-        domain_without_tld = domain.split('.')[0]
+        cleaned_name = _STRING_UTILS.clean_company_name(company_name)
+        domain_without_tld = _URL_UTILS.get_domain(url).split('.')[0]
         
         # 単純なfuzz比較のみ
-        similarity = fuzz.ratio(cleaned_name.lower(), domain_without_tld.lower())
-        return float(similarity)
+        return float(fuzz.ratio(cleaned_name.lower(), domain_without_tld.lower()))
         
     except Exception:
         return 0.0
@@ -5,6 +5,7 @@ Google Sheets完全連携テストスクリプト
 """
 
 import asyncio
+import logging
 import sys
 from pathlib import Path
 
@@ -12,14 +13,27 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from src.utils import ConfigManager
-from src.data_loader import create_data_loader_from_config, SheetConfig
-from src.search_agent import BraveSearchClient, QueryGenerator
+from src.data_loader import create_data_loader_from_config, create_sheets_client_from_config, SheetConfig
+from src.search_agent import BraveSearchClient, BraveRateLimiter, QueryGenerator
 from src.scorer import create_scorer_from_config  
 from src.output_writer import create_output_writer_from_config
 from src.logger_config import get_logger
 
 logger = get_logger(__name__)
 
+async def _search_one(brave_client: BraveSearchClient, company, sem: asyncio.Semaphore):
+    """1社分の検索をスレッドプール上で実行（同時実行数はセマフォで制御）"""
+    # 基本情報組み合わせクエリで検索
+    query = QueryGenerator.generate_custom_query(
+        "{company_name} {prefecture} {industry}", 
+        company
+    )
+    async with sem:
+        loop = asyncio.get_running_loop()
+        # API制限はクライアントのBraveRateLimiterがレスポンスヘッダーに基づいて制御
+        search_results = await loop.run_in_executor(None, brave_client.search, query)
+    return query, search_results
+
 async def test_google_sheets_workflow():
     """Google Sheets完全ワークフローテスト"""
     
@@ -35,7 +49,9 @@ async def test_google_sheets_workflow():
         
         # 2. Google Sheets読み込みテスト
         print("\n📊 2. Google Sheets読み込みテスト...")
-        data_loader = create_data_loader_from_config(config)
+        # 読み込み・書き込みで同じGoogle Sheetsクライアント（認証・接続）を共有
+        sheets_client = create_sheets_client_from_config(config)
+        data_loader = create_data_loader_from_config(config, sheets_client)
         
         # シート設定
         google_sheets_config = config.get('google_sheets', {})
@@ -54,7 +70,7 @@ async def test_google_sheets_workflow():
         )
         
         # 企業データ読み込み
-        companies = data_loader.load_companies_from_range(sheet_config)
+        companies = data_loader.load_companies_batch(sheet_config)
         
         if not companies:
             print("❌ Google Sheetsからデータを読み込めませんでした")
@@ -68,9 +84,12 @@ async def test_google_sheets_workflow():
         # 3. Brave Search APIテスト
         print("\n🔍 3. Brave Search API検索テスト...")
         brave_api_config = config.get('brave_api', {})
+        request_delay_ms = config.get('async_processing', {}).get('request_delay_ms', 1000)
         brave_client = BraveSearchClient(
             api_key=brave_api_config.get('api_key'),
-            results_per_query=brave_api_config.get('results_per_query', 10)
+            results_per_query=brave_api_config.get('results_per_query', 10),
+            rate_limiter=BraveRateLimiter(min_interval=request_delay_ms / 1000),
+            cache_dir=brave_api_config.get('cache_dir')
         )
         
         # 4. スコアリング初期化
@@ -84,34 +103,35 @@ async def test_google_sheets_workflow():
         print("\n🔍 5. 各企業の検索・スコアリング実行...")
         results_to_write = []
         
-        for i, company in enumerate(companies, 1):
-            print(f"\n💼 企業 {i}/{len(companies)}: {company.company_name}")
+        # 検索（I/Oバウンド）は並行実行し、スコアリングはその後にまとめて実行
+        concurrency = config.get('async_processing', {}).get('concurrent_searches', 1)
+        sem = asyncio.Semaphore(max(1, concurrency))
+        search_outcomes = await asyncio.gather(
+            *[_search_one(brave_client, company, sem) for company in companies],
+            return_exceptions=True
+        )
+        
+        for i, (company, outcome) in enumerate(zip(companies, search_outcomes), 1):
+            logger.info("企業 %d/%d: %s", i, len(companies), company.company_name)
             
             try:
-                # 基本情報組み合わせクエリで検索
-                query = QueryGenerator.generate_custom_query(
-                    "{company_name} {prefecture} {industry}", 
-                    company
-                )
-                print(f"📝 検索クエリ: {query}")
-                
-                # 検索実行
-                search_results = brave_client.search(query)
-                print(f"📋 検索結果: {len(search_results)}件")
+                if isinstance(outcome, Exception):
+                    raise outcome
+                query, search_results = outcome
+                logger.debug("検索クエリ: %s", query)
+                logger.debug("検索結果: %d件", len(search_results))
                 
                 if search_results:
                     # スコアリング
-                    scored_results = []
-                    for result in search_results[:5]:  # 上位5件
-                        scored = scorer.calculate_score(result, company, "基本情報組み合わせ")
-                        if scored:
-                            scored_results.append(scored)
+                    # 類似度は一括計算し、1パスで最高スコアを保持（ブラックリストURLは除外済み）
+                    best = None
+                    for scored in scorer.calculate_scores_batch(search_results[:5], company, "基本情報組み合わせ"):  # 上位5件
+                        if best is None or scored.total_score > best.total_score:
+                            best = scored
                     
-                    if scored_results:
-                        best = max(scored_results, key=lambda x: x.total_score)
-                        print(f"🏆 ベスト: {best.url}")
-                        print(f"📊 スコア: {best.total_score}点 - {best.judgment}")
-                        print(f"🔍 類似度: {best.domain_similarity:.1f}%")
+                    if best is not None:
+                        logger.info("ベスト: %s スコア: %s点 - %s 類似度: %.1f%%",
+                                    best.url, best.total_score, best.judgment, best.domain_similarity)
                         
                         # 書き込み用データ準備
                         results_to_write.append({
@@ -123,7 +143,7 @@ async def test_google_sheets_workflow():
                             'similarity': best.domain_similarity
                         })
                     else:
-                        print("❌ 有効なスコア結果なし")
+                        logger.info("有効なスコア結果なし: %s", company.company_name)
                         results_to_write.append({
                             'company_id': company.id,
                             'url': '',
@@ -133,7 +153,7 @@ async def test_google_sheets_workflow():
                             'similarity': 0.0
                         })
                 else:
-                    print("❌ 検索結果なし")
+                    logger.info("検索結果なし: %s", company.company_name)
                     results_to_write.append({
                         'company_id': company.id,
                         'url': '',
@@ -143,11 +163,8 @@ async def test_google_sheets_workflow():
                         'similarity': 0.0
                     })
                 
-                # API制限考慮
-                await asyncio.sleep(1.5)
-                
             except Exception as e:
-                print(f"❌ エラー: {e}")
+                logger.error("企業 %s の処理でエラー: %s", company.company_name, e)
                 results_to_write.append({
                     'company_id': company.id,
                     'url': '',
@@ -159,37 +176,42 @@ async def test_google_sheets_workflow():
         
         # 6. Google Sheets書き込みテスト
         print("\n📝 6. Google Sheets書き込みテスト...")
-        output_writer = create_output_writer_from_config(config)
+        output_writer = create_output_writer_from_config(config, sheets_client)
         
-        print("📋 書き込み予定データ:")
-        for result in results_to_write:
-            print(f"   ID:{result['company_id']} -> {result['url']} ({result['score']}点)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("書き込み予定データ:")
+            for result in results_to_write:
+                logger.debug("   ID:%s -> %s (%s点)", result['company_id'], result['url'], result['score'])
         
-        # 実際の書き込み実行
+        # 実際の書き込み実行（全行を1回のバッチ更新で書き込み）
         try:
-            # 各結果を書き込み
-            for i, result in enumerate(results_to_write):
-                row_number = sheet_config.start_row + i  # 読み込み開始行から順番に
-                
-                write_result = output_writer.write_single_result(
-                    spreadsheet_id=google_sheets_config.get('input_spreadsheet_id'),
-                    sheet_name=google_sheets_config.get('input_sheet_name', 'シート1'),
-                    row_number=row_number,
-                    company_id=str(result['company_id']),
-                    url=result['url'],
-                    score=result['score'],
-                    status=result['status'],
-                    query=result['query']
-                )
-                
+            batch_rows = [
+                {
+                    'company_id': str(result['company_id']),
+                    'row_number': sheet_config.start_row + i,  # 読み込み開始行から順番に
+                    'url': result['url'],
+                    'score': result['score'],
+                    'status': result['status'],
+                    'query': result['query']
+                }
+                for i, result in enumerate(results_to_write)
+            ]
+            
+            loop = asyncio.get_running_loop()
+            write_results = await loop.run_in_executor(
+                None,
+                output_writer.write_batch_results,
+                google_sheets_config.get('input_spreadsheet_id'),
+                google_sheets_config.get('input_sheet_name', 'シート1'),
+                batch_rows
+            )
+            
+            for row, write_result in zip(batch_rows, write_results):
                 if write_result.success:
-                    print(f"✅ 行{row_number}に書き込み完了: {result['url']}")
+                    logger.debug("行%dに書き込み完了: %s", write_result.row_number, row['url'])
                 else:
-                    print(f"❌ 行{row_number}書き込み失敗: {write_result.error_message}")
-                
-                # 書き込み間隔
-                await asyncio.sleep(0.5)
-                
+                    logger.error("行%d書き込み失敗: %s", write_result.row_number, write_result.error_message)
+            
             print("✅ Google Sheets書き込み完全成功！")
             
         except Exception as e:
@@ -197,6 +219,9 @@ async def test_google_sheets_workflow():
             return False
         
         # 7. 結果サマリー
+        if not logger.isEnabledFor(logging.INFO):
+            return True
+        
         print("\n" + "=" * 60)
         print("📊 Google Sheets完全連携テスト結果:")
         
@@ -217,9 +242,7 @@ async def test_google_sheets_workflow():
         return True
         
     except Exception as e:
-        print(f"\n❌ テストエラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テストエラー: %s", e)
         return False
 
 if __name__ == "__main__":
@@ -19,6 +19,18 @@ import logging
 # ログレベルを調整
 logging.basicConfig(level=logging.INFO)
 
+# スコア詳細キー → 表示名
+_SCORE_LABEL_JA = {
+    'top_page': 'トップページボーナス',
+    'domain_similarity_score': 'ドメイン類似度スコア', 
+    'tld_score': 'TLDスコア(.co.jp/com等)',
+    'official_keyword': '公式キーワードボーナス',
+    'search_rank': '検索順位ボーナス(1-3位)',
+    'path_penalty': 'パスペナルティ',
+    'locality': '地域特定スコア',
+    'portal_penalty': 'ポータルペナルティ'
+}
+
 def test_actual_score_details():
     """実際の企業データでスコア詳細内訳をテスト"""
     
@@ -81,16 +93,7 @@ def test_actual_score_details():
                 print(f"🏆 判定: {scored_result.judgment}")
                 print("📋 詳細内訳:")
                 for key, value in scored_result.score_details.items():
-                    score_name = {
-                        'top_page': 'トップページボーナス',
-                        'domain_similarity_score': 'ドメイン類似度スコア', 
-                        'tld_score': 'TLDスコア(.co.jp/com等)',
-                        'official_keyword': '公式キーワードボーナス',
-                        'search_rank': '検索順位ボーナス(1-3位)',
-                        'path_penalty': 'パスペナルティ',
-                        'locality': '地域特定スコア',
-                        'portal_penalty': 'ポータルペナルティ'
-                    }.get(key, key)
+                    score_name = _SCORE_LABEL_JA.get(key, key)
                     print(f"   • {score_name}: {value:+}点")
                     
             elif company.company_name == "octo hair":
@@ -114,16 +117,7 @@ def test_actual_score_details():
                 print(f"🏆 判定: {scored_result.judgment}")
                 print("📋 詳細内訳:")
                 for key, value in scored_result.score_details.items():
-                    score_name = {
-                        'top_page': 'トップページボーナス',
-                        'domain_similarity_score': 'ドメイン類似度スコア', 
-                        'tld_score': 'TLDスコア(.co.jp/com等)',
-                        'official_keyword': '公式キーワードボーナス',
-                        'search_rank': '検索順位ボーナス(1-3位)',
-                        'path_penalty': 'パスペナルティ',
-                        'locality': '地域特定スコア',
-                        'portal_penalty': 'ポータルペナルティ'
-                    }.get(key, key)
+                    score_name = _SCORE_LABEL_JA.get(key, key)
                     print(f"   • {score_name}: {value:+}点")
                 
                 # 地域スコアの詳細分析
@@ -184,16 +178,7 @@ def test_prefecture_mismatch():
     print(f"🏆 判定: {scored_mismatch.judgment}")
     print("📋 詳細内訳:")
     for key, value in scored_mismatch.score_details.items():
-        score_name = {
-            'top_page': 'トップページボーナス',
-            'domain_similarity_score': 'ドメイン類似度スコア', 
-            'tld_score': 'TLDスコア(.co.jp/com等)',
-            'official_keyword': '公式キーワードボーナス',
-            'search_rank': '検索順位ボーナス(1-3位)',
-            'path_penalty': 'パスペナルティ',
-            'locality': '地域特定スコア',
-            'portal_penalty': 'ポータルペナルティ'
-        }.get(key, key)
+        score_name = _SCORE_LABEL_JA.get(key, key)
         print(f"   • {score_name}: {value:+}点")
     
     print(f"\n🎯 地域ペナルティ効果確認:")
@@ -4,74 +4,77 @@ scorer.py 改修のテストスクリプト
 日本語→ローマ字変換とドメイン類似度計算の検証
 """
 
-from src.scorer import HPScorer, ScoringConfig
+import pytest
+
+from src.scorer import HPScorer, ScoringConfig, get_default_scorer
 from src.search_agent import SearchResult, CompanyInfo
 
-def test_romanization():
+# ローマ字変換の期待値（pykakasi v2.0+での実際の出力に基づく）
+_ROMANIZATION_CASES = [
+    ("グラントホープ", "guranto"),  # 実測: gurantohoopu
+    ("サンプル", "sanpuru"),      # 実測: sanpuru
+    ("テスト会社", "tesuto"),      # 実測: tesutokaisha  
+    ("バーバーボス", "baaba"),     # 実測: baabaabosu
+    ("", ""),  # 空文字
+]
+
+# 企業名正規化の期待値
+_CLEANING_CASES = [
+    ("株式会社グラントホープ【グラントホープ】", "グラントホープ"),
+    ("有限会社サンプル", "サンプル"),
+    ("Barber Boss【バーバー ボス】", "Barber Boss"),
+    ("㈱テスト", "テスト"),
+    ("サンプル・テスト株式会社", "サンプルテスト"),
+]
+
+# ドメイン類似度の最低期待値（実測値に基づく現実的な設定）
+_DOMAIN_SIMILARITY_CASES = [
+    ("株式会社グラントホープ", "https://granthope.jp", 70.0),  # 実測76.2%
+    ("バーバーボス", "https://barberboss.com", 55.0),  # 実測60.0%
+    ("サンプル株式会社", "https://sample.co.jp", 40.0),  # 実測46.2%（現実的調整）
+    ("全く関係ない会社", "https://unrelated.com", 15.0),  # 低類似度期待
+]
+
+@pytest.mark.parametrize("input_text,expected", _ROMANIZATION_CASES)
+def test_romanization(input_text, expected):
     """ローマ字変換のテスト（自動化テスト）"""
-    scorer = HPScorer(ScoringConfig())
-    
-    # 期待値との比較テスト（pykakasi v2.0+での実際の出力に基づく）
-    test_cases = [
-        ("グラントホープ", "guranto"),  # 実測: gurantohoopu
-        ("サンプル", "sanpuru"),      # 実測: sanpuru
-        ("テスト会社", "tesuto"),      # 実測: tesutokaisha  
-        ("バーバーボス", "baaba"),     # 実測: baabaabosu
-        ("", ""),  # 空文字
-    ]
+    scorer = get_default_scorer()
     
-    for input_text, expected in test_cases:
-        actual = scorer._romanize(input_text)
-        print(f"'{input_text}' → '{actual}' (期待値: '{expected}')")
-        # より柔軟な部分一致チェック（pykakasiの実際の出力を許容）
-        if expected and input_text:
-            # 期待値が実際の結果に含まれるか、または逆の場合をチェック
-            match_found = (expected in actual) or (actual.startswith(expected)) or (expected.startswith(actual[:len(expected)]))
-            assert match_found, f"期待値 '{expected}' と結果 '{actual}' が一致しません"
-        elif not input_text:
-            assert actual == "", f"空文字の期待値に対し '{actual}' が返されました"
+    actual = scorer._romanize(input_text)
+    print(f"'{input_text}' → '{actual}' (期待値: '{expected}')")
+    # より柔軟な部分一致チェック（pykakasiの実際の出力を許容）
+    if expected and input_text:
+        # 期待値が実際の結果に含まれるか、または逆の場合をチェック
+        match_found = (expected in actual) or (actual.startswith(expected)) or (expected.startswith(actual[:len(expected)]))
+        assert match_found, f"期待値 '{expected}' と結果 '{actual}' が一致しません"
+    elif not input_text:
+        assert actual == "", f"空文字の期待値に対し '{actual}' が返されました"
 
-def test_enhanced_cleaning():
+@pytest.mark.parametrize("input_name,expected", _CLEANING_CASES)
+def test_enhanced_cleaning(input_name, expected):
     """強化された企業名正規化のテスト（自動化テスト）"""
-    scorer = HPScorer(ScoringConfig())
-    
-    test_cases = [
-        ("株式会社グラントホープ【グラントホープ】", "グラントホープ"),
-        ("有限会社サンプル", "サンプル"),
-        ("Barber Boss【バーバー ボス】", "Barber Boss"),
-        ("㈱テスト", "テスト"),
-        ("サンプル・テスト株式会社", "サンプルテスト"),
-    ]
+    scorer = get_default_scorer()
     
-    for input_name, expected in test_cases:
-        actual = scorer._enhanced_clean_company_name(input_name)
-        print(f"'{input_name}' → '{actual}' (期待値: '{expected}')")
-        assert expected in actual or actual in expected, \
-            f"期待値 '{expected}' と結果 '{actual}' が一致しません"
+    actual = scorer._enhanced_clean_company_name(input_name)
+    print(f"'{input_name}' → '{actual}' (期待値: '{expected}')")
+    assert expected in actual or actual in expected, \
+        f"期待値 '{expected}' と結果 '{actual}' が一致しません"
 
-def test_domain_similarity():
+@pytest.mark.parametrize("company_name,url,min_expected", _DOMAIN_SIMILARITY_CASES)
+def test_domain_similarity(company_name, url, min_expected):
     """ドメイン類似度計算のテスト（自動化テスト）"""
-    scorer = HPScorer(ScoringConfig())
-    
-    # 期待値テスト（実測値に基づく現実的な設定）
-    test_cases = [
-        ("株式会社グラントホープ", "https://granthope.jp", 70.0),  # 実測76.2%
-        ("バーバーボス", "https://barberboss.com", 55.0),  # 実測60.0%
-        ("サンプル株式会社", "https://sample.co.jp", 40.0),  # 実測46.2%（現実的調整）
-        ("全く関係ない会社", "https://unrelated.com", 15.0),  # 低類似度期待
-    ]
+    scorer = get_default_scorer()
     
-    for company_name, url, min_expected in test_cases:
-        similarity = scorer._calculate_domain_similarity(company_name, url)
-        print(f"'{company_name}' vs '{url}' → {similarity:.1f}% (最低期待値: {min_expected}%)")
-        assert similarity >= min_expected, \
-            f"類似度 {similarity:.1f}% が期待値 {min_expected}% を下回りました"
+    similarity = scorer._calculate_domain_similarity(company_name, url)
+    print(f"'{company_name}' vs '{url}' → {similarity:.1f}% (最低期待値: {min_expected}%)")
+    assert similarity >= min_expected, \
+        f"類似度 {similarity:.1f}% が期待値 {min_expected}% を下回りました"
 
 def test_full_scoring():
     """フルスコアリングのテスト"""
     print("\n=== フルスコアリングテスト ===")
     
-    scorer = HPScorer(ScoringConfig())
+    scorer = get_default_scorer()
     
     # テスト用の企業情報
     company = CompanyInfo(
@@ -158,13 +161,16 @@ def debug_display():
     
     try:
         print("\n1. ローマ字変換テスト")
-        test_romanization()
+        for case in _ROMANIZATION_CASES:
+            test_romanization(*case)
         
         print("\n2. 企業名正規化テスト") 
-        test_enhanced_cleaning()
+        for case in _CLEANING_CASES:
+            test_enhanced_cleaning(*case)
         
         print("\n3. ドメイン類似度テスト")
-        test_domain_similarity()
+        for case in _DOMAIN_SIMILARITY_CASES:
+            test_domain_similarity(*case)
         
         print("\n4. フルスコアリングテスト")
         test_full_scoring()
@@ -0,0 +1,31 @@
+"""
+テスト共通設定
+統合テストは --run-integration 指定時のみ実行する
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="integrationマーカー付きのテストも実行する",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "integration: 単体テストと重複する統合テスト（--run-integration で実行）"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-integration"):
+        return
+
+    skip_integration = pytest.mark.skip(reason="--run-integration 指定時のみ実行")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
@@ -4,14 +4,69 @@ Google Sheets API書き込み機能とフォーマット処理のテスト
 """
 
 import pytest
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional
 from unittest.mock import Mock, patch, MagicMock
 
+import gspread
+from gspread.utils import absolute_range_name
+
 # 適切なパッケージインポート
-from src.output_writer import OutputWriter, OutputColumns, WriteResult
+from src.output_writer import OutputWriter, OutputColumns, WriteResult, create_output_writer_from_config
+from src.data_loader import GoogleSheetsClient, create_data_loader_from_config
 from src.scorer import HPCandidate
 from src.search_agent import CompanyInfo
 
 
+class FakeWorksheet:
+    """
+    書き込みを記録するgspread Worksheetの代替
+    送信された更新リストをそのまま保持し、ペイロードの形を直接検証できるようにする
+    gspread 6と同じく、batch_updateは渡された辞書の'range'をシート名付きにその場で書き換える
+    """
+    
+    def __init__(self):
+        self.title = "Sheet1"
+        self.update_calls: List[List[Dict[str, Any]]] = []  # batch_updateごとの更新リスト
+        self.update_kwargs: List[Dict[str, Any]] = []       # batch_updateごとのキーワード引数
+        self.sent_ranges: List[List[str]] = []              # batch_updateごとにAPIへ送られる範囲（シート名付き）
+        self.clear_calls: List[List[str]] = []              # batch_clearごとの範囲リスト
+        self.cells: Dict[str, List[List[Any]]] = {}         # 範囲 → 最後に書き込まれた値
+        self.errors: List[Optional[Exception]] = []         # 先頭から順にbatch_updateで送出する例外（Noneは成功）
+        self.error: Optional[Exception] = None              # 常にbatch_updateで送出する例外
+        self.on_update: Optional[Callable[[List[Dict[str, Any]]], None]] = None  # 呼び出し時のフック
+    
+    @property
+    def received(self) -> List[Dict[str, Any]]:
+        """最後のbatch_updateで送信された更新リスト"""
+        return self.update_calls[-1]
+    
+    def batch_update(self, updates, **kwargs):
+        # 書き換え前の内容を記録してから、gspreadと同じく呼び出し側の辞書を書き換える
+        received = [dict(update) for update in updates]
+        self.update_calls.append(received)
+        self.update_kwargs.append(kwargs)
+        for update in updates:
+            update['range'] = absolute_range_name(self.title, update['range'])
+        self.sent_ranges.append([update['range'] for update in updates])
+        if self.errors:
+            error = self.errors.pop(0)
+            if error is not None:
+                raise error
+        if self.error is not None:
+            raise self.error
+        if self.on_update is not None:
+            self.on_update(received)
+        for update in received:
+            self.cells[update['range']] = update['values']
+    
+    def batch_clear(self, ranges):
+        self.clear_calls.append(list(ranges))
+        for range_name in ranges:
+            self.cells.pop(range_name, None)
+
+
 class TestOutputColumns:
     """OutputColumnsデータクラスのテスト"""
     
@@ -40,6 +95,15 @@ class TestOutputColumns:
         assert columns.status == "G"
         assert columns.query == "H"
         assert columns.timestamp == "I"
+    
+    def test_output_columns_frozen(self):
+        """OutputColumnsが不変・ハッシュ可能であることのテスト"""
+        columns = OutputColumns()
+        
+        with pytest.raises(AttributeError):
+            columns.url = "J"
+        assert not hasattr(columns, '__dict__')
+        assert hash(columns) == hash(OutputColumns())
 
 
 class TestWriteResult:
@@ -108,11 +172,11 @@ class TestOutputWriter:
         # Gspreadモックの設定
         self.mock_gc = Mock()
         self.mock_spreadsheet = Mock()
-        self.mock_worksheet = Mock()
+        self.fake_ws = FakeWorksheet()
         
         self.mock_sheets_client._get_gspread_client.return_value = self.mock_gc
         self.mock_gc.open_by_key.return_value = self.mock_spreadsheet
-        self.mock_spreadsheet.worksheet.return_value = self.mock_worksheet
+        self.mock_spreadsheet.worksheet.return_value = self.fake_ws
     
     def test_initialization(self):
         """OutputWriter初期化のテスト"""
@@ -120,6 +184,197 @@ class TestOutputWriter:
         assert isinstance(self.writer.output_columns, OutputColumns)
         assert self.writer.output_columns.url == "E"
     
+    def test_worksheet_handle_is_cached(self):
+        """同じシートへの連続書き込みでワークシート取得が1回だけ行われることのテスト"""
+        for row_number in (2, 3):
+            result = self.writer.write_single_result(
+                spreadsheet_id="test_spreadsheet_id",
+                sheet_name="Sheet1",
+                row_number=row_number,
+                company_id="001",
+                url="https://example.com",
+                score=8.5,
+                status="自動採用",
+                query="pattern_a"
+            )
+            assert result.success is True
+        
+        self.mock_sheets_client._get_gspread_client.assert_called_once()
+        self.mock_gc.open_by_key.assert_called_once_with("test_spreadsheet_id")
+        self.mock_spreadsheet.worksheet.assert_called_once_with("Sheet1")
+        assert len(self.fake_ws.update_calls) == 2
+        
+        # 別シートは新たに取得される
+        self.writer.clear_row_data("test_spreadsheet_id", "Sheet2", 2, "001")
+        self.mock_spreadsheet.worksheet.assert_called_with("Sheet2")
+        assert self.mock_spreadsheet.worksheet.call_count == 2
+    
+    def test_buffered_writes_flush_once(self):
+        """バッファ書き込みで50件が1回のbatch_updateにまとめられることのテスト"""
+        writer = OutputWriter(sheets_client=self.mock_sheets_client, buffered=True,
+                              flush_every=50, flush_interval_s=3600)
+        
+        results = [writer.write_single_result(
+            spreadsheet_id="test_spreadsheet_id",
+            sheet_name="Sheet1",
+            row_number=i + 2,
+            company_id=f"{i:03d}",
+            url=f"https://example{i}.com",
+            score=8.5,
+            status="自動採用",
+            query="pattern_a"
+        ) for i in range(50)]
+        
+        # 49件目まではバッファに溜まるだけ
+        assert all(r.pending for r in results[:49])
+        assert results[49].success is True
+        assert results[49].pending is False
+        
+        assert len(self.fake_ws.update_calls) == 1
+        update_calls = self.fake_ws.received
+        assert [update['range'] for update in update_calls] == ['E2:I51']
+        
+        # 送信済みなのでflushしても何も送らない
+        assert writer.flush() == []
+        assert len(self.fake_ws.update_calls) == 1
+    
+    def test_buffered_writes_explicit_flush(self):
+        """しきい値に達していないバッファがflush()で送信されることのテスト"""
+        writer = OutputWriter(sheets_client=self.mock_sheets_client, buffered=True,
+                              flush_every=50, flush_interval_s=3600)
+        
+        for row_number in (2, 3, 7):
+            writer.write_single_result(
+                spreadsheet_id="test_spreadsheet_id",
+                sheet_name="Sheet1",
+                row_number=row_number,
+                company_id="001",
+                url=None,
+                score=None,
+                status="HP未発見",
+                query=None
+            )
+        assert self.fake_ws.update_calls == []
+        
+        results = writer.flush()
+        assert [r.row_number for r in results] == [2, 3, 7]
+        assert all(r.success and not r.pending for r in results)
+        update_calls = self.fake_ws.received
+        assert [update['range'] for update in update_calls] == ['E2:I3', 'E7:I7']
+    
+    def test_flush_sends_sheets_in_parallel(self):
+        """複数シートのバッファが別スレッドで並列に送信されることのテスト"""
+        writer = OutputWriter(sheets_client=self.mock_sheets_client, buffered=True,
+                              flush_every=50, flush_interval_s=3600, max_concurrent_flushes=4)
+        
+        # 2シートの送信が同時に実行されていなければBarrierがタイムアウトする
+        barrier = threading.Barrier(2, timeout=5)
+        thread_ids = []
+        
+        def on_update(updates):
+            thread_ids.append(threading.get_ident())
+            barrier.wait()
+        
+        self.fake_ws.on_update = on_update
+        
+        for sheet_name in ("Sheet1", "Sheet2"):
+            writer.write_single_result("test_spreadsheet_id", sheet_name, 2, "001",
+                                       url="https://example.com", score=8.5, status="自動採用", query="pattern_a")
+        
+        results = writer.flush()
+        
+        assert len(results) == 2
+        assert all(r.success for r in results)
+        assert len(self.fake_ws.update_calls) == 2
+        assert len(set(thread_ids)) == 2
+    
+    def test_buffered_writes_merge_same_row(self):
+        """送信前の同じ行への書き込みが1件にまとめられることのテスト"""
+        writer = OutputWriter(sheets_client=self.mock_sheets_client, buffered=True,
+                              flush_every=50, flush_interval_s=3600)
+        
+        writer.write_single_result("test_spreadsheet_id", "Sheet1", 2, "001",
+                                   url="https://example.com", score=8.5, status="自動採用", query="pattern_a")
+        writer.write_single_result("test_spreadsheet_id", "Sheet1", 2, "001",
+                                   url=None, score=None, status="要確認", query="pattern_b")
+        
+        results = writer.flush()
+        assert len(results) == 1
+        
+        calls_by_range = {u['range']: u for u in self.fake_ws.received}
+        (row,) = calls_by_range['E2:I2']['values']
+        assert row[:4] == ["https://example.com", 8.5, "要確認", "pattern_b"]
+    
+    def test_write_single_result_skips_on_unchanged(self):
+        """skip_unchanged有効時、前回と同じ値の書き込みはAPIを呼ばずに省略されることのテスト"""
+        self.writer = OutputWriter(sheets_client=self.mock_sheets_client, skip_unchanged=True)
+        kwargs = dict(spreadsheet_id="test_spreadsheet_id", sheet_name="Sheet1", row_number=2,
+                      company_id="001", url="https://example.com", score=8.5,
+                      status="自動採用", query="pattern_a")
+        
+        first = self.writer.write_single_result(**kwargs)
+        second = self.writer.write_single_result(**kwargs)
+        
+        assert first.success is True and first.skipped is False
+        assert second.success is True and second.skipped is True
+        assert len(self.fake_ws.update_calls) == 1
+        
+        # 値が変われば書き込まれる
+        self.writer.write_single_result(**{**kwargs, 'score': 9.0})
+        assert len(self.fake_ws.update_calls) == 2
+        
+        # クリア後は同じ値でも書き込まれる
+        self.writer.clear_row_data("test_spreadsheet_id", "Sheet1", 2, "001")
+        self.writer.write_single_result(**{**kwargs, 'score': 9.0})
+        assert len(self.fake_ws.update_calls) == 3
+    
+    def test_unchanged_write_is_sent_by_default(self):
+        """既定では同じ値でも毎回書き込まれ、処理日時が更新されることのテスト"""
+        kwargs = dict(spreadsheet_id="test_spreadsheet_id", sheet_name="Sheet1", row_number=2,
+                      company_id="001", url="https://example.com", score=8.5,
+                      status="自動採用", query="pattern_a")
+        
+        self.writer.write_single_result(**kwargs)
+        result = self.writer.write_single_result(**kwargs)
+        
+        assert result.skipped is False
+        assert len(self.fake_ws.update_calls) == 2
+    
+    def test_skip_unchanged_does_not_skip_over_pending_write(self):
+        """送信待ちの別の値がある行には、送信済みと同じ値でも書き込みを省略しないテスト"""
+        writer = OutputWriter(sheets_client=self.mock_sheets_client, buffered=True,
+                              flush_every=50, flush_interval_s=3600, skip_unchanged=True)
+        value_a = dict(url="https://a.example.com", score=8.5, status="自動採用", query="pattern_a")
+        value_b = dict(url="https://b.example.com", score=6.0, status="要確認", query="pattern_b")
+        
+        writer.write_single_result("test_spreadsheet_id", "Sheet1", 2, "001", **value_a)
+        writer.flush()
+        writer.write_single_result("test_spreadsheet_id", "Sheet1", 2, "001", **value_b)
+        result = writer.write_single_result("test_spreadsheet_id", "Sheet1", 2, "001", **value_a)
+        writer.flush()
+        
+        assert result.skipped is False
+        (row,) = self.fake_ws.cells['E2:I2']
+        assert row[:4] == ["https://a.example.com", 8.5, "自動採用", "pattern_a"]
+    
+    def test_buffered_flush_returns_result_for_written_row(self):
+        """しきい値で送信した場合、書き込んだ行自身の結果が返されるテスト"""
+        writer = OutputWriter(sheets_client=self.mock_sheets_client, buffered=True,
+                              flush_every=50, flush_interval_s=3600)
+        
+        for row_number, company_id in ((2, "001"), (3, "002")):
+            writer.write_single_result("test_spreadsheet_id", "Sheet1", row_number, company_id,
+                                       url=None, score=None, status="HP未発見", query=None)
+        # 経過時間のしきい値を超えた状態で行2へ再度書き込むと、行2・行3がまとめて送信される
+        writer.flush_interval_s = 0
+        result = writer.write_single_result("test_spreadsheet_id", "Sheet1", 2, "001",
+                                            url="https://example.com", score=8.5, status="自動採用", query="pattern_a")
+        
+        assert len(self.fake_ws.update_calls) == 1
+        assert result.pending is False
+        assert result.row_number == 2
+        assert result.company_id == "001"
+    
     def test_write_single_result_success(self):
         """単一結果書き込み成功のテスト"""
         result = self.writer.write_single_result(
@@ -143,24 +398,20 @@ class TestOutputWriter:
         self.mock_sheets_client._get_gspread_client.assert_called_once()
         self.mock_gc.open_by_key.assert_called_once_with("test_spreadsheet_id")
         self.mock_spreadsheet.worksheet.assert_called_once_with("Sheet1")
-        self.mock_worksheet.batch_update.assert_called_once()
-        
-        # batch_updateの引数確認
-        update_calls = self.mock_worksheet.batch_update.call_args[0][0]
-        assert len(update_calls) == 5  # URL, score, status, query, timestamp
+        assert len(self.fake_ws.update_calls) == 1
         
-        # 各更新の確認
-        url_update = next(u for u in update_calls if u['range'] == 'E2')
-        assert url_update['values'] == [["https://example.com"]]
+        # 値は再解析させずにそのまま保存する
+        assert self.fake_ws.update_kwargs[-1] == {'value_input_option': 'RAW'}
         
-        score_update = next(u for u in update_calls if u['range'] == 'F2')
-        assert score_update['values'] == [[8.5]]
+        # batch_updateの引数確認（隣接するE〜I列は1つの範囲にまとめられる）
+        update_calls = self.fake_ws.received
+        assert len(update_calls) == 1
+        assert update_calls[0]['range'] == 'E2:I2'
         
-        status_update = next(u for u in update_calls if u['range'] == 'G2')
-        assert status_update['values'] == [["自動採用"]]
-        
-        query_update = next(u for u in update_calls if u['range'] == 'H2')
-        assert query_update['values'] == [["pattern_a"]]
+        # URL, score, status, query, timestamp の順で1行分
+        (row,) = self.fake_ws.cells['E2:I2']
+        assert row[:4] == ["https://example.com", 8.5, "自動採用", "pattern_a"]
+        assert len(row) == 5
     
     def test_write_single_result_with_none_values(self):
         """None値を含む単一結果書き込みのテスト"""
@@ -181,11 +432,11 @@ class TestOutputWriter:
         assert result.row_number == 3
         
         # batch_updateの引数確認（None値は除外される）
-        update_calls = self.mock_worksheet.batch_update.call_args[0][0]
+        update_calls = self.fake_ws.received
         assert len(update_calls) == 2  # status, timestamp のみ
         
-        status_update = next(u for u in update_calls if u['range'] == 'G3')
-        assert status_update['values'] == [["HP未発見"]]
+        calls_by_range = {u['range']: u for u in update_calls}
+        assert calls_by_range['G3']['values'] == [["HP未発見"]]
     
     def test_write_single_result_failure(self):
         """単一結果書き込み失敗のテスト"""
@@ -243,11 +494,41 @@ class TestOutputWriter:
         assert results[1].company_id == "002"
         
         # batch_updateが呼ばれたことを確認
-        self.mock_worksheet.batch_update.assert_called_once()
+        assert len(self.fake_ws.update_calls) == 1
+        
+        # 更新データの確認（連続する2行 × E〜I列が1つの範囲にまとめられる）
+        update_calls = self.fake_ws.received
+        assert len(update_calls) == 1
+        assert update_calls[0]['range'] == 'E2:I3'
+        rows = update_calls[0]['values']
+        assert [row[:4] for row in rows] == [
+            ['https://example1.com', 8.5, '自動採用', 'pattern_a'],
+            ['https://example2.com', 6.0, '要確認', 'pattern_b']
+        ]
+    
+    def test_write_batch_results_groups_contiguous_rows(self):
+        """連続しない行は区間ごとに分かれ、欠けた値はNone（スキップ）になることのテスト"""
+        batch_data = [
+            {'company_id': '003', 'row_number': 10, 'status': 'HP未発見'},
+            {'company_id': '001', 'row_number': 2, 'url': 'https://example1.com', 'score': 8.5,
+             'status': '自動採用', 'query': 'pattern_a'},
+            {'company_id': '002', 'row_number': 3, 'url': 'https://example2.com', 'score': 6.0,
+             'status': '要確認', 'query': 'pattern_b'}
+        ]
+        
+        results = self.writer.write_batch_results(
+            spreadsheet_id="test_spreadsheet_id",
+            sheet_name="Sheet1",
+            results=batch_data
+        )
         
-        # 更新データの確認（2件分 × 5項目 = 10個の更新）
-        update_calls = self.mock_worksheet.batch_update.call_args[0][0]
-        assert len(update_calls) == 10
+        # 結果は入力順のまま
+        assert [r.company_id for r in results] == ['003', '001', '002']
+        
+        update_calls = self.fake_ws.received
+        assert [update['range'] for update in update_calls] == ['E2:I3', 'E10:I10']
+        (row,) = update_calls[1]['values']
+        assert row[:4] == [None, None, 'HP未発見', None]
     
     def test_write_batch_results_with_partial_failure(self):
         """バッチ結果書き込み部分失敗のテスト"""
@@ -298,17 +579,15 @@ class TestOutputWriter:
         assert result.row_number == 2
         
         # エラーステータスが書き込まれたことを確認
-        self.mock_worksheet.batch_update.assert_called_once()
-        update_calls = self.mock_worksheet.batch_update.call_args[0][0]
-        
-        # ステータス、クエリ（エラーメッセージ）、タイムスタンプが書き込まれる
-        assert len(update_calls) == 3
+        assert len(self.fake_ws.update_calls) == 1
+        update_calls = self.fake_ws.received
         
-        status_update = next(u for u in update_calls if u['range'] == 'G2')
-        assert status_update['values'] == [["処理エラー"]]
+        # ステータス、クエリ（エラーメッセージ）、タイムスタンプが1つの範囲で書き込まれる
+        assert len(update_calls) == 1
+        assert update_calls[0]['range'] == 'G2:I2'
         
-        query_update = next(u for u in update_calls if u['range'] == 'H2')
-        assert query_update['values'] == [["エラー: 検索エラー"]]
+        (row,) = update_calls[0]['values']
+        assert row[:2] == ["処理エラー", "エラー: 検索エラー"]
     
     def test_clear_row_data(self):
         """行データクリアのテスト"""
@@ -324,15 +603,16 @@ class TestOutputWriter:
         assert result.company_id == "001"
         assert result.row_number == 2
         
-        # 空文字でクリアされたことを確認
-        self.mock_worksheet.batch_update.assert_called_once()
-        update_calls = self.mock_worksheet.batch_update.call_args[0][0]
+        # 5列すべてが1つの範囲でクリアされる（値の書き込みは行わない）
+        assert self.fake_ws.clear_calls == [['E2:I2']]
+        assert self.fake_ws.update_calls == []
         
-        # 5列すべてがクリアされる
-        assert len(update_calls) == 5
-        
-        for update in update_calls:
-            assert update['values'] == [[""]]
+        # 書き込み済みの範囲がクリアされる
+        self.writer.write_single_result("test_spreadsheet_id", "Sheet1", 3, "002",
+                                        url="https://example.com", score=8.5, status="自動採用", query="pattern_a")
+        assert 'E3:I3' in self.fake_ws.cells
+        self.writer.clear_row_data("test_spreadsheet_id", "Sheet1", 3, "002")
+        assert 'E3:I3' not in self.fake_ws.cells
     
     def test_set_output_columns(self):
         """出力列設定のテスト"""
@@ -372,11 +652,11 @@ class TestOutputWriterEdgeCases:
         # Gspreadモックの設定
         self.mock_gc = Mock()
         self.mock_spreadsheet = Mock()
-        self.mock_worksheet = Mock()
+        self.fake_ws = FakeWorksheet()
         
         self.mock_sheets_client._get_gspread_client.return_value = self.mock_gc
         self.mock_gc.open_by_key.return_value = self.mock_spreadsheet
-        self.mock_spreadsheet.worksheet.return_value = self.mock_worksheet
+        self.mock_spreadsheet.worksheet.return_value = self.fake_ws
     
     def test_large_batch_write(self):
         """大量データのバッチ書き込みテスト"""
@@ -403,9 +683,61 @@ class TestOutputWriterEdgeCases:
         assert all(r.success for r in results)
         
         # 大量の更新が実行されたことを確認
-        self.mock_worksheet.batch_update.assert_called_once()
-        update_calls = self.mock_worksheet.batch_update.call_args[0][0]
-        assert len(update_calls) == 500  # 100件 × 5項目
+        assert len(self.fake_ws.update_calls) == 1
+        update_calls = self.fake_ws.received
+        assert update_calls == [{'range': 'E2:I101', 'values': update_calls[0]['values']}]
+        assert len(update_calls[0]['values']) == 100
+        # 処理日時はバッチ全体で共通
+        assert len({row[4] for row in update_calls[0]['values']}) == 1
+    
+    def test_oversized_batch_is_split(self):
+        """上限を超える大量データは複数回のbatch_updateに分割されることのテスト"""
+        def on_update(updates):
+            # 1回のリクエストの範囲数・サイズが上限内であること
+            assert len(updates) <= 10000
+            assert len(json.dumps(updates)) <= 1_000_000
+        
+        self.fake_ws.on_update = on_update
+        
+        # 1行おきの12000行（行が連続しないため1行1範囲になる）
+        batch_data = [{
+            'company_id': f'{i:05d}',
+            'row_number': 2 + i * 2,
+            'url': f'https://example{i}.com/' + 'x' * 40,
+            'score': 8.5,
+            'status': '自動採用',
+            'query': 'pattern_a'
+        } for i in range(12000)]
+        
+        results = self.writer.write_batch_results(
+            spreadsheet_id="test_spreadsheet_id",
+            sheet_name="Sheet1",
+            results=batch_data
+        )
+        
+        assert all(r.success for r in results)
+        assert len(self.fake_ws.update_calls) >= 2
+        
+        # 全行がちょうど1回ずつ書き込まれている
+        written_rows = [int(update['range'][1:].split(':')[0])
+                        for updates in self.fake_ws.update_calls for update in updates]
+        assert sorted(written_rows) == [d['row_number'] for d in batch_data]
+    
+    def test_batch_timestamp_override(self):
+        """行ごとに処理日時を指定した場合はその値が使われることのテスト"""
+        self.writer.write_batch_results(
+            spreadsheet_id="test_spreadsheet_id",
+            sheet_name="Sheet1",
+            results=[
+                {'company_id': '001', 'row_number': 2, 'status': '自動採用', 'timestamp': '2024-01-01 00:00:00'},
+                {'company_id': '002', 'row_number': 3, 'status': '要確認'}
+            ]
+        )
+        
+        (update,) = self.fake_ws.received
+        first, second = (row[4] for row in update['values'])
+        assert first == '2024-01-01 00:00:00'
+        assert second != first
     
     def test_unicode_data_writing(self):
         """Unicode データの書き込みテスト"""
@@ -424,18 +756,16 @@ class TestOutputWriterEdgeCases:
         assert result.success is True
         
         # Unicode文字が正しく処理されたことを確認
-        update_calls = self.mock_worksheet.batch_update.call_args[0][0]
-        
-        url_update = next(u for u in update_calls if u['range'] == 'E2')
-        assert url_update['values'] == [["https://日本語ドメイン.com"]]
+        update_calls = self.fake_ws.received
         
-        query_update = next(u for u in update_calls if u['range'] == 'H2')
-        assert query_update['values'] == [["株式会社テスト 公式サイト"]]
+        (row,) = update_calls[0]['values']
+        assert row[0] == "https://日本語ドメイン.com"
+        assert row[3] == "株式会社テスト 公式サイト"
     
     def test_write_with_api_error(self):
         """API エラー時の処理テスト"""
         # gspread.exceptions.APIError をシミュレート
-        self.mock_worksheet.batch_update.side_effect = Exception("API Rate Limit Exceeded")
+        self.fake_ws.error = Exception("API Rate Limit Exceeded")
         
         result = self.writer.write_single_result(
             spreadsheet_id="test_spreadsheet_id",
@@ -453,6 +783,70 @@ class TestOutputWriterEdgeCases:
         assert result.company_id == "001"
         assert "API Rate Limit Exceeded" in result.error_message
     
+    def _api_error(self, status_code):
+        """指定ステータスのgspread APIErrorを作成"""
+        response = Mock(status_code=status_code)
+        response.json.return_value = {'error': {'code': status_code, 'message': 'error', 'status': ''}}
+        return gspread.exceptions.APIError(response)
+    
+    def test_write_retries_rate_limit(self):
+        """429エラーはバックオフしてリトライされることのテスト"""
+        self.fake_ws.errors = [self._api_error(429), self._api_error(503), None]
+        
+        with patch('src.output_writer.time.sleep') as sleep:
+            result = self.writer.write_single_result(
+                spreadsheet_id="test_spreadsheet_id",
+                sheet_name="Sheet1",
+                row_number=2,
+                company_id="001",
+                url="https://example.com",
+                score=8.5,
+                status="自動採用",
+                query="pattern_a"
+            )
+        
+        assert result.success is True
+        assert len(self.fake_ws.update_calls) == 3
+        # 待機時間は指数的に伸びる（ジッターは基準秒数未満）
+        first, second = (c[0][0] for c in sleep.call_args_list)
+        assert 0.5 <= first < 1.0
+        assert 1.0 <= second < 1.5
+    
+    def test_retry_resends_unprefixed_ranges(self):
+        """429後のリトライでもシート名が二重に付かない範囲が送信されることのテスト"""
+        self.fake_ws.errors = [self._api_error(429), None]
+        
+        with patch('src.output_writer.time.sleep'):
+            result = self.writer.write_single_result(
+                spreadsheet_id="test_spreadsheet_id",
+                sheet_name="Sheet1",
+                row_number=2,
+                company_id="001",
+                url="https://example.com",
+                score=8.5,
+                status="自動採用",
+                query="pattern_a"
+            )
+        
+        assert result.success is True
+        assert self.fake_ws.sent_ranges == [["'Sheet1'!E2:I2"], ["'Sheet1'!E2:I2"]]
+    
+    def test_write_does_not_retry_client_error(self):
+        """リトライ対象外のエラー・試行回数超過では失敗を返すことのテスト"""
+        self.fake_ws.error = self._api_error(400)
+        with patch('src.output_writer.time.sleep') as sleep:
+            result = self.writer.write_error_status("test_spreadsheet_id", "Sheet1", 2, "001", "検索エラー")
+        assert result.success is False
+        assert len(self.fake_ws.update_calls) == 1
+        sleep.assert_not_called()
+        
+        self.fake_ws.update_calls.clear()
+        self.fake_ws.error = self._api_error(429)
+        with patch('src.output_writer.time.sleep'):
+            result = self.writer.write_error_status("test_spreadsheet_id", "Sheet1", 2, "001", "検索エラー")
+        assert result.success is False
+        assert len(self.fake_ws.update_calls) == self.writer.max_tries
+    
     def test_custom_column_mapping(self):
         """カスタム列マッピングのテスト"""
         custom_columns = OutputColumns(
@@ -479,12 +873,87 @@ class TestOutputWriterEdgeCases:
         # カスタム列が使用されたことを確認
         assert result.success is True
         
-        update_calls = self.mock_worksheet.batch_update.call_args[0][0]
+        update_calls = self.fake_ws.received
         
-        # カスタム列範囲が使用されていることを確認
+        # カスタム列範囲（J〜N列）が使用されていることを確認
         ranges = [update['range'] for update in update_calls]
-        assert 'J5' in ranges  # URL列
-        assert 'K5' in ranges  # Score列
-        assert 'L5' in ranges  # Status列
-        assert 'M5' in ranges  # Query列
-        assert 'N5' in ranges  # Timestamp列 
\ No newline at end of file
+        assert ranges == ['J5:N5']
+    
+    def test_precomputed_ranges_match_column_mapping(self):
+        """事前計算した列タプルによる範囲が列設定どおりであることのテスト"""
+        for columns in (OutputColumns(), OutputColumns("J", "K", "L", "M", "N")):
+            self.writer.set_output_columns(columns)
+            assert self.writer._cols == (columns.url, columns.score, columns.status,
+                                         columns.query, columns.timestamp)
+            
+            self.writer.write_batch_results(
+                spreadsheet_id="test_spreadsheet_id",
+                sheet_name="Sheet1",
+                results=[{'company_id': '001', 'row_number': 12, 'url': 'https://example.com',
+                          'score': 8.5, 'status': '自動採用', 'query': 'pattern_a'}]
+            )
+            update_calls = self.fake_ws.received
+            assert [update['range'] for update in update_calls] == [f'{columns.url}12:{columns.timestamp}12']
+    
+    def test_non_contiguous_column_mapping(self):
+        """隣接しない列マッピングでは連続する列ごとに範囲が分かれることのテスト"""
+        self.writer.set_output_columns(OutputColumns(
+            url="B",
+            score="C",
+            status="E",
+            query="F",
+            timestamp="Z"
+        ))
+        
+        self.writer.write_single_result(
+            spreadsheet_id="test_spreadsheet_id",
+            sheet_name="Sheet1",
+            row_number=4,
+            company_id="001",
+            url="https://example.com",
+            score=8.5,
+            status="自動採用",
+            query="pattern_a"
+        )
+        
+        update_calls = self.fake_ws.received
+        assert [update['range'] for update in update_calls] == ['B4:C4', 'E4:F4', 'Z4']
+        calls_by_range = {u['range']: u for u in update_calls}
+        assert calls_by_range['B4:C4']['values'] == [["https://example.com", 8.5]]
+        assert calls_by_range['E4:F4']['values'] == [["自動採用", "pattern_a"]]
+
+
+class TestOutputWriterFactory:
+    """create_output_writer_from_config のテスト"""
+    
+    def setup_method(self):
+        """テスト用の設定"""
+        self.config = {
+            'google_sheets': {
+                'service_account_file': 'test_service_account.json',
+                'output_columns': {'url': 'J'}
+            }
+        }
+    
+    def test_shares_sheets_client_with_data_loader(self):
+        """読み込み側と同じGoogleSheetsClientを共有できることのテスト"""
+        sheets_client = GoogleSheetsClient('test_service_account.json')
+        
+        data_loader = create_data_loader_from_config(self.config, sheets_client)
+        writer = create_output_writer_from_config(self.config, sheets_client)
+        
+        assert data_loader.sheets_client is sheets_client
+        assert writer.sheets_client is sheets_client
+        assert writer.output_columns.url == 'J'
+    
+    def test_creates_client_when_not_given(self):
+        """クライアント未指定時は新規作成されることのテスト"""
+        writer = create_output_writer_from_config(self.config)
+        
+        assert isinstance(writer.sheets_client, GoogleSheetsClient)
+        assert writer.sheets_client.service_account_file == 'test_service_account.json'
+    
+    def test_missing_service_account_file(self):
+        """service_account_file未設定時のエラーテスト"""
+        with pytest.raises(ValueError):
+            create_output_writer_from_config({'google_sheets': {}})
@@ -7,9 +7,10 @@ import pytest
 from unittest.mock import Mock, patch
 from dataclasses import dataclass
 from typing import List, Dict, Optional
+from urllib.parse import urlparse
 
 # 適切なパッケージインポート
-from src.scorer import HPCandidate, ScoringConfig, HPScorer
+from src.scorer import HPCandidate, ScoringConfig, HPScorer, _romanize_cached, _extract_url_features, get_default_scorer
 from src.search_agent import SearchResult, CompanyInfo
 
 
@@ -109,7 +110,181 @@ class TestHPScorer:
         assert self.scorer.config == self.config
         assert self.scorer.blacklist_domains == self.blacklist_domains
         assert self.scorer.penalty_paths == self.penalty_paths
-    
+
+    def test_romanize_is_memoized(self):
+        """ローマ字変換結果がインスタンスをまたいでキャッシュされることのテスト"""
+        _romanize_cached.cache_clear()
+        first = self.scorer._romanize("バーバー")
+        second = HPScorer(config=self.config)._romanize("バーバー")
+
+        assert first == second == "baabaa"
+        assert _romanize_cached.cache_info().hits == 1
+        assert self.scorer._romanize("") == ""
+
+    def test_romanize_ascii_skips_kakasi(self):
+        """ASCIIのみの文字列は辞書変換を行わないことのテスト"""
+        _romanize_cached.cache_clear()
+        with patch('src.scorer._get_kakasi') as get_kakasi:
+            assert self.scorer._romanize("Barber Boss ") == "barber boss"
+        get_kakasi.assert_not_called()
+
+    def test_name_candidates_cached_per_company(self):
+        """企業名側の比較候補が企業名ごとに1回だけ生成されることのテスト"""
+        candidates = self.scorer._get_name_candidates(self.test_company.company_name)
+
+        assert "Barber Boss" in candidates
+        assert "barber boss" in candidates
+
+        for url in ["https://barberboss.com", "https://example.com", "https://boss.jp"]:
+            self.scorer._calculate_domain_similarity(self.test_company.company_name, url)
+
+        cache_info = self.scorer._name_candidates_cached.cache_info()
+        assert cache_info.misses == 1
+        # URLごとの3回 + 企業名トークン集合の生成時の1回
+        assert cache_info.hits == 4
+
+    def test_company_name_normalized_once_per_company(self):
+        """100候補を採点しても企業名の正規化は1回だけ行われることのテスト"""
+        from src.scorer import _clean_company_name_cached
+        from src.utils import StringUtils
+
+        scorer = HPScorer(self.config, self.blacklist_domains, self.penalty_paths)
+        results = [
+            SearchResult(url=f"https://shop{i}.example.com/", title=f"Shop {i}", description="", rank=i)
+            for i in range(1, 101)
+        ]
+
+        _clean_company_name_cached.cache_clear()
+        with patch.object(StringUtils, 'clean_company_name', wraps=StringUtils.clean_company_name) as clean, \
+             patch.object(scorer, '_is_reachable', return_value=True), \
+             patch.object(scorer, '_calculate_locality_score', return_value=0), \
+             patch.object(scorer, '_calculate_geographic_mismatch_penalty', return_value=0):
+            candidates = scorer.calculate_scores_batch(results, self.test_company, "pattern_a")
+
+        assert len(candidates) == 100
+        clean.assert_called_once_with(self.test_company.company_name)
+        assert scorer.prepare_company(self.test_company).normalized_name == \
+            _clean_company_name_cached(self.test_company.company_name)
+
+    def test_label_similarity_token_match_short_circuit(self):
+        """ドメイントークンが企業名トークンと完全一致する場合のテスト"""
+        with patch('src.scorer.fuzz.WRatio') as wratio:
+            assert self.scorer._calculate_label_similarity(self.test_company.company_name, "boss-tokyo") == 100.0
+        wratio.assert_not_called()
+
+    def test_get_default_scorer_is_shared(self):
+        """デフォルト設定のスコアラーがプロセス内で共有されることのテスト"""
+        scorer = get_default_scorer()
+
+        assert scorer is get_default_scorer()
+        assert scorer.config == ScoringConfig()
+
+    def test_is_fast_rejected(self):
+        """スコアリング前の早期除外判定のテスト"""
+        assert self.scorer.is_fast_rejected("https://www.hotpepper.jp/shop") is True
+        assert self.scorer.is_fast_rejected("https://barberboss.com") is False
+
+        # 早期除外されたURLは類似度計算の対象にならない
+        search_results = {
+            "pattern_a": [SearchResult(url="https://tabelog.com/x", title="", description="", rank=1)]
+        }
+        with patch.object(self.scorer, 'calculate_domain_similarities', return_value={}) as batch:
+            assert self.scorer.score_multiple_candidates(search_results, self.test_company) == []
+        batch.assert_called_once_with(self.test_company.company_name, [])
+
+    def test_calculate_scores_batch(self):
+        """同一クエリの検索結果一括スコアリングのテスト"""
+        results = [
+            SearchResult(url="https://barberboss.com", title="Barber Boss", description="", rank=1),
+            SearchResult(url="https://hotpepper.jp/x", title="Hot Pepper", description="", rank=2),
+            SearchResult(url="https://example.com", title="Example", description="", rank=3),
+        ]
+
+        with patch.object(self.scorer, 'calculate_domain_similarities',
+                          return_value={"https://barberboss.com": 90.0, "https://example.com": 10.0}) as batch, \
+             patch.object(self.scorer, 'calculate_score', side_effect=lambda r, c, q, domain_similarity, features: r.url) as score:
+            candidates = self.scorer.calculate_scores_batch(results, self.test_company, "pattern_a")
+
+        # ブラックリストURLは除外され、類似度は一括計算した値が渡される
+        batch.assert_called_once_with(self.test_company.company_name,
+                                      ["https://barberboss.com", "https://example.com"])
+        assert candidates == ["https://barberboss.com", "https://example.com"]
+        assert [c.kwargs['domain_similarity'] for c in score.call_args_list] == [90.0, 10.0]
+        # 企業名の前処理結果は1回だけ作られ、全候補で共有される
+        features = {id(c.kwargs['features']) for c in score.call_args_list}
+        assert len(features) == 1
+
+    def test_calculate_scores_batch_parallel(self):
+        """複数スレッドで採点しても検索結果の順序が維持されることのテスト"""
+        results = [
+            SearchResult(url=f"https://example{i}.com", title=f"Example {i}", description="", rank=i)
+            for i in range(1, 6)
+        ]
+
+        with patch.object(self.scorer, 'calculate_domain_similarities', return_value={}), \
+             patch.object(self.scorer, 'calculate_score',
+                          side_effect=lambda r, c, q, **kwargs: None if r.rank == 3 else r.url):
+            candidates = self.scorer.calculate_scores_batch(results, self.test_company, "pattern_a", max_workers=4)
+
+        assert candidates == [r.url for r in results if r.rank != 3]
+
+    def test_score_multiple_candidates_shares_similarities(self):
+        """複数パターンに同じURLが出てもドメイン類似度の一括計算は1回だけであることのテスト"""
+        search_results = {
+            "pattern_a": [SearchResult(url="https://barberboss.com", title="", description="", rank=1),
+                          SearchResult(url="https://hotpepper.jp/x", title="", description="", rank=2)],
+            "pattern_b": [SearchResult(url="https://barberboss.com", title="", description="", rank=1)],
+        }
+
+        with patch.object(self.scorer, 'calculate_domain_similarities',
+                          return_value={"https://barberboss.com": 90.0}) as batch, \
+             patch.object(self.scorer, 'calculate_score',
+                          side_effect=lambda r, c, q, **kwargs: HPCandidate(
+                              url=r.url, title="", description="", search_rank=r.rank, query_pattern=q,
+                              domain_similarity=kwargs['domain_similarity'], is_top_page=True,
+                              total_score=kwargs["domain_similarity"], judgment="", score_details={})) as score:
+            candidates = self.scorer.score_multiple_candidates(search_results, self.test_company)
+
+        batch.assert_called_once_with(self.test_company.company_name,
+                                      ["https://barberboss.com", "https://barberboss.com"])
+        assert [c.query_pattern for c in candidates] == ["pattern_a", "pattern_b"]
+        assert len({id(c.kwargs['features']) for c in score.call_args_list}) == 1
+
+    def test_prepare_company(self):
+        """候補URLに依存しない企業名前処理のテスト"""
+        company = CompanyInfo(id="1", company_name="美容室 Hair Salon-ABC", prefecture="東京都", industry="美容業")
+
+        features = self.scorer.prepare_company(company)
+
+        assert features.head_name == "hair salonabc"
+        assert features.head_name_no_space == "hairsalonabc"
+        assert features.head_words == ("hair", "salonabc")
+        assert features.english_words == frozenset({"hair", "salon", "abc"})
+        assert self.scorer.prepare_company(company) is features
+
+    def test_calculate_domain_similarities_batch(self):
+        """複数URLのドメイン類似度一括計算のテスト"""
+        urls = [
+            "https://barberboss.com",
+            "https://www.barberboss.com/about",
+            "https://example.com",
+            "https://barberboss.com",
+        ]
+
+        with patch.object(self.scorer, '_calculate_label_similarity',
+                          wraps=self.scorer._calculate_label_similarity) as label_similarity:
+            similarities = self.scorer.calculate_domain_similarities(
+                self.test_company.company_name, urls
+            )
+
+        # 同じドメインラベルは1回だけ比較される
+        assert label_similarity.call_count == 2
+        assert set(similarities) == set(urls)
+        assert similarities["https://barberboss.com"] == similarities["https://www.barberboss.com/about"]
+        assert similarities["https://barberboss.com"] == self.scorer._calculate_domain_similarity(
+            self.test_company.company_name, "https://barberboss.com"
+        )
+
     def test_is_blacklisted_domain(self):
         """ブラックリストドメイン判定のテスト"""
         # ブラックリストドメイン
@@ -192,6 +367,16 @@ class TestHPScorer:
         assert self.scorer._get_search_rank_bonus(4) == 0
         assert self.scorer._get_search_rank_bonus(10) == 0
     
+    def test_url_features_parsed_once(self):
+        """URLの解析結果が判定間で共有されることのテスト"""
+        url = "https://example.com/Recruit/index.html?ref=1"
+        with patch('src.scorer.urlparse', wraps=urlparse) as parse:
+            _extract_url_features.cache_clear()
+            assert self.scorer._is_top_page(url) is False
+            assert self.scorer._get_path_penalty(url) == -2
+            assert _extract_url_features(url).path == "/recruit/index.html"
+        assert parse.call_count == 1
+    
     def test_get_path_penalty(self):
         """パスペナルティ計算のテスト"""
         # ペナルティパス
@@ -202,6 +387,12 @@ class TestHPScorer:
         # 正常なパス
         assert self.scorer._get_path_penalty("https://example.com/") == 0
         assert self.scorer._get_path_penalty("https://example.com/about") == 0
+        
+        # 正規表現の特殊文字を含むパスもそのまま部分一致で判定され、パス未設定なら減点なし
+        scorer = HPScorer(self.config, penalty_paths=["/a+b/"])
+        assert scorer._get_path_penalty("https://example.com/a+b/x") == -2
+        assert scorer._get_path_penalty("https://example.com/aab/x") == 0
+        assert HPScorer(self.config)._get_path_penalty("https://example.com/recruit/") == 0
     
     def test_calculate_score_high_score_case(self):
         """高スコアケースの計算テスト"""
@@ -305,15 +496,22 @@ class TestHPScorer:
         """最良候補取得（自動採用）のテスト"""
         search_results = {
             "pattern_a": [
-                SearchResult("https://barberboss.co.jp", "Barber Boss 公式サイト", "公式", 1)
+                SearchResult("https://barberboss.co.jp", "Barber Boss 公式サイト", "公式", 1),
+                SearchResult("https://barberboss.com", "Barber Boss", "会社サイト", 2)
+            ],
+            "pattern_b": [
+                SearchResult("https://example.com", "Example", "", 1)
             ]
         }
         
-        best_candidate = self.scorer.get_best_candidate(search_results, self.test_company)
+        with patch.object(self.scorer, 'calculate_score', wraps=self.scorer.calculate_score) as score:
+            best_candidate = self.scorer.get_best_candidate(search_results, self.test_company)
         
         assert best_candidate is not None
         assert best_candidate.judgment == "自動採用"
         assert best_candidate.total_score >= 9
+        # 最初の候補が自動採用に達したため、残りの候補は採点されない
+        assert score.call_count == 1
     
     def test_get_best_candidate_no_good_candidates(self):
         """良い候補がない場合のテスト"""
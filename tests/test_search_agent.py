@@ -6,14 +6,113 @@ Brave Search API連携とクエリ生成のテスト
 import pytest
 from unittest.mock import Mock, patch, MagicMock, call
 import json
+from types import SimpleNamespace
 
 # 適切なパッケージインポート
 from src.search_agent import (
     SearchAgent, CompanyInfo, SearchResult, QueryGenerator, 
-    BraveSearchClient
+    BraveSearchClient, BraveRateLimiter
 )
 
 
+# Brave Search APIのレスポンスペイロード（テスト間で共有し、変更しないこと）
+_BRAVE_RESULTS_BARBER_BOSS = {
+    "web": {
+        "results": [
+            {
+                "url": "https://barberboss.jp",
+                "title": "Barber Boss【バーバー ボス】公式サイト",
+                "description": "東京の理髪店 Barber Boss"
+            },
+            {
+                "url": "https://example2.com",
+                "title": "Example 2",
+                "description": "Another example"
+            }
+        ]
+    }
+}
+_BRAVE_RESULTS_EMPTY = {"web": {"results": []}}
+_BRAVE_RESULTS_EXAMPLE = {
+    "web": {"results": [{"url": "https://example.com", "title": "Example", "description": ""}]}
+}
+# パターンA/B/Cの順に返す1件ずつの結果
+_BRAVE_RESULTS_PATTERNS = tuple(
+    {
+        "web": {
+            "results": [
+                {"url": f"https://barberboss-{p}.jp", "title": f"Barber Boss {p.upper()}", "description": f"Site {p.upper()}"},
+            ]
+        }
+    }
+    for p in ("a", "b", "c")
+)
+
+
+@pytest.fixture(scope="module")
+def api_key():
+    """テスト用APIキー"""
+    return "test_api_key"
+
+
+@pytest.fixture(scope="module")
+def brave_client(api_key):
+    """モジュール内で共有するBraveSearchClient（Session生成を1回に抑える）"""
+    return BraveSearchClient(api_key=api_key)
+
+
+class FakeBraveClient:
+    """BraveSearchClientの軽量な代替（spec付きMockのクラス走査を避ける）"""
+    
+    def __init__(self, results=None):
+        self._results = results or []
+        self.search = MagicMock(side_effect=self._results)
+
+
+@pytest.fixture
+def mock_brave_client():
+    """テストごとに新しいフェイククライアント"""
+    return FakeBraveClient()
+
+
+@pytest.fixture
+def sleep_spy():
+    """実際には待機せず呼び出しだけを記録するsleep関数"""
+    return Mock(return_value=None)
+
+
+@pytest.fixture
+def agent(mock_brave_client, sleep_spy):
+    """モッククライアントと待機なしのsleepを使うSearchAgent"""
+    return SearchAgent(brave_client=mock_brave_client, sleep_fn=sleep_spy)
+
+
+def _json_response(payload):
+    """JSONペイロードを本文に持つ最小限のレスポンスを生成
+    
+    BraveSearchClientが参照する属性（status_code/content/headers/raise_for_status）だけを持つ。
+    """
+    return SimpleNamespace(
+        status_code=200,
+        content=json.dumps(payload).encode('utf-8'),
+        headers={},
+        raise_for_status=lambda: None,
+    )
+
+
+@pytest.fixture
+def brave_api(brave_client):
+    """brave_clientのセッションのgetだけを差し替え、登録したペイロードを呼び出し順に返す
+    
+    戻り値の関数にペイロードを渡すと、差し替えたgetのモックを返す。
+    """
+    with patch.object(brave_client.session, 'get') as mock_get:
+        def register(*payloads):
+            mock_get.side_effect = [_json_response(payload) for payload in payloads]
+            return mock_get
+        yield register
+
+
 class TestCompanyInfo:
     """CompanyInfoデータクラスのテスト"""
     
@@ -58,50 +157,31 @@ class TestSearchResult:
         assert result.description == "This is an example site"
         assert result.rank == 1
 
+    def test_search_result_domain(self):
+        """SearchResultのドメイン事前解析のテスト"""
+        result = SearchResult("https://WWW.Example.co.jp/about", "Example", "", 1)
+
+        assert result.domain == "example.co.jp"
+        # 比較・表示には含めない
+        assert result == SearchResult("https://WWW.Example.co.jp/about", "Example", "", 1)
+        assert "domain" not in repr(result)
+
 
 class TestBraveSearchClient:
     """BraveSearchClientクラスのテスト"""
     
-    def setup_method(self):
-        """テストセットアップ"""
-        self.api_key = "test_api_key"
-        self.client = BraveSearchClient(api_key=self.api_key)
-    
-    def test_initialization(self):
+    def test_initialization(self, brave_client, api_key):
         """BraveSearchClient初期化のテスト"""
-        assert self.client.api_key == self.api_key
-        assert "X-Subscription-Token" in self.client.session.headers
-        assert self.client.session.headers["X-Subscription-Token"] == self.api_key
+        assert brave_client.api_key == api_key
+        assert "X-Subscription-Token" in brave_client.session.headers
+        assert brave_client.session.headers["X-Subscription-Token"] == api_key
     
-    @patch('requests.Session.get')
-    def test_search_success(self, mock_get):
+    def test_search_success(self, brave_api, brave_client):
         """検索成功のテスト"""
-        # モックレスポンスの設定
-        mock_response_data = {
-            "web": {
-                "results": [
-                    {
-                        "url": "https://barberboss.jp",
-                        "title": "Barber Boss【バーバー ボス】公式サイト",
-                        "description": "東京の理髪店 Barber Boss"
-                    },
-                    {
-                        "url": "https://example2.com",
-                        "title": "Example 2",
-                        "description": "Another example"
-                    }
-                ]
-            }
-        }
-        
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_response_data
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
+        mock_get = brave_api(_BRAVE_RESULTS_BARBER_BOSS)
         
         # テスト実行
-        results = self.client.search("Barber Boss 東京都 美容業 公式サイト")
+        results = brave_client.search("Barber Boss 東京都 美容業 公式サイト")
         
         # 結果確認
         assert len(results) == 2
@@ -112,47 +192,121 @@ class TestBraveSearchClient:
         # API呼び出し確認
         mock_get.assert_called_once()
     
-    @patch('requests.Session.get')
-    def test_search_no_results(self, mock_get):
+    def test_search_no_results(self, brave_api, brave_client):
         """検索結果なしのテスト"""
-        mock_response_data = {"web": {"results": []}}
-        
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_response_data
-        mock_response.raise_for_status = Mock()
-        mock_get.return_value = mock_response
+        brave_api(_BRAVE_RESULTS_EMPTY)
         
-        results = self.client.search("存在しない企業名")
+        results = brave_client.search("存在しない企業名")
         
         assert len(results) == 0
 
 
+class TestBraveSearchClientCache:
+    """BraveSearchClientのディスクキャッシュのテスト"""
+    
+    def test_search_uses_disk_cache(self, brave_api, brave_client, tmp_path):
+        """同じクエリの2回目はAPIを呼ばずキャッシュから返すテスト"""
+        mock_get = brave_api(_BRAVE_RESULTS_EXAMPLE, _BRAVE_RESULTS_EXAMPLE)
+        
+        # 差し替え済みのセッションを共有するクライアント
+        client = BraveSearchClient(api_key="test_api_key", session=brave_client.session,
+                                   cache_dir=str(tmp_path))
+        first = client.search("Example 東京都")
+        second = client.search("Example 東京都")
+        
+        assert mock_get.call_count == 1
+        assert first == second
+        assert second[0].url == "https://example.com"
+        assert len(list(tmp_path.glob("*.json"))) == 1
+        
+        # パラメータが異なればキャッシュは別扱い
+        client.search("Example 東京都", offset=1)
+        assert mock_get.call_count == 2
+
+
+class TestBraveRateLimiter:
+    """BraveRateLimiterクラスのテスト"""
+    
+    @patch('src.search_agent.time.sleep')
+    @patch('src.search_agent.time.monotonic', return_value=100.0)
+    def test_wait_uses_min_interval_without_headers(self, mock_monotonic, mock_sleep):
+        """ヘッダー取得前は最小間隔で待機するテスト"""
+        limiter = BraveRateLimiter(min_interval=1.5)
+        
+        limiter.wait()  # 初回は待機なし
+        limiter.wait()
+        
+        mock_sleep.assert_called_once_with(1.5)
+    
+    @patch('src.search_agent.time.sleep')
+    @patch('src.search_agent.time.monotonic', return_value=100.0)
+    def test_update_from_headers(self, mock_monotonic, mock_sleep):
+        """レート制限ヘッダーから間隔を算出するテスト"""
+        limiter = BraveRateLimiter(min_interval=0.01)
+        limiter.wait()
+        
+        # 秒単位の枠（先頭値）で残り20回 → 0.05秒間隔
+        limiter.update({'X-RateLimit-Remaining': '20, 14999', 'X-RateLimit-Reset': '1, 1419704'})
+        limiter.wait()
+        limiter.wait()
+        assert mock_sleep.call_args_list == [call(1.0), call(pytest.approx(1.05))]
+        
+        # 枠を使い切った場合はリセットまで待機
+        mock_sleep.reset_mock()
+        limiter.update({'X-RateLimit-Remaining': '0, 14998', 'X-RateLimit-Reset': '3, 1419703'})
+        limiter.wait()
+        mock_sleep.assert_called_once_with(pytest.approx(3.0))
+    
+    @patch('src.search_agent.time.sleep')
+    @patch('src.search_agent.time.monotonic', return_value=100.0)
+    def test_small_min_interval_waits_one_second_until_headers(self, mock_monotonic, mock_sleep):
+        """最小間隔が短くても、ヘッダー取得前は1秒間隔で待機するテスト"""
+        limiter = BraveRateLimiter(min_interval=0.05)
+        
+        limiter.wait()
+        limiter.wait()
+        
+        mock_sleep.assert_called_once_with(1.0)
+    
+    def test_update_never_goes_below_min_interval(self):
+        """ヘッダーから算出した間隔が最小間隔を下回らないテスト"""
+        limiter = BraveRateLimiter(min_interval=0.5)
+        
+        limiter.update({'X-RateLimit-Remaining': '50', 'X-RateLimit-Reset': '1'})
+        
+        assert limiter._interval == 0.5
+    
+    def test_update_ignores_missing_or_invalid_headers(self):
+        """ヘッダーが無い・不正な場合は間隔を変えないテスト"""
+        limiter = BraveRateLimiter(min_interval=2.0)
+        
+        limiter.update({})
+        limiter.update({'X-RateLimit-Remaining': 'abc', 'X-RateLimit-Reset': '1'})
+        
+        assert limiter._interval == 2.0
+
+
 class TestQueryGenerator:
     """QueryGeneratorクラスのテスト"""
     
-    def test_generate_queries_default(self):
-        """デフォルトクエリ生成のテスト"""
-        company = CompanyInfo(
-            id="001",
-            company_name="Barber Boss【バーバー ボス】",
-            prefecture="東京都",
-            industry="美容業"
-        )
-        
+    @pytest.mark.parametrize("company,name_keyword", [
+        (CompanyInfo("001", "Barber Boss【バーバー ボス】", "東京都", "美容業"), "Barber Boss"),
+        (CompanyInfo("001", "Sample Corp", "大阪府", "製造業"), "Sample Corp"),
+    ])
+    def test_generate_phase1_queries(self, company, name_keyword):
+        """フェーズ1クエリ生成のテスト"""
         queries = QueryGenerator.generate_phase1_queries(company)
         
         # 3つのパターンが生成されることを確認
-        assert len(queries) == 3
-        assert "pattern_a" in queries
-        assert "pattern_b" in queries  
-        assert "pattern_c" in queries
-        
-        # 各パターンに企業情報が含まれることを確認
-        for pattern_key, query in queries.items():
-            assert "Barber Boss" in query
-            # 業種または都道府県が含まれることを確認
-            assert "美容業" in query or "東京都" in query
+        assert set(queries) == {"pattern_a", "pattern_b", "pattern_c"}
+        
+        # 各パターンに企業名と、業種または都道府県が含まれることを確認
+        for query in queries.values():
+            assert name_keyword in query
+            assert company.industry in query or company.prefecture in query
+        
+        # パターンAは業種・都道府県の両方を含む
+        assert company.industry in queries["pattern_a"] and company.prefecture in queries["pattern_a"]
     
     def test_generate_queries_with_custom_queries(self):
         """カスタムクエリ生成のテスト"""
@@ -163,32 +317,16 @@ class TestQueryGenerator:
         
         assert query1 == "Test Company 公式"
         assert query2 == '"Test Company" 東京都'
-    
-    def test_generate_single_query_pattern_a(self):
-        """パターンA単体生成のテスト"""
-        company = CompanyInfo("001", "Sample Corp", "大阪府", "製造業")
-        
-        queries = QueryGenerator.generate_phase1_queries(company)
-        query_a = queries["pattern_a"]
-        
-        assert "Sample Corp" in query_a
-        assert "製造業" in query_a and "大阪府" in query_a
 
 
 class TestSearchAgent:
     """SearchAgentクラスのテスト"""
     
-    def setup_method(self):
-        """テストセットアップ"""
-        self.mock_client = Mock(spec=BraveSearchClient)
-        self.agent = SearchAgent(brave_client=self.mock_client)
-    
-    def test_initialization(self):
+    def test_initialization(self, agent, mock_brave_client):
         """SearchAgent初期化のテスト"""
-        assert self.agent.brave_client == self.mock_client
+        assert agent.brave_client == mock_brave_client
     
-    @patch('time.sleep')
-    def test_search_company_single_pattern(self, mock_sleep):
+    def test_search_company_single_pattern(self, agent, mock_brave_client):
         """企業検索のテスト"""
         company = CompanyInfo("001", "Test Company", "東京都", "IT業")
         
@@ -197,10 +335,10 @@ class TestSearchAgent:
         mock_results_b = [SearchResult("https://test-b.com", "Test B", "Desc B", 1)]
         mock_results_c = [SearchResult("https://test-c.com", "Test C", "Desc C", 1)]
         
-        self.mock_client.search.side_effect = [mock_results_a, mock_results_b, mock_results_c]
+        mock_brave_client.search.side_effect = [mock_results_a, mock_results_b, mock_results_c]
         
         # テスト実行
-        results = self.agent.search_company(company)
+        results = agent.search_company(company)
         
         # 結果確認
         assert len(results) == 3
@@ -211,118 +349,48 @@ class TestSearchAgent:
         assert results["pattern_a"][0].url == "https://test-a.com"
         
         # 3回検索が呼ばれることを確認
-        assert self.mock_client.search.call_count == 3
+        assert mock_brave_client.search.call_count == 3
     
-    @patch('time.sleep')
-    def test_search_company_all_patterns(self, mock_sleep):
+    @pytest.mark.parametrize("custom_templates", [
+        ["{company_name} 公式", '"{company_name}" {prefecture}'],
+        ["{company_name} 公式", "{company_name} {prefecture}", "{company_name} {industry}"],
+    ])
+    def test_search_company_custom_queries(self, custom_templates, agent, mock_brave_client, sleep_spy):
         """カスタムクエリでの企業検索のテスト"""
         company = CompanyInfo("001", "Test Company", "東京都", "IT業")
         
-        # モックの設定
-        custom_templates = [
-            "{company_name} 公式",
-            '"{company_name}" {prefecture}'
+        # モックの設定（テンプレートごとに1件ずつ返す）
+        mock_brave_client.search.side_effect = [
+            [SearchResult(f"https://custom{i}.com", f"Custom {i}", f"Desc {i}", 1)]
+            for i in range(1, len(custom_templates) + 1)
         ]
-        mock_results_1 = [SearchResult("https://test-1.com", "Test 1", "Desc 1", 1)]
-        mock_results_2 = [SearchResult("https://test-2.com", "Test 2", "Desc 2", 1)]
-        
-        self.mock_client.search.side_effect = [mock_results_1, mock_results_2]
-        
-        # テスト実行
-        all_results = self.agent.search_with_custom_queries(company, custom_templates)
-        
-        # 結果確認
-        assert len(all_results) == 2
-        assert "custom_1" in all_results
-        assert "custom_2" in all_results
-        assert len(all_results["custom_1"]) == 1
-        assert all_results["custom_1"][0].url == "https://test-1.com"
-        assert len(all_results["custom_2"]) == 1
-        assert all_results["custom_2"][0].url == "https://test-2.com"
-        
-        # モック呼び出し確認
-        assert self.mock_client.search.call_count == 2 # custom_templates の数だけ呼ばれる
-        mock_sleep.assert_has_calls([call(1.2)] * 2) # patch.call を call に修正
-    
-    @patch('time.sleep') # time.sleep をモック
-    def test_search_company_custom_queries(self, mock_sleep): # async def を def に、mock_sleep を引数に追加
-        """カスタムクエリでの企業検索のテスト"""
-        company = CompanyInfo("001", "Test Company", "東京都", "IT業")
-        custom_templates = ["{company_name} 公式", "{company_name} {prefecture}"]
-        
-        # モックの設定
-        mock_results_1 = [SearchResult("https://custom1.com", "Custom 1", "Desc 1", 1)] # rank を追加
-        mock_results_2 = [SearchResult("https://custom2.com", "Custom 2", "Desc 2", 1)] # rank を追加
-        
-        self.mock_client.search.side_effect = [mock_results_1, mock_results_2]
         
         # テスト実行
-        results = self.agent.search_with_custom_queries(company, custom_templates) # await を削除
+        results = agent.search_with_custom_queries(company, custom_templates)
         
         # 結果確認
-        assert len(results) == 2
-        assert "custom_1" in results
-        assert "custom_2" in results
-        assert len(results["custom_1"]) == 1
-        assert results["custom_1"][0].url == "https://custom1.com"
-        
-        # 2回検索が呼ばれることを確認
-        assert self.mock_client.search.call_count == 2
-        mock_sleep.assert_has_calls([call(1.2)] * 2) # patch.call を call に修正
+        assert list(results) == [f"custom_{i}" for i in range(1, len(custom_templates) + 1)]
+        for i in range(1, len(custom_templates) + 1):
+            assert len(results[f"custom_{i}"]) == 1
+            assert results[f"custom_{i}"][0].url == f"https://custom{i}.com"
+        
+        # テンプレートの数だけ検索が呼ばれることを確認
+        assert mock_brave_client.search.call_count == len(custom_templates)
+        assert sleep_spy.call_count == len(custom_templates)
+        sleep_spy.assert_called_with(1.2)
 
 
+@pytest.mark.integration
 class TestSearchAgentIntegration:
     """SearchAgentの統合テスト"""
     
-    @patch('requests.Session.get') # aiohttp.ClientSession.get を requests.Session.get に変更
-    @patch('time.sleep') # time.sleep をモック
-    def test_full_search_flow(self, mock_sleep, mock_get): # async def を def に、mock_sleep を引数に追加
+    def test_full_search_flow(self, brave_api, brave_client, sleep_spy):
         """完全な検索フローの統合テスト"""
-        # 実際のクライアントとジェネレータを使用
-        client = BraveSearchClient("test_api_key")
-        # generator = QueryGenerator() # QueryGeneratorはSearchAgent内でstaticに呼ばれるため不要
-        agent = SearchAgent(brave_client=client) # query_generator を削除
-        
-        # モックレスポンスの設定
-        mock_response_data_a = {
-            "web": {
-                "results": [
-                    {"url": "https://barberboss-a.jp", "title": "Barber Boss A", "description": "Site A"},
-                ]
-            }
-        }
-        mock_response_data_b = {
-            "web": {
-                "results": [
-                    {"url": "https://barberboss-b.jp", "title": "Barber Boss B", "description": "Site B"},
-                ]
-            }
-        }
-        mock_response_data_c = {
-            "web": {
-                "results": [
-                    {"url": "https://barberboss-c.jp", "title": "Barber Boss C", "description": "Site C"},
-                ]
-            }
-        }
-
-        mock_response_a = Mock()
-        mock_response_a.status_code = 200 
-        mock_response_a.json.return_value = mock_response_data_a
-        mock_response_a.raise_for_status = Mock()
-
-        mock_response_b = Mock()
-        mock_response_b.status_code = 200
-        mock_response_b.json.return_value = mock_response_data_b
-        mock_response_b.raise_for_status = Mock()
-
-        mock_response_c = Mock()
-        mock_response_c.status_code = 200
-        mock_response_c.json.return_value = mock_response_data_c
-        mock_response_c.raise_for_status = Mock()
-
-        # session.getが呼ばれるたびに異なるレスポンスを返すように設定
-        mock_get.side_effect = [mock_response_a, mock_response_b, mock_response_c]
+        # 実際のクライアント（モジュール共有）とジェネレータを使用
+        agent = SearchAgent(brave_client=brave_client, sleep_fn=sleep_spy)
+        
+        # パターンA/B/Cの順に返すレスポンスを登録
+        mock_get = brave_api(*_BRAVE_RESULTS_PATTERNS)
         
         # テスト企業
         company = CompanyInfo(
@@ -346,7 +414,8 @@ class TestSearchAgentIntegration:
         
         # API呼び出し回数確認（3パターン × 1回ずつ）
         assert mock_get.call_count == 3
-        mock_sleep.assert_has_calls([call(1.2)] * 3) # patch.call を call に修正
+        assert sleep_spy.call_count == 3
+        sleep_spy.assert_called_with(1.2)
 
 
 if __name__ == "__main__":
@@ -3,10 +3,13 @@
 """
 
 import pytest
+import yaml
 from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import urlparse
 
 # パッケージ化されたモジュールを直接インポート
-from src.utils import URLUtils, StringUtils, BlacklistChecker, ConfigManager
+from src.utils import URLUtils, StringUtils, BlacklistChecker, ConfigManager, _parse_url
 
 # プロジェクトルートの取得（設定ファイルパス用）
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -213,6 +216,60 @@ class TestURLUtils:
         is_top = URLUtils.is_top_page(long_url)
         assert isinstance(is_top, bool)
         assert is_top == False  # 深いパスなのでトップページではない
+    
+    def test_url_utils_results_are_cached(self):
+        """同じURLの2回目以降はキャッシュから返されるテスト"""
+        url = "https://www.cache-test.example.com/about/"
+        hits_before = URLUtils.get_domain.cache_info().hits
+        
+        assert URLUtils.get_domain(url) == "cache-test.example.com"
+        assert URLUtils.get_domain(url) == "cache-test.example.com"
+        
+        assert URLUtils.get_domain.cache_info().hits == hits_before + 1
+    
+    @pytest.mark.parametrize("url", [
+        "https://www.Example.com/company/about/",
+        "http://example.co.jp",
+        "https://example.com/a;b/c",
+        "https://user@example.com:8080/path?q=1#top",
+        "https://[::1]/index.html",
+        "https://例え.jp/会社概要",
+    ])
+    def test_parse_url_matches_urlparse(self, url):
+        """単純なURLの高速分割とurlparseの結果が一致することのテスト"""
+        parsed = urlparse(url)
+        expected_host = parsed.netloc.lower()
+        if expected_host.startswith('www.'):
+            expected_host = expected_host[4:]
+        
+        parts = _parse_url(url)
+        
+        assert (parts.host, parts.path) == (expected_host, parsed.path)
+    
+    def test_batch_methods_match_scalar_methods(self):
+        """バッチ版のドメイン抽出・パス深度計算が単体版と同じ結果を返すテスト"""
+        urls = ["https://www.example.com/", "https://example.com/a/b", "", "https://example.com/a/b"]
+        
+        assert URLUtils.get_domain_batch(urls) == [URLUtils.get_domain(url) for url in urls]
+        assert URLUtils.get_path_depth_batch(urls) == [0, 2, 0, 2]
+    
+    def test_get_domain_returns_interned_strings(self):
+        """別々のURLから得た同じドメインが同一オブジェクトになるテスト"""
+        first = URLUtils.get_domain("https://www.intern-test.example.com/a")
+        second = URLUtils.get_domain("https://intern-test.example.com/b?x=1")
+        
+        assert first is second
+    
+    def test_url_parsed_once_across_methods(self):
+        """ドメイン・パス深度・トップページ判定で同じURLの解析結果を共有するテスト"""
+        url = "https://www.parse-once.example.com/company/about"
+        misses_before = _parse_url.cache_info().misses
+        
+        assert URLUtils.get_domain(url) == "parse-once.example.com"
+        assert URLUtils.get_path_depth(url) == 2
+        assert URLUtils.is_top_page(url) is False
+        
+        assert _parse_url.cache_info().misses == misses_before + 1
 
 
 class TestStringUtils:
@@ -314,13 +371,16 @@ class TestStringUtils:
             ("有限会社", ""),
             ("合同会社", ""),
             ("(株)", ""),
-            # "㈱"は実装のsuffixesに含まれていないため除去されない
-            ("㈱", "㈱"),
+            ("㈱", ""),
+            ("㈱サンプル", "サンプル"),
             
             # 法人格が複数回出現
             ("株式会社サンプル株式会社", "サンプル"),
             ("(株)サンプル(株)", "サンプル"),
             
+            # 先頭・末尾以外の法人格は企業名の一部として残す
+            ("サンプル株式会社東京支店", "サンプル株式会社東京支店"),
+            
             # 法人格と類似するが異なる文字列
             ("株式投資会社", "株式投資会社"),  # 「株式会社」ではない
             ("会社概要", "会社概要"),  # 単なる「会社」
@@ -365,45 +425,41 @@ class TestStringUtils:
 
 
 
+@pytest.fixture(scope="session")
+def blacklist_checker():
+    """実際のブラックリスト設定を1回だけ読み込んだチェッカー（ファイルが無ければスキップ）"""
+    blacklist_path = PROJECT_ROOT / "config" / "blacklist.yaml"
+    if not blacklist_path.exists():
+        pytest.skip("ブラックリスト設定ファイルが存在しません")
+    
+    checker = BlacklistChecker(str(blacklist_path))
+    checker.load_blacklist()
+    return checker
+
+
 class TestBlacklistChecker:
     """BlacklistCheckerクラスのテストケース"""
     
-    def setup_method(self):
-        """テスト用のブラックリスト設定ファイルを作成"""
-        # 実際のブラックリストファイルが存在するかチェック
-        blacklist_path = PROJECT_ROOT / "config" / "blacklist.yaml"
-        if blacklist_path.exists():
-            self.checker = BlacklistChecker(str(blacklist_path))
-        else:
-            # テスト用の一時的なチェッカー（ファイルなしでテストスキップ）
-            self.checker = None
-    
-    def test_blacklist_file_loading(self):
+    def test_blacklist_file_loading(self, blacklist_checker):
         """ブラックリストファイル読み込みのテスト"""
-        if self.checker is None:
-            pytest.skip("ブラックリスト設定ファイルが存在しません")
-        
         # ファイルが正常に読み込まれることを確認
         try:
-            self.checker.load_blacklist()
+            blacklist_checker.load_blacklist()
             
             # 読み込まれたデータが存在することを確認
-            assert hasattr(self.checker, '_blacklist_config')
-            assert isinstance(self.checker._blacklist_config, dict)
+            assert hasattr(blacklist_checker, '_blacklist_config')
+            assert isinstance(blacklist_checker._blacklist_config, dict)
             
             # 設定データが読み込まれていることを確認
-            assert self.checker._blacklist_config is not None
+            assert blacklist_checker._blacklist_config is not None
                 
         except Exception as e:
             pytest.fail(f"ブラックリスト読み込みに失敗: {e}")
     
-    def test_domain_blacklist_check(self):
+    def test_domain_blacklist_check(self, blacklist_checker):
         """ドメインブラックリストチェックのテスト"""
-        if self.checker is None:
-            pytest.skip("ブラックリスト設定ファイルが存在しません")
-        
         # ブラックリスト読み込み
-        self.checker.load_blacklist()
+        blacklist_checker.load_blacklist()
         
         # 一般的にブラックリストに含まれそうなドメインをテスト
         blacklist_domains = ["facebook.com", "twitter.com", "google.com", "yahoo.co.jp"]
@@ -411,26 +467,23 @@ class TestBlacklistChecker:
         
         # 実装では is_domain_blacklisted メソッドを使用
         for domain in blacklist_domains:
-            blacklist_config_domains = self.checker._blacklist_config.get('blacklist_domains', [])
+            blacklist_config_domains = blacklist_checker._blacklist_config.get('blacklist_domains', [])
             if f"https://{domain}" in str(blacklist_config_domains):
-                result = self.checker.is_domain_blacklisted(f"https://{domain}")
+                result = blacklist_checker.is_domain_blacklisted(f"https://{domain}")
                 assert isinstance(result, bool)
         
         for domain in safe_domains:
             # 安全なドメインのテスト
-            result = self.checker.is_domain_blacklisted(f"https://{domain}")
+            result = blacklist_checker.is_domain_blacklisted(f"https://{domain}")
             assert isinstance(result, bool)
     
-    def test_path_penalty_score(self):
+    def test_path_penalty_score(self, blacklist_checker):
         """パスペナルティスコアのテスト（詳細版）"""
-        if self.checker is None:
-            pytest.skip("ブラックリスト設定ファイルが存在しません")
-        
         # メソッドが存在することを確認
-        assert hasattr(self.checker, 'get_path_penalty_score')
+        assert hasattr(blacklist_checker, 'get_path_penalty_score')
         
         # ブラックリスト読み込み
-        self.checker.load_blacklist()
+        blacklist_checker.load_blacklist()
         
         # 基本的な動作確認
         test_cases = [
@@ -450,35 +503,75 @@ class TestBlacklistChecker:
         ]
         
         for url, expected_min_score in test_cases:
-            score = self.checker.get_path_penalty_score(url)
+            score = blacklist_checker.get_path_penalty_score(url)
             assert isinstance(score, (int, float))
             assert score >= expected_min_score
         
         # ペナルティパスのテスト（実際の設定に依存）
         for url in penalty_paths:
-            score = self.checker.get_path_penalty_score(url)
+            score = blacklist_checker.get_path_penalty_score(url)
             assert isinstance(score, (int, float))
             assert score >= 0  # 負のペナルティは通常ない
     
-    def test_overall_blacklist_functionality(self):
+    def test_overall_blacklist_functionality(self, blacklist_checker):
         """ブラックリスト機能の統合テスト"""
-        if self.checker is None:
-            pytest.skip("ブラックリスト設定ファイルが存在しません")
-        
         # 全体的な機能テスト
-        self.checker.load_blacklist()
+        blacklist_checker.load_blacklist()
         
         # 複数のメソッドが連携して動作することを確認
         test_url = "https://example.com/recruit"
         
         # ドメインチェック
-        domain_result = self.checker.is_domain_blacklisted("https://example.com")
+        domain_result = blacklist_checker.is_domain_blacklisted("https://example.com")
         assert isinstance(domain_result, bool)
         
         # パスペナルティ
-        penalty_score = self.checker.get_path_penalty_score(test_url)
+        penalty_score = blacklist_checker.get_path_penalty_score(test_url)
         assert isinstance(penalty_score, (int, float))
 
+    def test_blacklist_domains_frozen_on_load(self, tmp_path):
+        """読み込み時にブラックリストドメインが集合化されることのテスト"""
+        blacklist_file = tmp_path / "blacklist.yaml"
+        blacklist_file.write_text(
+            "blacklist_domains:\n  - hotpepper.jp\n  - tabelog.com\n",
+            encoding="utf-8"
+        )
+        checker = BlacklistChecker(str(blacklist_file))
+
+        domains = checker.get_blacklist_domains()
+        assert domains == frozenset({"hotpepper.jp", "tabelog.com"})
+        assert checker.get_blacklist_domains() is domains
+
+        assert checker.is_domain_blacklisted("https://www.hotpepper.jp/shop") is True
+        assert checker.is_domain_blacklisted("https://example.com") is False
+
+    def test_path_penalty_keywords_matched_in_path(self, tmp_path):
+        """ペナルティキーワードがURLパスに含まれる場合のみ減点されることのテスト"""
+        blacklist_file = tmp_path / "blacklist.yaml"
+        blacklist_file.write_text(
+            "path_penalty_keywords:\n  - /recruit\n  - blog\n  - a+b\n",
+            encoding="utf-8"
+        )
+        checker = BlacklistChecker(str(blacklist_file))
+
+        assert checker.get_path_penalty_score("https://example.com/Recruit/2024") == -2
+        assert checker.get_path_penalty_score("https://example.com/staff-blog", penalty_value=-5) == -5
+        assert checker.get_path_penalty_score("https://example.com/a+b") == -2
+        assert checker.get_path_penalty_score("https://example.com/aab") == 0
+        assert checker.get_path_penalty_score("https://recruit.example.com/") == 0
+
+    def test_blacklist_yaml_parsed_once_per_file(self, tmp_path):
+        """同じファイルを読む複数のチェッカーでYAML解析が1回だけ行われることのテスト"""
+        blacklist_file = tmp_path / "blacklist.yaml"
+        blacklist_file.write_text("blacklist_domains:\n  - hotpepper.jp\n", encoding="utf-8")
+
+        with patch('src.utils.yaml.load', wraps=yaml.load) as mock_load:
+            first = BlacklistChecker(str(blacklist_file)).get_blacklist_domains()
+            second = BlacklistChecker(str(blacklist_file)).get_blacklist_domains()
+
+        assert first == second == frozenset({"hotpepper.jp"})
+        assert mock_load.call_count == 1
+
 
 class TestConfigManager:
     """ConfigManagerクラスの基本テスト"""
@@ -529,6 +622,24 @@ class TestConfigManager:
         else:
             pytest.skip("config.yamlファイルが存在しません")
     
+    def test_config_yaml_cached_and_copied_per_manager(self, tmp_path, monkeypatch):
+        """同じ設定ファイルの解析は1回で、各インスタンスの設定は独立していることのテスト"""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("brave_api:\n  api_key: file_key\nscoring:\n  threshold: 7\n", encoding="utf-8")
+        
+        with patch('src.utils.yaml.load', wraps=yaml.load) as mock_load:
+            monkeypatch.setenv('BRAVE_SEARCH_API_KEY', 'env_key')
+            first = ConfigManager(str(config_file))
+            assert first.get("brave_api.api_key") == "env_key"
+            
+            monkeypatch.delenv('BRAVE_SEARCH_API_KEY')
+            second = ConfigManager(str(config_file))
+            assert second.get("brave_api.api_key") == "file_key"
+            assert second.get("scoring.threshold") == 7
+            assert second.get("scoring.missing", "default") == "default"
+        
+        assert mock_load.call_count == 1
+    
     def test_config_manager_edge_cases(self):
         """ConfigManagerのエッジケーステスト"""
         # 存在しないファイル
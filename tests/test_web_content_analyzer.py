@@ -0,0 +1,56 @@
+"""
+Web Content Analyzer モジュールの単体テスト
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.web_content_analyzer import WebContentAnalyzer, _get_contact_executor
+
+
+# 電話番号と、その市外局番から推定される都道府県
+_PHONE_CASES = [
+    ("03-1234-5678", "東京都"),
+    ("03-12345678", "東京都"),
+    ("06-1234-5678", "大阪府"),
+    ("052-123-4567", "愛知県"),
+    ("045-123-4567", "神奈川県"),
+]
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    """ネットワークを使わない解析メソッドのみを呼ぶアナライザー"""
+    return WebContentAnalyzer(timeout=3)
+
+
+class TestPhonePrefectureInference:
+    """電話番号からの都道府県推定のテスト"""
+
+    @pytest.mark.parametrize("phone,prefecture", _PHONE_CASES)
+    def test_infer_prefecture_from_phone(self, analyzer, phone, prefecture):
+        """2桁・3桁の市外局番から都道府県を推定するテスト"""
+        assert analyzer._infer_prefecture_from_phone(phone) == prefecture
+
+    @pytest.mark.parametrize("phone,prefecture", _PHONE_CASES)
+    def test_html_footer_phone_extraction(self, analyzer, phone, prefecture):
+        """段階B: フッターの電話番号から都道府県を推定するテスト"""
+        soup = BeautifulSoup(f"<html><body><footer>TEL: {phone}</footer></body></html>", "html.parser")
+
+        location_info = analyzer._extract_from_html_content(soup, "https://example.com")
+
+        assert location_info.phone_number == phone
+        assert location_info.prefecture == prefecture
+        assert location_info.confidence_level == "medium"
+
+
+class TestContactExecutor:
+    """お問い合わせページ取得用スレッドプールのテスト"""
+
+    def test_executor_shared_across_analyzers(self):
+        """アナライザーを複数生成してもスレッドプールは1つだけ使われることのテスト"""
+        WebContentAnalyzer(timeout=5)
+        WebContentAnalyzer(timeout=3)
+
+        assert _get_contact_executor() is _get_contact_executor()
+        assert not hasattr(WebContentAnalyzer(timeout=3), '_executor')